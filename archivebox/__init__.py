@@ -59,8 +59,8 @@ check_not_root()
 check_not_inside_source_dir()
 check_io_encoding()
 
-# Install monkey patches for third-party libraries
-from .misc.monkey_patches import *  # noqa
+# Monkey patches for django/daphne/etc. are installed by core/settings.py when django is set up,
+# importing them here would make every CLI invocation pay for importing django.db.models (see cli/__init__.py)
 
 # Plugin directories
 BUILTIN_PLUGINS_DIR = Path(get_plugins_dir()).resolve()
@@ -7,6 +7,22 @@ class APIConfig(AppConfig):
     name = "archivebox.api"
     label = "api"
 
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from archivebox.api.webhooks import invalidate_webhook_subscriptions
+
+        post_save.connect(
+            invalidate_webhook_subscriptions,
+            sender="api.OutboundWebhook",
+            dispatch_uid="invalidate_webhook_subscriptions_save",
+        )
+        post_delete.connect(
+            invalidate_webhook_subscriptions,
+            sender="api.OutboundWebhook",
+            dispatch_uid="invalidate_webhook_subscriptions_delete",
+        )
+
 
 def register_admin(admin_site):
     from archivebox.api.admin import register_admin
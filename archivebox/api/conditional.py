@@ -0,0 +1,121 @@
+"""
+Conditional GET support for the read-only REST API list endpoints.
+
+Each decorated endpoint computes a cheap watermark for its (filtered) queryset: the row count + the latest
+`modified_at`, plus the same for any related tables its response includes. The watermark is hashed together with
+the request path, query string and user into an ETag, so polling clients can send `If-None-Match` and get an empty
+304 back without the full query, count and serialization being re-run. When `API_CACHE_TIMEOUT` is set, the
+rendered 200 responses are also kept in the Django cache under that same ETag, so identical polls from other
+clients that don't send `If-None-Match` are served without re-serializing anything either.
+"""
+
+__package__ = "archivebox.api"
+
+import hashlib
+from datetime import datetime
+from functools import wraps
+from collections.abc import Callable
+from typing import Any
+
+from django.core.cache import cache
+from django.db.models import Count, Max, QuerySet
+from django.http import HttpRequest, HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_http_date_safe, parse_etags, quote_etag
+
+from archivebox.config.version import VERSION
+
+
+API_CACHE_KEY_PREFIX = "archivebox-api-response"
+
+
+def get_queryset_watermark(queryset: QuerySet) -> tuple[int, datetime | int | None]:
+    """(row count, latest modified_at) for a queryset, or (row count, max pk) for tables without modified_at."""
+    model_fields = {field.name for field in queryset.model._meta.get_fields()}
+    latest_field = "modified_at" if "modified_at" in model_fields else "pk"
+    stats = queryset.order_by().aggregate(count=Count("pk", distinct=True), latest=Max(latest_field))
+    return stats["count"], stats["latest"]
+
+
+def get_request_etag(request: HttpRequest, watermarks: list[tuple[int, Any]]) -> str:
+    user_id = getattr(getattr(request, "user", None), "pk", None)
+    query = sorted((key, sorted(values)) for key, values in request.GET.lists())
+    fingerprint = repr((VERSION, request.path, query, user_id, watermarks))
+    return quote_etag(hashlib.sha256(fingerprint.encode()).hexdigest()[:32])
+
+
+def is_not_modified(request: HttpRequest, etag: str, last_modified: datetime | None) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        # weak comparison (RFC 9110 13.1.2), proxies may add W/ to our strong etags
+        client_etags = {tag.removeprefix("W/") for tag in parse_etags(if_none_match)}
+        return "*" in client_etags or etag in client_etags
+
+    if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+    if if_modified_since and last_modified:
+        return int(last_modified.timestamp()) <= if_modified_since
+    return False
+
+
+def conditional_get(get_queryset: Callable[..., QuerySet], *related: Callable[[], QuerySet]):
+    """
+    Add ETag/Last-Modified headers, If-None-Match/If-Modified-Since 304s and optional response caching to a GET endpoint.
+
+    get_queryset(request, **view_kwargs) must return the same filtered queryset the view lists (without pagination),
+    related querysets are for other tables whose rows are embedded in the response (e.g. a Snapshot's ArchiveResults).
+    Must be placed between @router.get() and @paginate() so the 304 is returned before any pagination work happens.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def view(request: HttpRequest, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return func(request, **kwargs)
+
+            from archivebox.config.common import get_config
+
+            watermarks = [get_queryset_watermark(get_queryset(request, **kwargs))]
+            watermarks += [get_queryset_watermark(get_related()) for get_related in related]
+            etag = get_request_etag(request, watermarks)
+            timestamps = [latest for _, latest in watermarks if isinstance(latest, datetime)]
+            last_modified = max(timestamps) if timestamps else None
+
+            headers = {
+                "ETag": etag,
+                # allow clients to keep a copy, but they must revalidate it with us before every use
+                "Cache-Control": "private, no-cache",
+                "Vary": "Authorization, Cookie, X-ArchiveBox-API-Key",
+            }
+            if last_modified:
+                headers["Last-Modified"] = http_date(last_modified.timestamp())
+                # exact (sub-second) watermark to pass back as ?changed_since= to pull only the rows changed after this response
+                headers["X-ArchiveBox-Watermark"] = last_modified.isoformat()
+
+            if is_not_modified(request, etag, last_modified):
+                response = HttpResponseNotModified()
+                for header, value in headers.items():
+                    response[header] = value
+                return response
+
+            temporal_response = getattr(request, "_api_temporal_response", None)
+            cache_timeout = get_config().API_CACHE_TIMEOUT
+            cache_key = f"{API_CACHE_KEY_PREFIX}:{etag}"
+            cached = cache.get(cache_key) if cache_timeout > 0 else None
+            if cached is not None:
+                response = HttpResponse(cached, content_type="application/json; charset=utf-8")
+                for header, value in {**(temporal_response.headers if temporal_response is not None else {}), **headers}.items():
+                    response[header] = value
+                response["X-ArchiveBox-Cache"] = "hit"
+                return response
+
+            # ninja copies the temporal response's headers onto the final rendered response
+            if temporal_response is not None:
+                for header, value in headers.items():
+                    temporal_response[header] = value
+            if cache_timeout > 0:
+                # picked up by NinjaAPIWithIOCapture.create_response once the result has been rendered
+                setattr(request, "_api_cache_key", (cache_key, cache_timeout))
+            return func(request, **kwargs)
+
+        return view
+
+    return decorator
@@ -59,8 +59,9 @@ class NinjaAPIWithIOCapture(NinjaAPI):
 
                 response = super().create_temporal_response(request)
 
-        # Disable caching of API responses entirely
+        # Disable caching of API responses entirely (except endpoints using @conditional_get, which override this)
         response["Cache-Control"] = "no-store"
+        setattr(request, "_api_temporal_response", response)
 
         # Add debug stdout and stderr headers to response
         response["X-ArchiveBox-Stdout"] = stdout.getvalue().replace("\n", "\\n")[:200]
@@ -83,6 +84,18 @@ class NinjaAPIWithIOCapture(NinjaAPI):
 
         return response
 
+    def create_response(self, request: HttpRequest, data, *, status=None, temporal_response=None) -> HttpResponse:
+        response = super().create_response(request, data, status=status, temporal_response=temporal_response)
+
+        # store the rendered body for endpoints using @conditional_get when API_CACHE_TIMEOUT is enabled
+        cache_key = getattr(request, "_api_cache_key", None)
+        if cache_key and response.status_code == 200:
+            from django.core.cache import cache
+
+            key, timeout = cache_key
+            cache.set(key, response.content, timeout)
+        return response
+
 
 api = NinjaAPIWithIOCapture(
     title="ArchiveBox API",
@@ -19,14 +19,16 @@ from ninja import Router, Schema, FilterLookup, FilterSchema, Query
 from ninja.pagination import paginate, PaginationBase
 from ninja.errors import HttpError
 
-from archivebox.core.models import Snapshot, ArchiveResult, Tag
+from archivebox.core.models import Snapshot, ArchiveResult, Tag, SnapshotTag
 from archivebox.api.auth import auth_using_token
+from archivebox.api.conditional import conditional_get
 from archivebox.config.common import get_config
 from archivebox.core.tag_utils import (
     build_tag_cards,
     delete_tag as delete_tag_record,
     export_tag_snapshots_jsonl,
     export_tag_urls,
+    add_tags_to_snapshots,
     get_matching_tags,
     get_or_create_tag,
     get_tag_by_ref,
@@ -34,6 +36,7 @@ from archivebox.core.tag_utils import (
     normalize_created_year_filter,
     normalize_has_snapshots_filter,
     normalize_tag_sort,
+    remove_tags_from_snapshots,
     rename_tag as rename_tag_record,
 )
 from archivebox.crawls.models import Crawl
@@ -189,9 +192,11 @@ class ArchiveResultFilterSchema(FilterSchema):
     created_at: Annotated[datetime | None, FilterLookup("created_at")] = None
     created_at__gte: Annotated[datetime | None, FilterLookup("created_at__gte")] = None
     created_at__lt: Annotated[datetime | None, FilterLookup("created_at__lt")] = None
+    changed_since: Annotated[datetime | None, FilterLookup("modified_at__gt")] = None
 
 
 @router.get("/archiveresults", response=list[ArchiveResultSchema], url_name="get_archiveresult")
+@conditional_get(lambda request, filters, **kwargs: filters.filter(ArchiveResult.objects.all()))
 @paginate(CustomPagination)
 def get_archiveresults(request: HttpRequest, filters: Query[ArchiveResultFilterSchema]):
     """List all ArchiveResult entries matching these filters."""
@@ -295,6 +300,8 @@ class SnapshotFilterSchema(FilterSchema):
     modified_at: Annotated[datetime | None, FilterLookup("modified_at")] = None
     modified_at__gte: Annotated[datetime | None, FilterLookup("modified_at__gte")] = None
     modified_at__lt: Annotated[datetime | None, FilterLookup("modified_at__lt")] = None
+    # snapshots that changed themselves or had any of their results updated after the given time
+    changed_since: Annotated[datetime | None, FilterLookup(["modified_at__gt", "archiveresult__modified_at__gt"])] = None
     search: Annotated[
         str | None,
         FilterLookup(["url__icontains", "title__icontains", "tags__name__icontains", "id__icontains", "timestamp__startswith"]),
@@ -308,6 +315,11 @@ class SnapshotFilterSchema(FilterSchema):
 
 
 @router.get("/snapshots", response=list[SnapshotSchema], url_name="get_snapshots")
+@conditional_get(
+    lambda request, filters, **kwargs: filters.filter(Snapshot.objects.all()),
+    lambda: ArchiveResult.objects.all(),
+    lambda: SnapshotTag.objects.all(),
+)
 @paginate(CustomPagination)
 def get_snapshots(request: HttpRequest, filters: Query[SnapshotFilterSchema], with_archiveresults: bool = False):
     """List all Snapshot entries matching these filters."""
@@ -472,6 +484,7 @@ class TagSchema(Schema):
 
 
 @router.get("/tags", response=list[TagSchema], url_name="get_tags")
+@conditional_get(lambda request, **kwargs: Tag.objects.all(), lambda: SnapshotTag.objects.all())
 @paginate(CustomPagination)
 def get_tags(request: HttpRequest):
     setattr(request, "with_snapshots", False)
@@ -775,7 +788,7 @@ def tags_add_to_snapshot(request: HttpRequest, data: TagSnapshotRequestSchema):
         raise HttpError(400, "Either tag_name or tag_id is required")
 
     # Add the tag to the snapshot
-    snapshot.tags.add(tag.pk)
+    add_tags_to_snapshots([snapshot], tags=[tag])
 
     return {
         "success": True,
@@ -816,7 +829,7 @@ def tags_remove_from_snapshot(request: HttpRequest, data: TagSnapshotRequestSche
         raise HttpError(400, "Either tag_name or tag_id is required")
 
     # Remove the tag from the snapshot
-    snapshot.tags.remove(tag.pk)
+    remove_tags_from_snapshots([snapshot], tags=[tag])
 
     return {
         "success": True,
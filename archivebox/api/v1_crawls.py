@@ -15,6 +15,7 @@ from archivebox.core.models import Snapshot
 from archivebox.crawls.models import Crawl
 
 from .auth import API_AUTH_METHODS
+from .conditional import conditional_get
 
 router = Router(tags=["Crawl Models"], auth=API_AUTH_METHODS)
 
@@ -91,9 +92,17 @@ def normalize_tag_list(tags: list[str] | None = None, tags_str: str = "") -> lis
     return [tag.strip() for tag in tags_str.split(",") if tag.strip()]
 
 
+def filter_crawls(changed_since: datetime | None = None):
+    queryset = Crawl.objects.all()
+    if changed_since:
+        queryset = queryset.filter(modified_at__gt=changed_since)
+    return queryset
+
+
 @router.get("/crawls", response=list[CrawlSchema], url_name="get_crawls")
-def get_crawls(request: HttpRequest):
-    return Crawl.objects.all().distinct()
+@conditional_get(lambda request, changed_since=None, **kwargs: filter_crawls(changed_since))
+def get_crawls(request: HttpRequest, changed_since: datetime | None = None):
+    return filter_crawls(changed_since).distinct()
 
 
 @router.post("/crawls", response=CrawlSchema, url_name="create_crawl")
@@ -10,6 +10,7 @@ from ninja import FilterLookup, FilterSchema, Query, Router, Schema
 from ninja.pagination import paginate
 
 from archivebox.api.v1_core import CustomPagination
+from archivebox.api.conditional import conditional_get
 
 
 router = Router(tags=["Machine and Dependencies"])
@@ -52,6 +53,7 @@ class MachineFilterSchema(FilterSchema):
     hw_in_docker: Annotated[bool | None, FilterLookup("hw_in_docker")] = None
     hw_in_vm: Annotated[bool | None, FilterLookup("hw_in_vm")] = None
     bin_providers: Annotated[str | None, FilterLookup("bin_providers__icontains")] = None
+    changed_since: Annotated[datetime | None, FilterLookup("modified_at__gt")] = None
 
 
 # ============================================================================
@@ -95,6 +97,7 @@ class BinaryFilterSchema(FilterSchema):
     status: Annotated[str | None, FilterLookup("status")] = None
     machine_id: Annotated[str | None, FilterLookup("machine_id__startswith")] = None
     version: Annotated[str | None, FilterLookup("version__icontains")] = None
+    changed_since: Annotated[datetime | None, FilterLookup("modified_at__gt")] = None
 
 
 # ============================================================================
@@ -102,7 +105,20 @@ class BinaryFilterSchema(FilterSchema):
 # ============================================================================
 
 
+def _machines():
+    from archivebox.machine.models import Machine
+
+    return Machine.objects.all()
+
+
+def _binaries():
+    from archivebox.machine.models import Binary
+
+    return Binary.objects.all()
+
+
 @router.get("/machines", response=list[MachineSchema], url_name="get_machines")
+@conditional_get(lambda request, filters, **kwargs: filters.filter(_machines()))
 @paginate(CustomPagination)
 def get_machines(request: HttpRequest, filters: Query[MachineFilterSchema]):
     """List all machines."""
@@ -137,6 +153,7 @@ def get_machine(request: HttpRequest, machine_id: str):
 
 
 @router.get("/binaries", response=list[BinarySchema], url_name="get_binaries")
+@conditional_get(lambda request, filters, **kwargs: filters.filter(_binaries()), _machines)
 @paginate(CustomPagination)
 def get_binaries(request: HttpRequest, filters: Query[BinaryFilterSchema]):
     """List all binaries."""
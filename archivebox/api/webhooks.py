@@ -0,0 +1,429 @@
+"""
+Durable, batched delivery for REST API outbound webhooks.
+
+django-signal-webhooks calls TASK_HANDLER from the post_save/post_delete/m2m_changed
+signal of every hooked model, which means any configured OutboundWebhook used to block
+each Snapshot/ArchiveResult/Tag save on an HTTP request. Instead, queue_task_handler only
+appends the serialized event to DATA_DIR/queue.sqlite3 once the saving transaction commits,
+and WebhookDeliveryWorker drains it in the background (the worker_webhooks supervisord
+program under `archivebox server`, or inline at the end of one-shot CLI commands):
+
+    webhook_event     events appended by the saving thread, in order
+    webhook_delivery  one pending row per (webhook, object), repeated updates coalesce into it
+    webhook_meta      subscriptions version, bumped whenever an OutboundWebhook changes
+
+Wire format: every request POSTs a JSON array of up to WEBHOOK_BATCH_SIZE payloads, oldest
+first, batched per endpoint (webhooks sharing an endpoint and headers share requests).
+Each payload is the same serialized object that django-signal-webhooks would have sent.
+Failed deliveries are retried with exponential backoff (WEBHOOK_RETRY_BACKOFF) until
+WEBHOOK_MAX_ATTEMPTS is reached, then dropped with an error in the worker log.
+"""
+
+__package__ = "archivebox.api"
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+
+from archivebox.config import CONSTANTS
+
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIPTIONS_TTL_SECONDS = 60.0
+MAX_RETRY_DELAY_SECONDS = 60 * 60
+CLAIM_SECONDS = 120
+MAX_LAST_RESPONSE_CHARS = 8_000
+
+QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhook_event (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ref TEXT NOT NULL,
+    object_pk TEXT NOT NULL,
+    method TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    hook_ids TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS webhook_delivery (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    hook_id TEXT NOT NULL,
+    ref TEXT NOT NULL,
+    object_pk TEXT NOT NULL,
+    method TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    UNIQUE (hook_id, ref, object_pk)
+);
+CREATE INDEX IF NOT EXISTS webhook_delivery_due ON webhook_delivery (next_attempt_at);
+CREATE TABLE IF NOT EXISTS webhook_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO webhook_meta (key, value) VALUES ('subscriptions_version', 0);
+"""
+
+
+class WebhookQueue:
+    """On-disk webhook queue, safe to share between threads and processes (sqlite WAL)."""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(QUEUE_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def subscriptions_version(self) -> int:
+        return self.conn.execute("SELECT value FROM webhook_meta WHERE key = 'subscriptions_version'").fetchone()[0]
+
+    def bump_subscriptions_version(self) -> None:
+        self.conn.execute("UPDATE webhook_meta SET value = value + 1 WHERE key = 'subscriptions_version'")
+
+    def enqueue(self, ref: str, object_pk: str, method: str, data: Any, hook_ids: list[str] | None = None) -> None:
+        self.conn.execute(
+            "INSERT INTO webhook_event (ref, object_pk, method, payload, hook_ids, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                ref,
+                object_pk,
+                method,
+                json.dumps(data, cls=DjangoJSONEncoder),
+                None if hook_ids is None else json.dumps(hook_ids),
+                time.time(),
+            ),
+        )
+
+    def fan_out(self, resolve_hook_ids: Callable[[str, str], list[str]], limit: int = 1000) -> int:
+        """Move queued events into per-webhook deliveries, coalescing repeated events for the same object."""
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT id, ref, object_pk, method, payload, hook_ids FROM webhook_event ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+            if not rows:
+                conn.execute("COMMIT")
+                return 0
+
+            hook_ids_by_route: dict[tuple[str, str], list[str]] = {}
+            deliveries: list[tuple[str, str, str, str, str, float]] = []
+            now = time.time()
+            for _event_id, ref, object_pk, method, payload, event_hook_ids in rows:
+                if event_hook_ids is not None:
+                    # routed at enqueue time because FILTER_KWARGS depends on the instance
+                    hook_ids = json.loads(event_hook_ids)
+                else:
+                    route = (ref, method)
+                    if route not in hook_ids_by_route:
+                        hook_ids_by_route[route] = resolve_hook_ids(ref, method)
+                    hook_ids = hook_ids_by_route[route]
+                deliveries.extend((hook_id, ref, object_pk, method, payload, now) for hook_id in hook_ids)
+
+            # a pending CREATE stays a CREATE when later updates are folded into it, the payload is always the latest
+            conn.executemany(
+                """
+                INSERT INTO webhook_delivery (hook_id, ref, object_pk, method, payload, next_attempt_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (hook_id, ref, object_pk) DO UPDATE SET
+                    payload = excluded.payload,
+                    method = CASE
+                        WHEN webhook_delivery.method = 'CREATE' AND excluded.method != 'DELETE' THEN 'CREATE'
+                        ELSE excluded.method
+                    END
+                """,
+                deliveries,
+            )
+            conn.execute("DELETE FROM webhook_event WHERE id <= ?", (rows[-1][0],))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+    def claim_due_deliveries(self, per_hook_limit: int, claim_seconds: float = CLAIM_SECONDS) -> dict[str, list[dict[str, Any]]]:
+        """Claim up to per_hook_limit due deliveries for each webhook, oldest first.
+
+        Claimed rows are pushed claim_seconds into the future so concurrent drainers skip them,
+        ack()/retry_later() settle them once the request finishes.
+        """
+        conn = self.conn
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                """
+                SELECT id, hook_id, ref, object_pk, method, payload, attempts FROM (
+                    SELECT *, ROW_NUMBER() OVER (PARTITION BY hook_id ORDER BY next_attempt_at, id) AS position
+                    FROM webhook_delivery WHERE next_attempt_at <= ?
+                ) WHERE position <= ? ORDER BY hook_id, position
+                """,
+                (now, per_hook_limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE webhook_delivery SET next_attempt_at = ? WHERE id = ?",
+                [(now + claim_seconds, row[0]) for row in rows],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        batches: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for delivery_id, hook_id, ref, object_pk, method, payload, attempts in rows:
+            batches[hook_id].append(
+                {
+                    "id": delivery_id,
+                    "ref": ref,
+                    "object_pk": object_pk,
+                    "method": method,
+                    "payload": payload,
+                    "attempts": attempts,
+                },
+            )
+        return dict(batches)
+
+    def ack(self, delivery_ids: list[int]) -> None:
+        self.conn.executemany("DELETE FROM webhook_delivery WHERE id = ?", [(delivery_id,) for delivery_id in delivery_ids])
+
+    def retry_later(self, delays_by_id: dict[int, float]) -> None:
+        now = time.time()
+        self.conn.executemany(
+            "UPDATE webhook_delivery SET attempts = attempts + 1, next_attempt_at = ? WHERE id = ?",
+            [(now + delay, delivery_id) for delivery_id, delay in delays_by_id.items()],
+        )
+
+    def pending_counts(self) -> dict[str, int]:
+        conn = self.conn
+        return {
+            "events": conn.execute("SELECT COUNT(*) FROM webhook_event").fetchone()[0],
+            "deliveries": conn.execute("SELECT COUNT(*) FROM webhook_delivery").fetchone()[0],
+        }
+
+
+_WEBHOOK_QUEUE: WebhookQueue | None = None
+_SUBSCRIPTIONS: dict[str, set[str]] | None = None
+_SUBSCRIPTIONS_VERSION = -1
+_SUBSCRIPTIONS_LOADED_AT = 0.0
+
+
+def get_webhook_queue() -> WebhookQueue:
+    global _WEBHOOK_QUEUE
+    if _WEBHOOK_QUEUE is None:
+        _WEBHOOK_QUEUE = WebhookQueue(CONSTANTS.QUEUE_DATABASE_FILE)
+    return _WEBHOOK_QUEUE
+
+
+def invalidate_webhook_subscriptions(*args, **kwargs) -> None:
+    """Signal receiver for OutboundWebhook changes, also tells other processes to reload their subscriptions."""
+    global _SUBSCRIPTIONS
+    _SUBSCRIPTIONS = None
+    get_webhook_queue().bump_subscriptions_version()
+
+
+def get_webhook_subscriptions() -> dict[str, set[str]]:
+    """{model ref: {methods with at least one enabled webhook}}, cached so saves don't query for webhooks each time."""
+    global _SUBSCRIPTIONS, _SUBSCRIPTIONS_VERSION, _SUBSCRIPTIONS_LOADED_AT
+    from signal_webhooks.typing import METHOD_SIGNALS
+    from signal_webhooks.utils import get_webhook_model
+
+    # the version lives in queue.sqlite3 so webhooks added in the web UI are picked up by the runner immediately
+    version = get_webhook_queue().subscriptions_version()
+    stale = time.monotonic() - _SUBSCRIPTIONS_LOADED_AT > SUBSCRIPTIONS_TTL_SECONDS
+    if _SUBSCRIPTIONS is None or version != _SUBSCRIPTIONS_VERSION or stale:
+        subscriptions: dict[str, set[str]] = defaultdict(set)
+        for ref, signal in get_webhook_model().objects.filter(enabled=True).values_list("ref", "signal"):
+            subscriptions[ref].update(method for method, signals in METHOD_SIGNALS.items() if signal in signals)
+        _SUBSCRIPTIONS = dict(subscriptions)
+        _SUBSCRIPTIONS_VERSION = version
+        _SUBSCRIPTIONS_LOADED_AT = time.monotonic()
+    return _SUBSCRIPTIONS
+
+
+def queue_task_handler(hook: Callable[..., None], *, instance: models.Model, data: Any, method: str) -> None:
+    """SIGNAL_WEBHOOKS TASK_HANDLER that appends the event to the on-disk queue instead of sending it inline."""
+    from signal_webhooks.handlers import default_hook_handler
+    from signal_webhooks.settings import webhook_settings
+    from signal_webhooks.utils import get_webhook_model, reference_for_model
+
+    if hook is not default_hook_handler:
+        # custom per-model hook handlers are user code, keep calling them directly
+        hook(instance=instance, data=data, method=method)
+        return
+
+    ref = reference_for_model(type(instance))
+    if method not in get_webhook_subscriptions().get(ref, ()):
+        return
+
+    hook_ids = None
+    if webhook_settings.FILTER_KWARGS(instance, method):
+        # per-instance filters can't be re-applied later without the instance, so route the event now
+        hook_ids = [str(hook_id) for hook_id in get_webhook_model().objects.get_for_model(instance, method).values_list("id", flat=True)]
+        if not hook_ids:
+            return
+
+    object_pk = str(instance.pk)
+    transaction.on_commit(lambda: get_webhook_queue().enqueue(ref, object_pk, method, data, hook_ids=hook_ids))
+
+
+class WebhookDeliveryWorker:
+    """Drains the webhook queue, run as its own process via `archivebox manage webhook_worker`."""
+
+    def __init__(
+        self,
+        queue: WebhookQueue | None = None,
+        *,
+        batch_size: int | None = None,
+        max_attempts: int | None = None,
+        retry_backoff: float | None = None,
+    ):
+        from archivebox.config.common import get_config
+
+        config = get_config()
+        self.queue = queue or get_webhook_queue()
+        self.batch_size = max(1, int(batch_size or config.WEBHOOK_BATCH_SIZE))
+        self.max_attempts = max(1, int(max_attempts or config.WEBHOOK_MAX_ATTEMPTS))
+        self.retry_backoff = float(config.WEBHOOK_RETRY_BACKOFF if retry_backoff is None else retry_backoff)
+
+    def resolve_hook_ids(self, ref: str, method: str) -> list[str]:
+        from signal_webhooks.typing import METHOD_SIGNALS
+        from signal_webhooks.utils import get_webhook_model
+
+        hooks = get_webhook_model().objects.filter(ref=ref, signal__in=METHOD_SIGNALS[method], enabled=True)
+        return [str(hook_id) for hook_id in hooks.values_list("id", flat=True)]
+
+    def retry_delay(self, attempts: int) -> float:
+        return min(self.retry_backoff * (2 ** max(attempts - 1, 0)), MAX_RETRY_DELAY_SECONDS)
+
+    def drain_once(self) -> int:
+        """Fan out queued events and attempt every due delivery once. Returns the number of events + deliveries handled."""
+        handled = self.queue.fan_out(self.resolve_hook_ids)
+        batches = self.queue.claim_due_deliveries(self.batch_size)
+        if not batches:
+            return handled
+
+        import httpx
+        from signal_webhooks.settings import webhook_settings
+        from signal_webhooks.utils import get_webhook_model
+
+        hooks = {str(hook.pk): hook for hook in get_webhook_model().objects.filter(pk__in=list(batches))}
+
+        # webhooks that share an endpoint (and headers) share requests
+        endpoint_batches: dict[tuple[str, str], list[tuple[Any, dict[str, Any]]]] = defaultdict(list)
+        for hook_id, deliveries in batches.items():
+            handled += len(deliveries)
+            hook = hooks.get(hook_id)
+            if hook is None or not hook.enabled:
+                # webhook was deleted or disabled after the event was queued
+                self.queue.ack([delivery["id"] for delivery in deliveries])
+                continue
+            headers = {**dict(webhook_settings.CLIENT_KWARGS(hook)).get("headers", {}), **hook.default_headers()}
+            endpoint_key = (hook.endpoint, json.dumps(headers, sort_keys=True))
+            endpoint_batches[endpoint_key].extend((hook, delivery) for delivery in deliveries)
+
+        with httpx.Client(timeout=webhook_settings.TIMEOUT, follow_redirects=True) as client:
+            for hook_deliveries in endpoint_batches.values():
+                hook_deliveries.sort(key=lambda hook_delivery: hook_delivery[1]["id"])
+                for start in range(0, len(hook_deliveries), self.batch_size):
+                    self.deliver(client, hook_deliveries[start : start + self.batch_size])
+        return handled
+
+    def deliver(self, client, hook_deliveries: list[tuple[Any, dict[str, Any]]]) -> bool:
+        from django.utils import timezone
+        from signal_webhooks.settings import webhook_settings
+
+        hook = hook_deliveries[0][0]
+        hooks = {str(hook.pk): hook for hook, _delivery in hook_deliveries}
+        deliveries = [delivery for _hook, delivery in hook_deliveries]
+
+        # the same object routed through several webhooks on this endpoint is only sent once
+        payloads_by_object: dict[tuple[str, str], Any] = {}
+        for delivery in deliveries:
+            payloads_by_object[(delivery["ref"], delivery["object_pk"])] = json.loads(delivery["payload"])
+        body = json.dumps(list(payloads_by_object.values()), cls=DjangoJSONEncoder)
+
+        client_kwargs = dict(webhook_settings.CLIENT_KWARGS(hook))
+        headers = {**client_kwargs.pop("headers", {}), **hook.default_headers(), "Content-Type": "application/json"}
+
+        error: Exception | None = None
+        response = None
+        try:
+            response = client.post(hook.endpoint, content=body, headers=headers, **client_kwargs)
+        except Exception as err:
+            error = err
+
+        delivered = response is not None and response.status_code // 100 == 2
+        updates: dict[str, Any] = {"last_success" if delivered else "last_failure": timezone.now()}
+        for hook in hooks.values():
+            hook_updates = dict(updates)
+            if response is not None and hook.keep_last_response:
+                hook_updates["last_response"] = response.text[:MAX_LAST_RESPONSE_CHARS]
+            type(hook).objects.filter(pk=hook.pk).update(**hook_updates)
+
+        if delivered:
+            self.queue.ack([delivery["id"] for delivery in deliveries])
+            return True
+
+        for hook in hooks.values():
+            webhook_settings.ERROR_HANDLER(hook, error)
+        reason = error or f"HTTP {response.status_code if response is not None else '???'}"
+        dropped = [delivery["id"] for delivery in deliveries if delivery["attempts"] + 1 >= self.max_attempts]
+        if dropped:
+            logger.error(f"Dropping {len(dropped)} webhook deliveries to {hook.endpoint} after {self.max_attempts} attempts: {reason}")
+            self.queue.ack(dropped)
+        self.queue.retry_later(
+            {
+                delivery["id"]: self.retry_delay(delivery["attempts"] + 1)
+                for delivery in deliveries
+                if delivery["attempts"] + 1 < self.max_attempts
+            },
+        )
+        return False
+
+    def run(self, *, poll_interval: float = 1.0, exit_when_idle: bool = False) -> None:
+        while True:
+            handled = self.drain_once()
+            if handled:
+                continue
+            if exit_when_idle:
+                return
+            time.sleep(poll_interval)
+
+
+def drain_pending_webhooks() -> None:
+    """Deliver whatever is due before a one-shot CLI command exits (failed deliveries stay queued for the next run)."""
+    queue = get_webhook_queue()
+    if not queue.path.exists():
+        return
+    counts = queue.pending_counts()
+    if not (counts["events"] or counts["deliveries"]):
+        return
+    try:
+        WebhookDeliveryWorker(queue).run(exit_when_idle=True)
+    except Exception as err:
+        logger.exception("Failed to deliver queued webhooks", exc_info=err)
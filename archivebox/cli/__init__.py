@@ -1,8 +1,11 @@
 __package__ = "archivebox.cli"
 __command__ = "archivebox"
 import os
+import ast
 import sys
+from functools import lru_cache
 from importlib import import_module
+from importlib.util import find_spec
 
 import rich_click as click
 from rich import print
@@ -55,6 +58,7 @@ class ArchiveBoxGroup(click.Group):
         "manage": "archivebox.cli.archivebox_manage.main",
         # Introspection commands
         "pluginmap": "archivebox.cli.archivebox_pluginmap.main",
+        "bench": "archivebox.cli.archivebox_bench.main",
     }
     legacy_model_commands = {
         "crawl": "archivebox.cli.archivebox_crawl_compat.main",
@@ -73,7 +77,7 @@ class ArchiveBoxGroup(click.Group):
     }
     legacy_model_subcommands = {
         "crawl": {"create", "list", "update", "delete"},
-        "snapshot": {"create", "list", "update", "delete"},
+        "snapshot": {"create", "list", "update", "delete", "verify"},
     }
 
     @classmethod
@@ -121,6 +125,33 @@ class ArchiveBoxGroup(click.Group):
         # fall-back to using click's default command lookup
         return super().get_command(ctx, cmd_name)
 
+    def list_commands(self, ctx):
+        return list(self.all_subcommands)
+
+    def shell_complete(self, ctx, incomplete):
+        # complete subcommand names + their one-line help without importing every command module
+        from click.shell_completion import CompletionItem
+
+        return [
+            *(
+                CompletionItem(name, help=self.get_command_doc(name).strip().split("\n", 1)[0])
+                for name in self.list_commands(ctx)
+                if name.startswith(incomplete)
+            ),
+            *click.Command.shell_complete(self, ctx, incomplete),
+        ]
+
+    @classmethod
+    def get_command_doc(cls, cmd_name_or_path) -> str:
+        """get a command's docstring by parsing its module source, without importing it (or django, abx_dl, etc.)"""
+        import_path = cls.all_subcommands.get(cmd_name_or_path, cmd_name_or_path)
+        modname, funcname = import_path.rsplit(".", 1)
+        doc = _parse_command_doc(modname, funcname)
+        if doc is None:
+            # fall back to importing the module if the docstring can't be determined statically
+            doc = cls._lazy_load(import_path).__doc__
+        return doc or ""
+
     @classmethod
     def _lazy_load(cls, cmd_name_or_path):
         import_path = cls.all_subcommands.get(cmd_name_or_path)
@@ -141,6 +172,39 @@ class ArchiveBoxGroup(click.Group):
         return func
 
 
+@lru_cache(maxsize=None)
+def _parse_command_doc(modname: str, funcname: str) -> str | None:
+    spec = find_spec(modname)
+    if spec is None or not spec.origin:
+        return None
+    try:
+        with open(spec.origin, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=spec.origin)
+    except (OSError, SyntaxError):
+        return None
+
+    functions = {node.name: node for node in tree.body if isinstance(node, ast.FunctionDef)}
+    func = functions.get(funcname)
+    if func is None:
+        return None
+
+    # @docstring(some_fn.__doc__) replaces the command's own docstring with some_fn's
+    for decorator in func.decorator_list:
+        if (
+            isinstance(decorator, ast.Call)
+            and getattr(decorator.func, "id", None) == "docstring"
+            and decorator.args
+            and isinstance(decorator.args[0], ast.Attribute)
+            and decorator.args[0].attr == "__doc__"
+            and isinstance(decorator.args[0].value, ast.Name)
+        ):
+            source_func = functions.get(decorator.args[0].value.id)
+            if source_func is None:
+                return None
+            return ast.get_docstring(source_func, clean=True) or ast.get_docstring(func, clean=True)
+    return ast.get_docstring(func, clean=True)
+
+
 @click.group(cls=ArchiveBoxGroup, invoke_without_command=True)
 @click.option("--help", "-h", is_flag=True, help="Show help")
 @click.version_option(VERSION, "-v", "--version", package_name="archivebox", message="%(version)s")
@@ -174,6 +238,11 @@ def cli(ctx, help=False):
 
             setup_django()
             check_data_folder()
+
+            if subcommand not in ("server", "manage", "shell") and "--daemon" not in sys.argv:
+                from archivebox.api.webhooks import drain_pending_webhooks
+
+                ctx.call_on_close(drain_pending_webhooks)
         except Exception as e:
             print(f"[red][X] Error setting up Django or checking data folder: {e}[/red]", file=sys.stderr)
             if subcommand not in ("manage", "shell"):  # not all management commands need django to be setup beforehand
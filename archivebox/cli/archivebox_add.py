@@ -157,6 +157,7 @@ def add(
         # Just create the crawl but don't start processing
         print("[yellow]\\[*] Index-only mode - crawl created but not started[/yellow]")
         # Create snapshots for all URLs in the crawl
+        snapshots = []
         for url in crawl.get_urls_list():
             snapshot, _ = Snapshot.objects.update_or_create(
                 crawl=crawl,
@@ -168,9 +169,12 @@ def add(
                     "depth": 0,
                 },
             )
-            if tag:
-                snapshot.save_tags(tag.split(","))
             snapshot.ensure_crawl_symlink()
+            snapshots.append(snapshot)
+        if tag:
+            from archivebox.core.tag_utils import replace_snapshot_tags
+
+            replace_snapshot_tags(snapshots, tag.split(","))
         return crawl, crawl.snapshot_set.all()
 
     if bg:
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+
+__package__ = "archivebox.cli"
+__command__ = "archivebox bench"
+
+import io
+import json
+import sys
+import time
+import random
+import platform
+import statistics
+from contextlib import redirect_stdout
+from datetime import timedelta
+from pathlib import Path
+from collections.abc import Callable
+
+import rich_click as click
+from rich import print
+
+from archivebox.misc.util import enforce_types, docstring
+
+
+BENCH_SCHEMA_VERSION = 1
+BENCH_USERNAME = "bench"
+BENCH_PLUGINS = ("wget", "screenshot", "pdf", "singlefile", "readability", "favicon", "title", "headers")
+BENCH_DOMAINS = 50
+SNAPSHOTS_PER_CRAWL = 1000
+
+
+def generate_collection(
+    snapshots: int,
+    results_per_snapshot: int,
+    tags: int,
+    files_per_result: int,
+    file_size: int,
+    depth: int,
+    seed: int = 0,
+) -> dict[str, int]:
+    """Bulk-create a synthetic collection of Crawls, Snapshots, Tags and ArchiveResults with output files on disk."""
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from archivebox.core.models import ArchiveResult, Snapshot, SnapshotTag, Tag
+    from archivebox.crawls.models import Crawl
+    from archivebox.uuid_compat import uuid7
+
+    rng = random.Random(seed)
+    user, _created = get_user_model().objects.get_or_create(
+        username=BENCH_USERNAME,
+        defaults={"is_superuser": True, "is_staff": True},
+    )
+    fs_version = Snapshot._fs_current_version()
+    now = timezone.now()
+    base_ts = now.timestamp() - snapshots
+
+    Tag.objects.bulk_create([Tag(name=f"bench-tag-{i}") for i in range(tags)], ignore_conflicts=True)
+    tag_ids = list(Tag.objects.filter(name__startswith="bench-tag-").values_list("id", flat=True))
+
+    # files are written from a small pool of payloads so generation stays IO-bound rather than RNG-bound
+    payloads = [rng.randbytes(file_size) for _ in range(8)] if file_size else [b""]
+    stats = {"crawls": 0, "snapshots": 0, "archiveresults": 0, "tags": len(tag_ids), "files": 0, "bytes": 0}
+
+    for batch_start in range(0, snapshots, SNAPSHOTS_PER_CRAWL):
+        batch_range = range(batch_start, min(batch_start + SNAPSHOTS_PER_CRAWL, snapshots))
+        urls = [f"https://bench-{i % BENCH_DOMAINS}.example.com/page/{i}" for i in batch_range]
+        crawl = Crawl.objects.create(
+            urls="\n".join(urls),
+            created_by=user,
+            label=f"bench {batch_start}",
+            status=Crawl.StatusChoices.SEALED,
+            retry_at=None,
+        )
+        stats["crawls"] += 1
+
+        snapshot_objs = []
+        for i, url in zip(batch_range, urls):
+            bookmarked_at = now - timedelta(seconds=snapshots - i)
+            snapshot_objs.append(
+                Snapshot(
+                    id=uuid7(),
+                    url=url,
+                    title=f"Bench page {i} on bench-{i % BENCH_DOMAINS}",
+                    timestamp=f"{base_ts + i:.6f}",
+                    bookmarked_at=bookmarked_at,
+                    created_at=bookmarked_at,
+                    downloaded_at=bookmarked_at,
+                    crawl=crawl,
+                    fs_version=fs_version,
+                    status=Snapshot.StatusChoices.SEALED,
+                    retry_at=None,
+                ),
+            )
+        Snapshot.objects.bulk_create(snapshot_objs)
+        stats["snapshots"] += len(snapshot_objs)
+
+        if tag_ids:
+            SnapshotTag.objects.bulk_create(
+                [
+                    SnapshotTag(snapshot_id=snapshot.id, tag_id=tag_id)
+                    for snapshot in snapshot_objs
+                    for tag_id in rng.sample(tag_ids, k=min(len(tag_ids), rng.randint(1, 3)))
+                ],
+            )
+
+        result_objs = []
+        for snapshot in snapshot_objs:
+            snapshot_dir = snapshot.get_storage_path_for_version(fs_version)
+            for plugin in BENCH_PLUGINS[:results_per_snapshot]:
+                output_files = {}
+                for file_idx in range(files_per_result):
+                    nested = "/".join(f"d{level}" for level in range(depth))
+                    relative_path = f"{nested}/file{file_idx}.bin" if nested else f"file{file_idx}.bin"
+                    file_path = snapshot_dir / plugin / relative_path
+                    file_path.parent.mkdir(parents=True, exist_ok=True)
+                    file_path.write_bytes(payloads[rng.randrange(len(payloads))])
+                    output_files[relative_path] = {"extension": "bin", "mimetype": "application/octet-stream", "size": file_size}
+                result_objs.append(
+                    ArchiveResult(
+                        id=uuid7(),
+                        snapshot=snapshot,
+                        plugin=plugin,
+                        status=ArchiveResult.StatusChoices.SUCCEEDED,
+                        output_str=f"{plugin} output",
+                        output_files=output_files,
+                        output_size=file_size * files_per_result,
+                        output_mimetypes="application/octet-stream" if files_per_result else "",
+                        start_ts=snapshot.bookmarked_at,
+                        end_ts=snapshot.bookmarked_at,
+                    ),
+                )
+                stats["files"] += files_per_result
+                stats["bytes"] += file_size * files_per_result
+        ArchiveResult.objects.bulk_create(result_objs, batch_size=1000)
+        stats["archiveresults"] += len(result_objs)
+        print(f"    [{stats['snapshots']}/{snapshots}] snapshots generated...")
+
+    return stats
+
+
+def time_it(func: Callable[[], int | None], iterations: int) -> dict[str, float | int]:
+    """Run func() `iterations` times (after one untimed warmup) and summarize the wall-clock timings."""
+    ops = func() or 1
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {
+        "ops": ops,
+        "iterations": iterations,
+        "min_s": min(timings),
+        "median_s": median,
+        "mean_s": statistics.fmean(timings),
+        "max_s": max(timings),
+        "per_op_ms": median / ops * 1000,
+    }
+
+
+def get_benchmarks(sample_size: int) -> dict[str, Callable[[], int | None]]:
+    """Build the named hot-path benchmarks, each returns the number of operations it performed per call."""
+    from unittest import mock
+
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.utils import timezone
+
+    from archivebox.api.models import APIToken
+    from archivebox.cli.archivebox_status import status
+    from archivebox.config.common import get_config
+    from archivebox.core.host_utils import get_api_host, get_web_host
+    from archivebox.core.models import Snapshot
+    from archivebox.crawls.models import Crawl
+    from archivebox.services import runner
+
+    user, _created = get_user_model().objects.get_or_create(
+        username=BENCH_USERNAME,
+        defaults={"is_superuser": True, "is_staff": True},
+    )
+    api_token = APIToken.objects.create(created_by=user, expires=timezone.now() + timedelta(days=1))
+    api_client = Client(HTTP_HOST=get_api_host(), HTTP_X_ARCHIVEBOX_API_KEY=api_token.token)
+    web_client = Client(HTTP_HOST=get_web_host())
+    web_client.force_login(user)
+    sample = list(Snapshot.objects.select_related("crawl__created_by").order_by("-bookmarked_at")[:sample_size])
+
+    def bench_get_config() -> int:
+        for _ in range(100):
+            get_config()
+        return 100
+
+    def bench_get_config_snapshot() -> int:
+        for snapshot in sample:
+            get_config(snapshot=snapshot)
+        return len(sample)
+
+    def bench_status() -> int:
+        with redirect_stdout(io.StringIO()):
+            status()
+        return 1
+
+    def bench_to_json() -> int:
+        Snapshot.objects.all().to_json()
+        return 1
+
+    def bench_api(path: str) -> Callable[[], int]:
+        def bench() -> int:
+            response = api_client.get(path)
+            assert response.status_code == 200, f"{path} returned {response.status_code}"
+            return 1
+
+        return bench
+
+    def bench_public_search() -> int:
+        for query in ("bench-7", "page/12", "bench-tag-3"):
+            response = web_client.get("/public/", {"q": query, "search_mode": "meta"})
+            assert response.status_code == 200, f"/public/?q={query} returned {response.status_code}"
+        return 3
+
+    def bench_snapshot_save() -> int:
+        for snapshot in sample:
+            snapshot.save()
+        return len(sample)
+
+    def bench_claim_loop() -> int:
+        # requeue the sample, then drain it through run_pending_crawls() with the hook runner stubbed out
+        Snapshot.objects.filter(id__in=[snapshot.id for snapshot in sample]).update(
+            status=Snapshot.StatusChoices.QUEUED,
+            retry_at=timezone.now(),
+        )
+
+        def stub_run_crawl(crawl_id, *, snapshot_ids=None, **kwargs):
+            if snapshot_ids:
+                Snapshot.objects.filter(id__in=snapshot_ids).update(status=Snapshot.StatusChoices.SEALED, retry_at=None)
+            else:
+                Crawl.objects.filter(id=crawl_id).update(status=Crawl.StatusChoices.SEALED, retry_at=None)
+
+        with mock.patch.object(runner, "run_crawl", stub_run_crawl), mock.patch.object(runner, "run_binary", lambda binary_id: None):
+            runner.run_pending_crawls()
+        return len(sample)
+
+    return {
+        "get_config": bench_get_config,
+        "get_config.snapshot": bench_get_config_snapshot,
+        "status": bench_status,
+        "snapshots.to_json": bench_to_json,
+        "api.snapshots": bench_api("/api/v1/core/snapshots?limit=100"),
+        "api.archiveresults": bench_api("/api/v1/core/archiveresults?limit=100"),
+        "api.tags": bench_api("/api/v1/core/tags?limit=100"),
+        "api.crawls": bench_api("/api/v1/crawls/crawls?limit=100"),
+        "public_index.search": bench_public_search,
+        "snapshot.save": bench_snapshot_save,
+        "runner.claim_loop": bench_claim_loop,
+    }
+
+
+def print_comparison(results: dict, baseline: dict) -> None:
+    print(f"[green]\\[*] Compared to {baseline.get('version')} ({baseline.get('commit') or 'unknown commit'}):[/green]")
+    for name, result in results["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if not old:
+            print(f"    {name:<24} {result['per_op_ms']:>10.3f} ms/op   (new)")
+            continue
+        ratio = result["per_op_ms"] / old["per_op_ms"] if old["per_op_ms"] else float("inf")
+        color = "red" if ratio > 1.1 else "green" if ratio < 0.9 else "grey53"
+        print(f"    {name:<24} {old['per_op_ms']:>10.3f} -> {result['per_op_ms']:>10.3f} ms/op   [{color}]{ratio:.2f}x[/{color}]")
+
+
+@enforce_types
+def bench(
+    snapshots: int = 1000,
+    results_per_snapshot: int = 4,
+    tags: int = 50,
+    files_per_result: int = 3,
+    file_size: int = 4096,
+    depth: int = 2,
+    iterations: int = 5,
+    sample_size: int = 100,
+    only: tuple[str, ...] = (),
+    skip_generate: bool = False,
+    output: str = "-",
+    compare: str | None = None,
+) -> dict:
+    """Generate a synthetic collection and time the hot paths, emitting JSON results that can be compared across versions"""
+
+    from archivebox.config.common import get_config
+    from archivebox.config.version import VERSION
+    from archivebox.core.models import ArchiveResult, Snapshot, Tag
+
+    if not skip_generate:
+        if Snapshot.objects.exists():
+            print(
+                "[red][X] archivebox bench generates fake data and must be run in an empty collection, e.g.:[/red]\n"
+                "    mkdir /tmp/bench && cd /tmp/bench && archivebox init && archivebox bench\n"
+                "    (or pass --skip-generate to only time the hot paths against the existing collection)",
+                file=sys.stderr,
+            )
+            raise SystemExit(2)
+        print(f"[green]\\[*] Generating {snapshots} synthetic snapshots...[/green]", file=sys.stderr)
+        with redirect_stdout(sys.stderr):
+            generate_collection(snapshots, results_per_snapshot, tags, files_per_result, file_size, depth)
+
+    benchmarks = get_benchmarks(sample_size)
+    unknown = set(only) - set(benchmarks)
+    if unknown:
+        raise click.BadParameter(f"unknown benchmark(s) {', '.join(sorted(unknown))}, choose from: {', '.join(benchmarks)}")
+
+    results = {
+        "schema_version": BENCH_SCHEMA_VERSION,
+        "version": VERSION,
+        "commit": get_config().COMMIT_HASH,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "snapshots": snapshots,
+            "results_per_snapshot": results_per_snapshot,
+            "tags": tags,
+            "files_per_result": files_per_result,
+            "file_size": file_size,
+            "depth": depth,
+            "iterations": iterations,
+            "sample_size": sample_size,
+        },
+        "collection": {
+            "snapshots": Snapshot.objects.count(),
+            "archiveresults": ArchiveResult.objects.count(),
+            "tags": Tag.objects.count(),
+        },
+        "results": {},
+    }
+    for name, func in benchmarks.items():
+        if only and name not in only:
+            continue
+        print(f"[grey53]    timing {name}...[/grey53]", file=sys.stderr)
+        results["results"][name] = time_it(func, iterations)
+
+    results_json = json.dumps(results, indent=4)
+    if output == "-":
+        sys.stdout.write(results_json + "\n")
+    else:
+        Path(output).write_text(results_json + "\n")
+        print(f"[green]\\[√] Wrote benchmark results to {output}[/green]", file=sys.stderr)
+
+    if compare:
+        with redirect_stdout(sys.stderr):
+            print_comparison(results, json.loads(Path(compare).read_text()))
+
+    return results
+
+
+@click.command()
+@click.option("--snapshots", type=int, default=1000, help="Number of synthetic Snapshots to generate")
+@click.option("--results-per-snapshot", type=click.IntRange(0, len(BENCH_PLUGINS)), default=4, help="ArchiveResults per Snapshot")
+@click.option("--tags", type=int, default=50, help="Number of distinct Tags (each Snapshot gets 1-3)")
+@click.option("--files-per-result", type=int, default=3, help="Output files written per ArchiveResult")
+@click.option("--file-size", type=int, default=4096, help="Size of each output file in bytes")
+@click.option("--depth", type=int, default=2, help="Directory nesting depth of output files within each plugin dir")
+@click.option("--iterations", type=click.IntRange(1), default=5, help="Timed runs per benchmark (after one warmup)")
+@click.option("--sample-size", type=click.IntRange(1), default=100, help="Snapshots used by per-object benchmarks")
+@click.option("--only", multiple=True, help="Only run the named benchmark(s), e.g. --only=status --only=api.snapshots")
+@click.option("--skip-generate", is_flag=True, help="Don't generate data, time the hot paths against the existing collection")
+@click.option("--output", "-o", default="-", help="Write JSON results to this file instead of stdout")
+@click.option("--compare", type=click.Path(exists=True, dir_okay=False), help="Print a comparison against a previous JSON results file")
+@docstring(bench.__doc__)
+def main(**kwargs):
+    bench(**kwargs)
+
+
+if __name__ == "__main__":
+    main()
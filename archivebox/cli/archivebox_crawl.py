@@ -71,28 +71,23 @@ def create_crawl(
     created_by_id = created_by_id or get_or_create_system_user_pk()
     is_tty = sys.stdout.isatty()
 
-    # Collect all input records
-    records = list(read_args_or_stdin(urls))
-
-    if not records:
-        rprint("[yellow]No URLs provided. Pass URLs as arguments or via stdin.[/yellow]", file=sys.stderr)
-        return 1
-
-    # Separate pass-through records from URL records
+    # Stream input records: pass-through records are written right away, only the URLs are kept
+    # (a Crawl needs all of them, but that's a list of strings rather than every parsed record)
     url_list = []
-    pass_through_records = []
+    pass_through_count = 0
+    seen_records = False
 
-    for record in records:
+    for record in read_args_or_stdin(urls):
+        seen_records = True
         record_type = record.get("type", "")
 
-        # Pass-through: output records that aren't URL/Crawl types
-        if record_type and record_type != TYPE_CRAWL and not record.get("url") and not record.get("urls"):
-            pass_through_records.append(record)
-            continue
-
-        # Handle existing Crawl records (just pass through with id)
-        if record_type == TYPE_CRAWL and record.get("id"):
-            pass_through_records.append(record)
+        # Pass-through: output records that aren't URL/Crawl types, and existing Crawl records (just pass through with id)
+        if (record_type and record_type != TYPE_CRAWL and not record.get("url") and not record.get("urls")) or (
+            record_type == TYPE_CRAWL and record.get("id")
+        ):
+            if not is_tty:
+                write_record(record)
+            pass_through_count += 1
             continue
 
         # Collect URLs
@@ -108,15 +103,14 @@ def create_crawl(
                 if line and not line.startswith("#"):
                     url_list.append(line)
 
-    # Output pass-through records first
-    if not is_tty:
-        for record in pass_through_records:
-            write_record(record)
+    if not seen_records:
+        rprint("[yellow]No URLs provided. Pass URLs as arguments or via stdin.[/yellow]", file=sys.stderr)
+        return 1
 
     if not url_list:
-        if pass_through_records:
+        if pass_through_count:
             # If we had pass-through records but no URLs, that's OK
-            rprint(f"[dim]Passed through {len(pass_through_records)} records, no new URLs[/dim]", file=sys.stderr)
+            rprint(f"[dim]Passed through {pass_through_count} records, no new URLs[/dim]", file=sys.stderr)
             return 0
         rprint("[red]No valid URLs found[/red]", file=sys.stderr)
         return 1
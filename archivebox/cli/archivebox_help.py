@@ -23,15 +23,15 @@ def help() -> None:
 
     COMMANDS_HELP_TEXT = (
         "\n    ".join(
-            f"[green]{cmd.ljust(20)}[/green] {ArchiveBoxGroup._lazy_load(cmd).__doc__}" for cmd in ArchiveBoxGroup.meta_commands.keys()
+            f"[green]{cmd.ljust(20)}[/green] {ArchiveBoxGroup.get_command_doc(cmd)}" for cmd in ArchiveBoxGroup.meta_commands.keys()
         )
         + "\n\n    "
         + "\n    ".join(
-            f"[green]{cmd.ljust(20)}[/green] {ArchiveBoxGroup._lazy_load(cmd).__doc__}" for cmd in ArchiveBoxGroup.setup_commands.keys()
+            f"[green]{cmd.ljust(20)}[/green] {ArchiveBoxGroup.get_command_doc(cmd)}" for cmd in ArchiveBoxGroup.setup_commands.keys()
         )
         + "\n\n    "
         + "\n    ".join(
-            f"[green]{cmd.ljust(20)}[/green] {ArchiveBoxGroup._lazy_load(cmd).__doc__}" for cmd in ArchiveBoxGroup.archive_commands.keys()
+            f"[green]{cmd.ljust(20)}[/green] {ArchiveBoxGroup.get_command_doc(cmd)}" for cmd in ArchiveBoxGroup.archive_commands.keys()
         )
     )
 
@@ -15,7 +15,7 @@ from archivebox.misc.util import docstring, enforce_types
 
 
 @enforce_types
-def mcp():
+def mcp(workers: int = 4):
     """
     Start the MCP server in stdio mode for AI agent control.
 
@@ -30,19 +30,24 @@ def mcp():
         archivebox mcp
         {"jsonrpc":"2.0","id":1,"method":"initialize","params":{}}
         {"jsonrpc":"2.0","id":2,"method":"tools/list","params":{}}
+
+    Up to --workers tool calls run concurrently. Pass params._meta.progressToken in a
+    tools/call request to receive the command's output as notifications/progress
+    messages while it runs, and send notifications/cancelled to stop it.
     """
 
     from archivebox.mcp.server import run_mcp_server
 
     # Run the stdio server (blocks until stdin closes)
-    run_mcp_server()
+    run_mcp_server(max_workers=workers)
 
 
 @click.command()
+@click.option("--workers", "-w", type=click.IntRange(min=1), default=4, help="Maximum number of tool calls to run concurrently")
 @docstring(mcp.__doc__)
 def main(**kwargs):
     """Start the MCP server in stdio mode"""
-    mcp()
+    mcp(**kwargs)
 
 
 if __name__ == "__main__":
@@ -3,12 +3,12 @@
 __package__ = "archivebox.cli"
 __command__ = "archivebox remove"
 
-import shutil
 from pathlib import Path
 from collections.abc import Iterable
 
 import rich_click as click
 
+from django.db import transaction
 from django.db.models import QuerySet
 
 from archivebox.config import DATA_DIR
@@ -25,6 +25,10 @@ from archivebox.misc.logging_util import (
 )
 
 
+# snapshots deleted per transaction, keeps each SQLite write lock short so workers/the web UI aren't starved
+REMOVE_CHUNK_SIZE = 500
+
+
 @enforce_types
 def remove(
     filter_patterns: Iterable[str] = (),
@@ -34,6 +38,7 @@ def remove(
     before: float | None = None,
     yes: bool = False,
     delete: bool = False,
+    keep_trash: bool = False,
     out_dir: Path = DATA_DIR,
 ) -> QuerySet:
     """Remove the specified URLs from the archive"""
@@ -65,26 +70,42 @@ def remove(
     log_list_finished(snapshots)
     log_removal_started(snapshots, yes=yes, delete=delete)
 
+    from archivebox.search import flush_search_index
+    from archivebox.core.models import Snapshot
+    from archivebox.misc.trash import move_to_trash, start_trash_reaper
+
+    config = get_config()
+    snapshot_ids = list(snapshots.values_list("pk", flat=True))
+    to_remove = len(snapshot_ids)
+    trashed = 0
     timer = TimedProgress(360, prefix="      ")
     try:
-        for snapshot in snapshots:
-            if delete:
-                shutil.rmtree(snapshot.output_dir, ignore_errors=True)
-                legacy_path = get_config().ARCHIVE_DIR / snapshot.timestamp
+        for start in range(0, to_remove, REMOVE_CHUNK_SIZE):
+            chunk = Snapshot.objects.filter(pk__in=snapshot_ids[start : start + REMOVE_CHUNK_SIZE])
+            output_dirs = [(Path(snapshot.output_dir), snapshot.timestamp) for snapshot in chunk.select_related("crawl")] if delete else []
+
+            flush_search_index(snapshots=chunk, config=config)
+            with transaction.atomic():
+                chunk.delete()
+
+            # the rows are gone, now move their folders out of the way (rename is atomic, the reaper deletes them later)
+            for output_dir, timestamp in output_dirs:
+                if move_to_trash(output_dir, config=config):
+                    trashed += 1
+                legacy_path = config.ARCHIVE_DIR / timestamp
                 if legacy_path.is_symlink():
                     legacy_path.unlink(missing_ok=True)
     finally:
         timer.end()
 
-    to_remove = snapshots.count()
-
-    from archivebox.search import flush_search_index
-    from archivebox.core.models import Snapshot
+    if trashed and not keep_trash:
+        start_trash_reaper()
 
-    flush_search_index(snapshots=snapshots)
-    snapshots.delete()
     all_snapshots = Snapshot.objects.all()
     log_removal_finished(all_snapshots.count(), to_remove)
+    if trashed:
+        next_step = "run archivebox manage reap_trash to delete them" if keep_trash else "they are being deleted in the background"
+        print(f"    Moved {trashed} data folders to the trash, {next_step}.")
 
     return all_snapshots
 
@@ -92,6 +113,7 @@ def remove(
 @click.command()
 @click.option("--yes", is_flag=True, help="Remove links instantly without prompting to confirm")
 @click.option("--delete", is_flag=True, help="Delete the archived content and metadata folder in addition to removing from index")
+@click.option("--keep-trash", is_flag=True, help="With --delete, leave the moved folders in the trash instead of deleting them in the background")
 @click.option("--before", type=float, help="Remove only URLs bookmarked before timestamp")
 @click.option("--after", type=float, help="Remove only URLs bookmarked after timestamp")
 @click.option(
@@ -60,11 +60,16 @@ def process_stdin_records() -> int:
     Handles any record type: Crawl, Snapshot, ArchiveResult.
     Auto-cascades: Crawl → Snapshots → ArchiveResults.
 
+    Records are read and committed in bounded batches (see misc/jsonl.py), each batch's output is
+    written as soon as it's committed and the batch is run before more stdin is read.
+
     Returns exit code (0 = success, 1 = error).
     """
+    from django.db import transaction
     from django.utils import timezone
 
     from archivebox.misc.jsonl import (
+        iter_batches,
         read_stdin,
         write_record,
         TYPE_CRAWL,
@@ -79,168 +84,175 @@ def process_stdin_records() -> int:
     from archivebox.machine.models import Binary
     from archivebox.services.runner import run_binary, run_crawl
 
-    records = list(read_stdin())
     is_tty = sys.stdout.isatty()
-
-    if not records:
-        return 0  # Nothing to process
-
-    created_by_id = get_or_create_system_user_pk()
+    created_by_id = None
     queued_count = 0
-    output_records = []
-    full_crawl_ids: set[str] = set()
-    snapshot_ids_by_crawl: dict[str, set[str]] = defaultdict(set)
-    plugin_names_by_crawl: dict[str, set[str]] = defaultdict(set)
-    run_all_plugins_for_crawl: set[str] = set()
-    binary_ids: list[str] = []
-
-    for record in records:
-        record_type = record.get("type", "")
-        record_id = record.get("id")
 
-        try:
-            if record_type == TYPE_CRAWL:
-                if record_id:
-                    # Existing crawl - re-queue
-                    try:
-                        crawl = Crawl.objects.get(id=record_id)
-                    except Crawl.DoesNotExist:
-                        crawl = Crawl.from_json(record, overrides={"created_by_id": created_by_id})
-                else:
-                    # New crawl - create it
-                    crawl = Crawl.from_json(record, overrides={"created_by_id": created_by_id})
-
-                if crawl:
-                    crawl.retry_at = timezone.now()
-                    if crawl.status not in [Crawl.StatusChoices.SEALED]:
-                        crawl.status = Crawl.StatusChoices.QUEUED
-                    crawl.save()
-                    full_crawl_ids.add(str(crawl.id))
-                    run_all_plugins_for_crawl.add(str(crawl.id))
-                    output_records.append(crawl.to_json())
-                    queued_count += 1
-
-            elif record_type == TYPE_SNAPSHOT or (record.get("url") and not record_type):
-                if record_id:
-                    # Existing snapshot - re-queue
-                    try:
-                        snapshot = Snapshot.objects.get(id=record_id)
-                    except Snapshot.DoesNotExist:
-                        snapshot = Snapshot.from_json(record, overrides={"created_by_id": created_by_id})
-                else:
-                    # New snapshot - create it
-                    snapshot = Snapshot.from_json(record, overrides={"created_by_id": created_by_id})
-
-                if snapshot:
-                    snapshot.retry_at = timezone.now()
-                    if snapshot.status not in [Snapshot.StatusChoices.SEALED]:
-                        snapshot.status = Snapshot.StatusChoices.QUEUED
-                    snapshot.save()
-                    crawl = snapshot.crawl
-                    crawl.retry_at = timezone.now()
-                    if crawl.status != Crawl.StatusChoices.STARTED:
-                        crawl.status = Crawl.StatusChoices.QUEUED
-                    crawl.save(update_fields=["status", "retry_at", "modified_at"])
-                    crawl_id = str(snapshot.crawl_id)
-                    snapshot_ids_by_crawl[crawl_id].add(str(snapshot.id))
-                    run_all_plugins_for_crawl.add(crawl_id)
-                    output_records.append(snapshot.to_json())
-                    queued_count += 1
-
-            elif record_type == TYPE_ARCHIVERESULT:
-                if record_id:
-                    # Existing archiveresult - re-queue
-                    try:
-                        archiveresult = ArchiveResult.objects.get(id=record_id)
-                    except ArchiveResult.DoesNotExist:
-                        archiveresult = None
-                else:
-                    archiveresult = None
-
-                snapshot_id = record.get("snapshot_id")
-                plugin_name = record.get("plugin")
-                snapshot = None
-                if archiveresult:
-                    if archiveresult.status in [
-                        ArchiveResult.StatusChoices.FAILED,
-                        ArchiveResult.StatusChoices.SKIPPED,
-                        ArchiveResult.StatusChoices.NORESULTS,
-                        ArchiveResult.StatusChoices.BACKOFF,
-                    ]:
-                        archiveresult.reset_for_retry()
-                    snapshot = archiveresult.snapshot
-                    plugin_name = plugin_name or archiveresult.plugin
-                elif snapshot_id:
-                    try:
-                        snapshot = Snapshot.objects.get(id=snapshot_id)
-                    except Snapshot.DoesNotExist:
-                        snapshot = None
-
-                if snapshot:
-                    snapshot.retry_at = timezone.now()
-                    if snapshot.status != Snapshot.StatusChoices.STARTED:
-                        snapshot.status = Snapshot.StatusChoices.QUEUED
-                    snapshot.save(update_fields=["status", "retry_at", "modified_at"])
-                    crawl = snapshot.crawl
-                    crawl.retry_at = timezone.now()
-                    if crawl.status != Crawl.StatusChoices.STARTED:
-                        crawl.status = Crawl.StatusChoices.QUEUED
-                    crawl.save(update_fields=["status", "retry_at", "modified_at"])
-                    crawl_id = str(snapshot.crawl_id)
-                    snapshot_ids_by_crawl[crawl_id].add(str(snapshot.id))
-                    if plugin_name:
-                        plugin_names_by_crawl[crawl_id].add(str(plugin_name))
-                    output_records.append(record if not archiveresult else archiveresult.to_json())
-                    queued_count += 1
-
-            elif record_type in {TYPE_BINARYREQUEST, TYPE_BINARY}:
-                if record_id:
-                    try:
-                        binary = Binary.objects.get(id=record_id)
-                    except Binary.DoesNotExist:
-                        binary = Binary.from_json(record)
-                else:
-                    binary = Binary.from_json(record)
-
-                if binary:
-                    binary.retry_at = timezone.now()
-                    if binary.status != Binary.StatusChoices.INSTALLED:
-                        binary.status = Binary.StatusChoices.QUEUED
-                    binary.save()
-                    binary_ids.append(str(binary.id))
-                    output_records.append(binary.to_json())
-                    queued_count += 1
-
-            else:
-                # Unknown type - pass through
-                output_records.append(record)
-
-        except Exception as e:
-            rprint(f"[yellow]Error processing record: {e}[/yellow]", file=sys.stderr)
+    for batch in iter_batches(read_stdin()):
+        created_by_id = created_by_id or get_or_create_system_user_pk()
+        batch_queued_count = 0
+        output_records = []
+        full_crawl_ids: set[str] = set()
+        snapshot_ids_by_crawl: dict[str, set[str]] = defaultdict(set)
+        plugin_names_by_crawl: dict[str, set[str]] = defaultdict(set)
+        run_all_plugins_for_crawl: set[str] = set()
+        binary_ids: list[str] = []
+
+        with transaction.atomic():
+            for record in batch:
+                record_type = record.get("type", "")
+                record_id = record.get("id")
+
+                try:
+                    # savepoint per record so one bad record doesn't roll back the rest of the batch
+                    with transaction.atomic():
+                        if record_type == TYPE_CRAWL:
+                            if record_id:
+                                # Existing crawl - re-queue
+                                try:
+                                    crawl = Crawl.objects.get(id=record_id)
+                                except Crawl.DoesNotExist:
+                                    crawl = Crawl.from_json(record, overrides={"created_by_id": created_by_id})
+                            else:
+                                # New crawl - create it
+                                crawl = Crawl.from_json(record, overrides={"created_by_id": created_by_id})
+
+                            if crawl:
+                                crawl.retry_at = timezone.now()
+                                if crawl.status not in [Crawl.StatusChoices.SEALED]:
+                                    crawl.status = Crawl.StatusChoices.QUEUED
+                                crawl.save()
+                                full_crawl_ids.add(str(crawl.id))
+                                run_all_plugins_for_crawl.add(str(crawl.id))
+                                output_records.append(crawl.to_json())
+                                batch_queued_count += 1
+
+                        elif record_type == TYPE_SNAPSHOT or (record.get("url") and not record_type):
+                            if record_id:
+                                # Existing snapshot - re-queue
+                                try:
+                                    snapshot = Snapshot.objects.get(id=record_id)
+                                except Snapshot.DoesNotExist:
+                                    snapshot = Snapshot.from_json(record, overrides={"created_by_id": created_by_id})
+                            else:
+                                # New snapshot - create it
+                                snapshot = Snapshot.from_json(record, overrides={"created_by_id": created_by_id})
+
+                            if snapshot:
+                                snapshot.retry_at = timezone.now()
+                                if snapshot.status not in [Snapshot.StatusChoices.SEALED]:
+                                    snapshot.status = Snapshot.StatusChoices.QUEUED
+                                snapshot.save()
+                                crawl = snapshot.crawl
+                                crawl.retry_at = timezone.now()
+                                if crawl.status != Crawl.StatusChoices.STARTED:
+                                    crawl.status = Crawl.StatusChoices.QUEUED
+                                crawl.save(update_fields=["status", "retry_at", "modified_at"])
+                                crawl_id = str(snapshot.crawl_id)
+                                snapshot_ids_by_crawl[crawl_id].add(str(snapshot.id))
+                                run_all_plugins_for_crawl.add(crawl_id)
+                                output_records.append(snapshot.to_json())
+                                batch_queued_count += 1
+
+                        elif record_type == TYPE_ARCHIVERESULT:
+                            if record_id:
+                                # Existing archiveresult - re-queue
+                                try:
+                                    archiveresult = ArchiveResult.objects.get(id=record_id)
+                                except ArchiveResult.DoesNotExist:
+                                    archiveresult = None
+                            else:
+                                archiveresult = None
+
+                            snapshot_id = record.get("snapshot_id")
+                            plugin_name = record.get("plugin")
+                            snapshot = None
+                            if archiveresult:
+                                if archiveresult.status in [
+                                    ArchiveResult.StatusChoices.FAILED,
+                                    ArchiveResult.StatusChoices.SKIPPED,
+                                    ArchiveResult.StatusChoices.NORESULTS,
+                                    ArchiveResult.StatusChoices.BACKOFF,
+                                ]:
+                                    archiveresult.reset_for_retry()
+                                snapshot = archiveresult.snapshot
+                                plugin_name = plugin_name or archiveresult.plugin
+                            elif snapshot_id:
+                                try:
+                                    snapshot = Snapshot.objects.get(id=snapshot_id)
+                                except Snapshot.DoesNotExist:
+                                    snapshot = None
+
+                            if snapshot:
+                                snapshot.retry_at = timezone.now()
+                                if snapshot.status != Snapshot.StatusChoices.STARTED:
+                                    snapshot.status = Snapshot.StatusChoices.QUEUED
+                                snapshot.save(update_fields=["status", "retry_at", "modified_at"])
+                                crawl = snapshot.crawl
+                                crawl.retry_at = timezone.now()
+                                if crawl.status != Crawl.StatusChoices.STARTED:
+                                    crawl.status = Crawl.StatusChoices.QUEUED
+                                crawl.save(update_fields=["status", "retry_at", "modified_at"])
+                                crawl_id = str(snapshot.crawl_id)
+                                snapshot_ids_by_crawl[crawl_id].add(str(snapshot.id))
+                                if plugin_name:
+                                    plugin_names_by_crawl[crawl_id].add(str(plugin_name))
+                                output_records.append(record if not archiveresult else archiveresult.to_json())
+                                batch_queued_count += 1
+
+                        elif record_type in {TYPE_BINARYREQUEST, TYPE_BINARY}:
+                            if record_id:
+                                try:
+                                    binary = Binary.objects.get(id=record_id)
+                                except Binary.DoesNotExist:
+                                    binary = Binary.from_json(record)
+                            else:
+                                binary = Binary.from_json(record)
+
+                            if binary:
+                                binary.retry_at = timezone.now()
+                                if binary.status != Binary.StatusChoices.INSTALLED:
+                                    binary.status = Binary.StatusChoices.QUEUED
+                                binary.save()
+                                binary_ids.append(str(binary.id))
+                                output_records.append(binary.to_json())
+                                batch_queued_count += 1
+
+                        else:
+                            # Unknown type - pass through
+                            output_records.append(record)
+
+                except Exception as e:
+                    rprint(f"[yellow]Error processing record: {e}[/yellow]", file=sys.stderr)
+                    continue
+
+
+        queued_count += batch_queued_count
+
+        # Output the committed records right away (for chaining), before this batch is run
+        if not is_tty:
+            for rec in output_records:
+                write_record(rec)
+
+        if not batch_queued_count:
             continue
 
-    # Output all processed records (for chaining)
-    if not is_tty:
-        for rec in output_records:
-            write_record(rec)
+        rprint(f"[blue]Processing {batch_queued_count} records...[/blue]", file=sys.stderr)
 
-    if queued_count == 0:
-        rprint("[yellow]No records to process[/yellow]", file=sys.stderr)
-        return 0
-
-    rprint(f"[blue]Processing {queued_count} records...[/blue]", file=sys.stderr)
-
-    for binary_id in binary_ids:
-        run_binary(binary_id)
+        # stdin isn't read again until this batch is done, which is what applies backpressure to the upstream command
+        for binary_id in binary_ids:
+            run_binary(binary_id)
 
-    targeted_crawl_ids = full_crawl_ids | set(snapshot_ids_by_crawl)
-    if targeted_crawl_ids:
+        targeted_crawl_ids = full_crawl_ids | set(snapshot_ids_by_crawl)
         for crawl_id in sorted(targeted_crawl_ids):
             run_crawl(
                 crawl_id,
                 snapshot_ids=None if crawl_id in full_crawl_ids else sorted(snapshot_ids_by_crawl[crawl_id]),
                 selected_plugins=None if crawl_id in run_all_plugins_for_crawl else sorted(plugin_names_by_crawl[crawl_id]),
             )
+
+    if created_by_id is not None and queued_count == 0:
+        rprint("[yellow]No records to process[/yellow]", file=sys.stderr)
     return 0
 
 
@@ -172,8 +172,7 @@ def get_snapshots(
     return result
 
 
-@enforce_types
-def search(
+def render_search(
     filter_patterns: list[str] | None = None,
     filter_type: str = "substring",
     status: str = "indexed",
@@ -184,8 +183,8 @@ def search(
     html: bool = False,
     csv: str | None = None,
     with_headers: bool = False,
-):
-    """List, filter, and export information about archive entries"""
+) -> str:
+    """Query the DB for matching Snapshots and render them in the requested export format."""
 
     if with_headers and not (json or html or csv):
         stderr("[X] --with-headers requires --json, --html or --csv\n", color="red")
@@ -222,6 +221,36 @@ def search(
         # Convert to dict for printable_folders
         folders: dict[str, Snapshot | None] = {str(snapshot.output_dir): snapshot for snapshot in snapshots}
         output = printable_folders(folders, with_headers)
+    return output
+
+
+@enforce_types
+def search(
+    filter_patterns: list[str] | None = None,
+    filter_type: str = "substring",
+    status: str = "indexed",
+    before: float | None = None,
+    after: float | None = None,
+    sort: str | None = None,
+    json: bool = False,
+    html: bool = False,
+    csv: str | None = None,
+    with_headers: bool = False,
+):
+    """List, filter, and export information about archive entries"""
+
+    output = render_search(
+        filter_patterns=filter_patterns,
+        filter_type=filter_type,
+        status=status,
+        before=before,
+        after=after,
+        sort=sort,
+        json=json,
+        html=html,
+        csv=csv,
+        with_headers=with_headers,
+    )
 
     # Structured exports must be written directly to stdout.
     # rich.print() reflows long lines to console width, which corrupts JSON/CSV/HTML output.
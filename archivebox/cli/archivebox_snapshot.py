@@ -10,6 +10,7 @@ Actions:
     list    - List Snapshots as JSONL (with optional filters)
     update  - Update Snapshots from stdin JSONL
     delete  - Delete Snapshots from stdin JSONL
+    verify  - Check (and --repair) the persisted output directory paths
 
 Examples:
     # Create
@@ -25,6 +26,9 @@ Examples:
 
     # Delete
     archivebox snapshot list --url__icontains=spam.com | archivebox snapshot delete --yes
+
+    # Verify / repair persisted output paths
+    archivebox snapshot verify --repair
 """
 
 __package__ = "archivebox.cli"
@@ -35,6 +39,7 @@ from collections.abc import Iterable
 
 import rich_click as click
 from rich import print as rprint
+from django.db import transaction
 from django.db.models import Q, Sum
 from django.db.models.functions import Coalesce
 
@@ -56,12 +61,14 @@ def create_snapshots(
     """
     Create Snapshots from URLs or stdin JSONL (Crawl or Snapshot records).
     Pass-through: Records that are not Crawl/Snapshot/URL are output unchanged.
+    Input is streamed in batches, output for each batch is written as soon as it's committed.
 
     Exit codes:
         0: Success
         1: Failure
     """
     from archivebox.misc.jsonl import (
+        iter_batches,
         read_args_or_stdin,
         write_record,
         TYPE_SNAPSHOT,
@@ -74,95 +81,102 @@ def create_snapshots(
     created_by_id = created_by_id or get_or_create_system_user_pk()
     is_tty = sys.stdout.isatty()
 
-    # Collect all input records
-    records = list(read_args_or_stdin(urls))
-
-    if not records:
-        rprint("[yellow]No URLs or Crawls provided. Pass URLs as arguments or via stdin.[/yellow]", file=sys.stderr)
-        return 1
-
-    # Process each record - handle Crawls and plain URLs/Snapshots
-    created_snapshots = []
+    # Stream input records in bounded batches, committing each batch in one transaction
+    snapshot_count = 0
     pass_through_count = 0
-
-    for record in records:
-        record_type = record.get("type", "")
-
-        try:
-            if record_type == TYPE_CRAWL:
-                # Pass through the Crawl record itself first
-                if not is_tty:
-                    write_record(record)
-
-                # Input is a Crawl - get or create it, then create Snapshots for its URLs
-                crawl = None
-                crawl_id = record.get("id")
-                if crawl_id:
-                    try:
-                        crawl = Crawl.objects.get(id=crawl_id)
-                    except Crawl.DoesNotExist:
-                        crawl = Crawl.from_json(record, overrides={"created_by_id": created_by_id})
-                else:
-                    crawl = Crawl.from_json(record, overrides={"created_by_id": created_by_id})
-
-                if not crawl:
+    seen_records = False
+
+    for batch in iter_batches(read_args_or_stdin(urls)):
+        seen_records = True
+        batch_output = []
+        created_snapshots = []
+        with transaction.atomic():
+            for record in batch:
+                record_type = record.get("type", "")
+
+                try:
+                    with transaction.atomic():
+                        if record_type == TYPE_CRAWL:
+                            # Pass through the Crawl record itself first
+                            if not is_tty:
+                                batch_output.append(record)
+
+                            # Input is a Crawl - get or create it, then create Snapshots for its URLs
+                            crawl = None
+                            crawl_id = record.get("id")
+                            if crawl_id:
+                                try:
+                                    crawl = Crawl.objects.get(id=crawl_id)
+                                except Crawl.DoesNotExist:
+                                    crawl = Crawl.from_json(record, overrides={"created_by_id": created_by_id})
+                            else:
+                                crawl = Crawl.from_json(record, overrides={"created_by_id": created_by_id})
+
+                            if not crawl:
+                                continue
+
+                            # Create snapshots for each URL in the crawl
+                            for url in crawl.get_urls_list():
+                                merged_tags = crawl.tags_str
+                                if tag:
+                                    merged_tags = f"{merged_tags},{tag}" if merged_tags else tag
+                                snapshot_record = {
+                                    "url": url,
+                                    "tags": merged_tags,
+                                    "crawl_id": str(crawl.id),
+                                    "depth": depth,
+                                    "status": status,
+                                }
+                                snapshot = Snapshot.from_json(snapshot_record, overrides={"created_by_id": created_by_id})
+                                if snapshot:
+                                    created_snapshots.append(snapshot)
+                                    if not is_tty:
+                                        batch_output.append(snapshot.to_json())
+
+                        elif record_type == TYPE_SNAPSHOT or record.get("url"):
+                            # Input is a Snapshot or plain URL
+                            if tag and not record.get("tags"):
+                                record["tags"] = tag
+                            if status:
+                                record["status"] = status
+                            record["depth"] = record.get("depth", depth)
+
+                            snapshot = Snapshot.from_json(record, overrides={"created_by_id": created_by_id})
+                            if snapshot:
+                                created_snapshots.append(snapshot)
+                                if not is_tty:
+                                    batch_output.append(snapshot.to_json())
+
+                        else:
+                            # Pass-through: output records we don't handle
+                            if not is_tty:
+                                batch_output.append(record)
+                            pass_through_count += 1
+
+                except Exception as e:
+                    rprint(f"[red]Error creating snapshot: {e}[/red]", file=sys.stderr)
                     continue
 
-                # Create snapshots for each URL in the crawl
-                for url in crawl.get_urls_list():
-                    merged_tags = crawl.tags_str
-                    if tag:
-                        merged_tags = f"{merged_tags},{tag}" if merged_tags else tag
-                    snapshot_record = {
-                        "url": url,
-                        "tags": merged_tags,
-                        "crawl_id": str(crawl.id),
-                        "depth": depth,
-                        "status": status,
-                    }
-                    snapshot = Snapshot.from_json(snapshot_record, overrides={"created_by_id": created_by_id})
-                    if snapshot:
-                        created_snapshots.append(snapshot)
-                        if not is_tty:
-                            write_record(snapshot.to_json())
-
-            elif record_type == TYPE_SNAPSHOT or record.get("url"):
-                # Input is a Snapshot or plain URL
-                if tag and not record.get("tags"):
-                    record["tags"] = tag
-                if status:
-                    record["status"] = status
-                record["depth"] = record.get("depth", depth)
-
-                snapshot = Snapshot.from_json(record, overrides={"created_by_id": created_by_id})
-                if snapshot:
-                    created_snapshots.append(snapshot)
-                    if not is_tty:
-                        write_record(snapshot.to_json())
-
-            else:
-                # Pass-through: output records we don't handle
-                if not is_tty:
-                    write_record(record)
-                pass_through_count += 1
-
-        except Exception as e:
-            rprint(f"[red]Error creating snapshot: {e}[/red]", file=sys.stderr)
-            continue
+        # emit downstream records as soon as they're committed (blocks while the downstream pipe is full)
+        for output_record in batch_output:
+            write_record(output_record)
+        if is_tty:
+            for snapshot in created_snapshots:
+                rprint(f"  [dim]{snapshot.id}[/dim] {snapshot.url[:60]}", file=sys.stderr)
+        snapshot_count += len(created_snapshots)
+
+    if not seen_records:
+        rprint("[yellow]No URLs or Crawls provided. Pass URLs as arguments or via stdin.[/yellow]", file=sys.stderr)
+        return 1
 
-    if not created_snapshots:
+    if not snapshot_count:
         if pass_through_count > 0:
             rprint(f"[dim]Passed through {pass_through_count} records, no new snapshots[/dim]", file=sys.stderr)
             return 0
         rprint("[red]No snapshots created[/red]", file=sys.stderr)
         return 1
 
-    rprint(f"[green]Created {len(created_snapshots)} snapshots[/green]", file=sys.stderr)
-
-    if is_tty:
-        for snapshot in created_snapshots:
-            rprint(f"  [dim]{snapshot.id}[/dim] {snapshot.url[:60]}", file=sys.stderr)
-
+    rprint(f"[green]Created {snapshot_count} snapshots[/green]", file=sys.stderr)
     return 0
 
 
@@ -171,7 +185,7 @@ def create_snapshots(
 # =============================================================================
 
 
-def list_snapshots(
+def filter_snapshots(
     status: str | None = None,
     url__icontains: str | None = None,
     url__istartswith: str | None = None,
@@ -179,18 +193,12 @@ def list_snapshots(
     crawl_id: str | None = None,
     limit: int | None = None,
     sort: str | None = None,
-    csv: str | None = None,
-    with_headers: bool = False,
     search: str | None = None,
     query: str | None = None,
-) -> int:
+):
     """
-    List Snapshots as JSONL with optional filters.
-
-    Exit codes:
-        0: Success (even if no results)
+    Build the Snapshot queryset for `archivebox snapshot list` / `archivebox list` (also used directly by the MCP server).
     """
-    from archivebox.misc.jsonl import write_record
     from archivebox.core.models import Snapshot
     from archivebox.search import (
         get_default_search_mode,
@@ -199,12 +207,6 @@ def list_snapshots(
         query_search_index,
     )
 
-    if with_headers and not csv:
-        rprint("[red]--with-headers requires --csv[/red]", file=sys.stderr)
-        return 2
-
-    is_tty = sys.stdout.isatty() and not csv
-
     queryset = Snapshot.objects.annotate(output_size_sum=Coalesce(Sum("archiveresult__output_size"), 0)).order_by("-created_at")
 
     # Apply filters
@@ -258,6 +260,47 @@ def list_snapshots(
         queryset = queryset.order_by(sort)
     if limit:
         queryset = queryset[:limit]
+    return queryset
+
+
+def list_snapshots(
+    status: str | None = None,
+    url__icontains: str | None = None,
+    url__istartswith: str | None = None,
+    tag: str | None = None,
+    crawl_id: str | None = None,
+    limit: int | None = None,
+    sort: str | None = None,
+    csv: str | None = None,
+    with_headers: bool = False,
+    search: str | None = None,
+    query: str | None = None,
+) -> int:
+    """
+    List Snapshots as JSONL with optional filters.
+
+    Exit codes:
+        0: Success (even if no results)
+    """
+    from archivebox.misc.jsonl import write_record
+
+    if with_headers and not csv:
+        rprint("[red]--with-headers requires --csv[/red]", file=sys.stderr)
+        return 2
+
+    is_tty = sys.stdout.isatty() and not csv
+
+    queryset = filter_snapshots(
+        status=status,
+        url__icontains=url__icontains,
+        url__istartswith=url__istartswith,
+        tag=tag,
+        crawl_id=crawl_id,
+        limit=limit,
+        sort=sort,
+        search=search,
+        query=query,
+    )
 
     count = 0
     if csv:
@@ -303,12 +346,14 @@ def list_snapshots(
 def update_snapshots(
     status: str | None = None,
     tag: str | None = None,
+    remove_tag: str | None = None,
 ) -> int:
     """
     Update Snapshots from stdin JSONL.
 
     Reads Snapshot records from stdin and applies updates.
     Uses PATCH semantics - only specified fields are updated.
+    Tags are added/removed for all matched snapshots at once (in chunked bulk queries).
 
     Exit codes:
         0: Success
@@ -318,6 +363,7 @@ def update_snapshots(
 
     from archivebox.misc.jsonl import read_stdin, write_record
     from archivebox.core.models import Snapshot
+    from archivebox.core.tag_utils import add_tags_to_snapshots, remove_tags_from_snapshots
 
     is_tty = sys.stdout.isatty()
 
@@ -326,6 +372,13 @@ def update_snapshots(
         rprint("[yellow]No records provided via stdin[/yellow]", file=sys.stderr)
         return 1
 
+    if tag or remove_tag:
+        matched = Snapshot.objects.filter(id__in=[record["id"] for record in records if record.get("id")])
+        if tag:
+            add_tags_to_snapshots(matched, tag.split(","))
+        if remove_tag:
+            remove_tags_from_snapshots(matched, remove_tag.split(","))
+
     updated_count = 0
     for record in records:
         snapshot_id = record.get("id")
@@ -339,13 +392,6 @@ def update_snapshots(
             if status:
                 snapshot.status = status
                 snapshot.retry_at = timezone.now()
-            if tag:
-                # Add tag to existing tags
-                snapshot.save()  # Ensure saved before M2M
-                from archivebox.core.models import Tag
-
-                tag_obj, _ = Tag.objects.get_or_create(name=tag)
-                snapshot.tags.add(tag_obj)
 
             snapshot.save()
             updated_count += 1
@@ -413,6 +459,69 @@ def delete_snapshots(yes: bool = False, dry_run: bool = False) -> int:
     return 0
 
 
+# =============================================================================
+# VERIFY
+# =============================================================================
+
+
+def verify_snapshot_paths(repair: bool = False, batch_size: int = 500) -> int:
+    """
+    Check every Snapshot's persisted output_path against where its directory actually is on disk.
+
+    Snapshots whose output_path is unset or points at a directory that no longer exists are
+    re-resolved from disk (current layout, then legacy archive/<timestamp> symlink) and reported.
+    With --repair the re-resolved paths are written back in batches.
+
+    Exit codes:
+        0: All paths valid (or repaired)
+        1: Found missing/stale paths and --repair was not passed
+    """
+    from archivebox.config.common import get_config
+    from archivebox.core.models import Snapshot
+
+    runtime_config = get_config()
+    stats = {"checked": 0, "ok": 0, "unset": 0, "stale": 0, "no_dir": 0}
+    pending: list[Snapshot] = []
+
+    def flush() -> None:
+        if repair and pending:
+            Snapshot.objects.bulk_update(pending, ["output_path"], batch_size=batch_size)
+        pending.clear()
+
+    queryset = Snapshot.objects.select_related("crawl__created_by").order_by("pk")
+    for snapshot in queryset.iterator(chunk_size=batch_size):
+        stats["checked"] += 1
+        stored = snapshot.output_path
+        if stored and snapshot.output_dir.is_dir():
+            stats["ok"] += 1
+            continue
+
+        resolved = snapshot.get_output_path_value(snapshot.resolve_output_dir(config=runtime_config))
+        if resolved == stored:
+            # nothing better to point at, the snapshot just hasn't been archived yet (or its output was deleted)
+            stats["no_dir"] += 1
+            continue
+
+        stats["stale" if stored else "unset"] += 1
+        if stored:
+            rprint(f"[yellow]Stale output path for {snapshot.id}: {stored} -> {resolved}[/yellow]", file=sys.stderr)
+        snapshot.output_path = resolved
+        pending.append(snapshot)
+        if len(pending) >= batch_size:
+            flush()
+    flush()
+
+    needs_repair = stats["unset"] + stats["stale"]
+    summary = ", ".join(f"{count} {key}" for key, count in stats.items())
+    if needs_repair and not repair:
+        rprint(f"[yellow]{summary}[/yellow]", file=sys.stderr)
+        rprint("[yellow]Run archivebox snapshot verify --repair to update them[/yellow]", file=sys.stderr)
+        return 1
+
+    rprint(f"[green]{summary}{f' ({needs_repair} repaired)' if needs_repair else ''}[/green]", file=sys.stderr)
+    return 0
+
+
 # =============================================================================
 # CLI Commands
 # =============================================================================
@@ -479,10 +588,11 @@ def list_cmd(
 
 @main.command("update")
 @click.option("--status", "-s", help="Set status")
-@click.option("--tag", "-t", help="Add tag")
-def update_cmd(status: str | None, tag: str | None):
+@click.option("--tag", "-t", help="Add tag(s), comma-separated")
+@click.option("--remove-tag", help="Remove tag(s), comma-separated")
+def update_cmd(status: str | None, tag: str | None, remove_tag: str | None):
     """Update Snapshots from stdin JSONL."""
-    sys.exit(update_snapshots(status=status, tag=tag))
+    sys.exit(update_snapshots(status=status, tag=tag, remove_tag=remove_tag))
 
 
 @main.command("delete")
@@ -493,5 +603,13 @@ def delete_cmd(yes: bool, dry_run: bool):
     sys.exit(delete_snapshots(yes=yes, dry_run=dry_run))
 
 
+@main.command("verify")
+@click.option("--repair", is_flag=True, help="Write the re-resolved paths back to the database")
+@click.option("--batch-size", type=int, default=500, help="Snapshots to load and update per batch (default: 500)")
+def verify_cmd(repair: bool, batch_size: int):
+    """Verify the persisted output directory of every Snapshot."""
+    sys.exit(verify_snapshot_paths(repair=repair, batch_size=batch_size))
+
+
 if __name__ == "__main__":
     main()
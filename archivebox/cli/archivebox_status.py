@@ -2,6 +2,7 @@
 
 __package__ = "archivebox.cli"
 
+import sys
 from pathlib import Path
 
 import rich_click as click
@@ -18,9 +19,15 @@ MAX_STATUS_FS_DIR_SCAN = 5000
 
 
 @enforce_types
-def status(out_dir: Path = DATA_DIR) -> None:
+def status(out_dir: Path = DATA_DIR, metrics: bool = False) -> None:
     """Print out some info and statistics about the archive collection"""
 
+    if metrics:
+        from archivebox.misc.metrics import render_metrics
+
+        sys.stdout.write(render_metrics())
+        return
+
     from django.contrib.auth import get_user_model
     from django.db.models import Sum
     from django.db.models.functions import Coalesce
@@ -149,7 +156,45 @@ def status(out_dir: Path = DATA_DIR) -> None:
     print("[grey53]   ...")
 
 
+def get_status_summary(out_dir: Path = DATA_DIR) -> dict:
+    """Collect the main `archivebox status` stats as a dict using only DB queries (no filesystem scan)."""
+    from django.contrib.auth import get_user_model
+    from django.db.models import Sum
+    from django.db.models.functions import Coalesce
+    from archivebox.core.models import ArchiveResult, Snapshot
+    from archivebox.misc.metrics import get_queue_depths
+
+    User = get_user_model()
+    index_bytes, _, index_files = get_dir_size(out_dir, recursive=False, pattern="index.")
+    num_indexed = Snapshot.objects.count()
+    num_archived = Snapshot.objects.filter(status=Snapshot.StatusChoices.SEALED).count()
+    admin_users = User.objects.filter(is_superuser=True).exclude(username="system")
+    last_login = admin_users.order_by("last_login").last()
+    last_downloaded = Snapshot.objects.order_by("downloaded_at").last()
+    recent_snapshots = Snapshot.objects.filter(downloaded_at__isnull=False).order_by("-downloaded_at", "-modified_at")[:10]
+
+    queue_depths: dict[str, dict[str, int]] = {}
+    for (model, state), count in get_queue_depths().items():
+        queue_depths.setdefault(model, {})[state] = count
+
+    return {
+        "data_dir": str(out_dir),
+        "index": {"size": index_bytes, "files": index_files},
+        "snapshots": {"indexed": num_indexed, "archived": num_archived, "unarchived": max(num_indexed - num_archived, 0)},
+        "output_size": ArchiveResult.objects.aggregate(total=Coalesce(Sum("output_size"), 0))["total"] or 0,
+        "queue_depths": queue_depths,
+        "admin_users": [user.get_username() for user in admin_users],
+        "last_login": last_login and last_login.last_login and last_login.last_login.isoformat(),
+        "last_changes": last_downloaded and last_downloaded.downloaded_at and last_downloaded.downloaded_at.isoformat(),
+        "recent_snapshots": [
+            {"id": str(snapshot.id), "url": snapshot.url, "title": snapshot.title, "status": snapshot.status, "downloaded_at": snapshot.downloaded_at.isoformat()}
+            for snapshot in recent_snapshots
+        ],
+    }
+
+
 @click.command()
+@click.option("--metrics", is_flag=True, help="Dump runner metrics and queue depths in Prometheus text format instead")
 @docstring(status.__doc__)
 def main(**kwargs):
     """Print out some info and statistics about the archive collection"""
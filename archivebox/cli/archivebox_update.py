@@ -18,6 +18,7 @@ from archivebox.misc.util import enforce_types, docstring
 if TYPE_CHECKING:
     from archivebox.core.models import Snapshot
     from archivebox.crawls.models import Crawl
+    from archivebox.misc.blobstore import BlobStore
 
 
 LINK_FILTERS: dict[str, Callable[[str], Q]] = {
@@ -179,6 +180,7 @@ def update(
     setup_django()
 
     from django.core.management import call_command
+    from archivebox.misc.blobstore import get_blob_store
 
     # Run migrations first to ensure DB schema is up-to-date
     print("[*] Checking for pending migrations...")
@@ -228,7 +230,7 @@ def update(
             print_stats(stats)
         else:
             # Full mode: drain old dirs + process DB
-            stats_combined = {"phase1": {}, "phase2": {}}
+            stats_combined = {"phase1": {}, "phase2": {}, "phase3": {}}
 
             print("[*] Phase 1: Draining old archive/ directories (0.8.x → 0.9.x migration)...")
             stats_combined["phase1"] = drain_old_archive_dirs(
@@ -239,10 +241,14 @@ def update(
             print("[*] Phase 2: Processing all database snapshots (most recent first)...")
             stats_combined["phase2"] = process_all_db_snapshots(batch_size=batch_size, resume=resume)
 
-            # Phase 3: Deduplication (disabled for now)
-            # print('[*] Phase 3: Deduplicating...')
+            # Snapshot deduplication (disabled for now)
             # stats_combined['deduplicated'] = Snapshot.find_and_merge_duplicates()
 
+            blob_store = get_blob_store()
+            if blob_store is not None:
+                print("[*] Phase 3: Deduplicating snapshot output files into the blob store...")
+                stats_combined["phase3"] = dedupe_all_snapshot_outputs(blob_store, batch_size=batch_size)
+
             print_combined_stats(stats_combined)
 
         if not continuous:
@@ -333,6 +339,7 @@ def drain_old_archive_dirs(resume_from: str | None = None, batch_size: int = 100
                 snapshot.migrate_filesystem_to_current_version(source_dir=entry_path, config=runtime_config)
                 Snapshot.objects.filter(pk=snapshot.pk).update(
                     fs_version=snapshot.fs_version,
+                    output_path=snapshot.output_path,
                 )
                 migration_cleanup = getattr(snapshot, "_pending_fs_migration_cleanup", None)
                 new_dir = None
@@ -391,6 +398,7 @@ def drain_old_archive_dirs(resume_from: str | None = None, batch_size: int = 100
             if snapshot.fs_version != old_version or getattr(snapshot, "_pending_fs_migration_cleanup", None):
                 Snapshot.objects.filter(pk=snapshot.pk).update(
                     fs_version=snapshot.fs_version,
+                    output_path=snapshot.output_path,
                 )
                 migration_cleanup = getattr(snapshot, "_pending_fs_migration_cleanup", None)
                 new_dir = None
@@ -514,12 +522,17 @@ def process_all_db_snapshots(batch_size: int = 100, resume: str | None = None) -
             if not isinstance(snapshot.current_step, int):
                 update_values["current_step"] = 0
 
+            if has_directory and not snapshot.output_path:
+                update_values["output_path"] = snapshot.get_output_path_value(output_dir)
+
             if snapshot.fs_migration_needed:
                 legacy_dir = snapshot.get_storage_path_for_version("0.8.0", config=runtime_config)
                 current_dir = snapshot.get_storage_path_for_version(current_fs_version, config=runtime_config)
                 if legacy_dir.exists() or current_dir.exists():
                     snapshot.migrate_filesystem_to_current_version(config=runtime_config)
                     update_values["fs_version"] = snapshot.fs_version
+                    if snapshot.output_path:
+                        update_values["output_path"] = snapshot.output_path
                     Snapshot.objects.filter(pk=snapshot.pk).update(**update_values)
                 else:
                     update_values["fs_version"] = current_fs_version
@@ -556,6 +569,32 @@ def process_all_db_snapshots(batch_size: int = 100, resume: str | None = None) -
     return stats
 
 
+def dedupe_all_snapshot_outputs(blob_store: "BlobStore", batch_size: int = 100) -> dict[str, int]:
+    """Hardlink identical output files across all snapshot dirs into the blob store, then prune unreferenced blobs."""
+    from archivebox.core.models import Snapshot
+    from archivebox.misc.blobstore import DedupeStats
+
+    stats = {"processed": 0, "files": 0, "deduped": 0, "bytes_saved": 0, "bytes_pruned": 0}
+    total = Snapshot.objects.count()
+    totals = DedupeStats()
+    for snapshot in Snapshot.objects.order_by("-bookmarked_at").iterator(chunk_size=batch_size):
+        stats["processed"] += 1
+        try:
+            totals += blob_store.dedupe_snapshot_dir(Path(snapshot.output_dir))
+        except OSError as e:
+            print(f"    [!] Skipping snapshot {snapshot.id}: {e}")
+            continue
+        if stats["processed"] % batch_size == 0:
+            print(f"    [{stats['processed']}/{total}] Deduplicated...")
+
+    stats["files"] = totals.files
+    stats["deduped"] = totals.deduped
+    stats["bytes_saved"] = totals.bytes_saved
+    # blobs whose last snapshot was deleted outside of `archivebox remove` (e.g. from the admin UI)
+    stats["bytes_pruned"] = blob_store.prune()
+    return stats
+
+
 def process_filtered_snapshots(
     filter_patterns: Iterable[str],
     filter_type: str,
@@ -631,6 +670,7 @@ def print_stats(stats: dict):
 def print_combined_stats(stats_combined: dict):
     """Print statistics for full mode."""
     from rich import print
+    from archivebox.misc.logging_util import printable_filesize
 
     s1 = stats_combined["phase1"]
     s2 = stats_combined["phase2"]
@@ -650,6 +690,14 @@ Phase 2 (Process DB):
   Sealed:      {s2.get("sealed", 0)}
   Crawls:      {s2.get("crawls_sealed", 0)} sealed
 """)
+    s3 = stats_combined.get("phase3")
+    if s3:
+        print(f"""Phase 3 (Dedupe Outputs):
+  Files:       {s3.get("files", 0)}
+  Deduped:     {s3.get("deduped", 0)}
+  Saved:       {printable_filesize(s3.get("bytes_saved", 0))}
+  Pruned:      {printable_filesize(s3.get("bytes_pruned", 0))}
+""")
 
 
 def print_index_stats(stats: dict[str, Any]) -> None:
@@ -2,13 +2,12 @@ __package__ = "archivebox.config"
 
 import os
 
-from benedict import benedict
-
 from archivebox.config.constants import CONSTANTS
 from archivebox.config.configset import CaseConfigParser
+from archivebox.config.paths import benedict
 
 
-def write_config_file(config: dict[str, str]) -> benedict:
+def write_config_file(config: dict[str, str]) -> dict[str, str]:
     """load the ini-formatted config file from DATA_DIR/Archivebox.conf"""
 
     from archivebox.config.common import get_all_configs
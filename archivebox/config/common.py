@@ -99,6 +99,12 @@ class StorageConfig(BaseConfigSet):
     RESTRICT_FILE_NAMES: str = Field(default="windows")
     ENFORCE_ATOMIC_WRITES: bool = Field(default=True)
 
+    # opt-in: hardlink identical snapshot output files into a content-addressed store in BLOBS_DIR,
+    # BLOBS_DIR must be on the same filesystem as ARCHIVE_DIR (files that can't be hardlinked are left alone)
+    DEDUPE_OUTPUTS: bool = Field(default=False)
+    DEDUPE_MIN_SIZE: int = Field(default=1024)  # bytes, smaller files aren't worth a hash + link
+    BLOBS_DIR: Path = Field(default=CONSTANTS.BLOBS_DIR)
+
     # not supposed to be user settable:
     DIR_OUTPUT_PERMISSIONS: str = Field(default="755")  # computed from OUTPUT_PERMISSIONS
 
@@ -108,6 +114,18 @@ class GeneralConfig(BaseConfigSet):
 
     TAG_SEPARATOR_PATTERN: str = Field(default=r"[,]")
 
+    # what to do with scheduled crawl runs that were missed while no runner was up:
+    # once = run them once as soon as possible, all = run every missed slot, skip = drop them and wait for the next slot
+    SCHEDULE_CATCHUP_MODES: ClassVar[tuple[str, ...]] = ("once", "all", "skip")
+    SCHEDULE_CATCHUP: str = Field(default="once")
+
+    @field_validator("SCHEDULE_CATCHUP", mode="after")
+    def validate_schedule_catchup(cls, v: str) -> str:
+        mode = (v or "").strip().lower()
+        if mode not in cls.SCHEDULE_CATCHUP_MODES:
+            raise ValueError(f"SCHEDULE_CATCHUP must be one of: {', '.join(cls.SCHEDULE_CATCHUP_MODES)}")
+        return mode
+
 
 class ServerConfig(BaseConfigSet):
     toml_section_header: str = "SERVER_CONFIG"
@@ -129,6 +147,7 @@ class ServerConfig(BaseConfigSet):
     SERVER_SECURITY_MODE: str = Field(default="safe-subdomains-fullreplay")
 
     SNAPSHOTS_PER_PAGE: int = Field(default=40)
+    API_CACHE_TIMEOUT: int = Field(default=0)  # seconds to cache rendered REST API list responses per query+user (0 = disabled)
     PREVIEW_ORIGINALS: bool = Field(default=True)
     FOOTER_INFO: str = Field(
         default="Content is hosted for personal archiving purposes only.  Contact server owner for any takedown requests.",
@@ -147,6 +166,13 @@ class ServerConfig(BaseConfigSet):
     REVERSE_PROXY_WHITELIST: str = Field(default="")
     LOGOUT_REDIRECT_URL: str = Field(default="/")
 
+    # REST API outbound webhooks are queued in DATA_DIR/queue.sqlite3 and delivered by the worker_webhooks
+    # worker under `archivebox server`, one-shot CLI commands deliver whatever is queued before they exit.
+    # Every webhook request POSTs a JSON array of up to WEBHOOK_BATCH_SIZE object payloads.
+    WEBHOOK_BATCH_SIZE: int = Field(default=50)
+    WEBHOOK_MAX_ATTEMPTS: int = Field(default=8)
+    WEBHOOK_RETRY_BACKOFF: int = Field(default=5)  # seconds, doubled after each failed attempt
+
     @field_validator("SERVER_SECURITY_MODE", mode="after")
     def validate_server_security_mode(cls, v: str) -> str:
         mode = (v or "").strip().lower()
@@ -16,12 +16,12 @@ import re
 import sys
 
 from pathlib import Path
-
-from benedict import benedict
+from typing import Any
 
 from archivebox.misc.logging import DEFAULT_CLI_COLORS
 
 from .paths import (
+    benedict,
     PACKAGE_DIR,
     DATA_DIR,
     ARCHIVE_DIR,
@@ -87,20 +87,25 @@ class ConstantsDict:
     LOGS_DIR_NAME: str = "logs"
     CUSTOM_PLUGINS_DIR_NAME: str = "custom_plugins"
     CUSTOM_TEMPLATES_DIR_NAME: str = "custom_templates"
+    BLOBS_DIR_NAME: str = "blobs"
+    TRASH_DIR_NAME: str = ".trash"
     ARCHIVE_DIR: Path = ARCHIVE_DIR
     USERS_DIR: Path = USERS_DIR
     SOURCES_DIR: Path = DATA_DIR / SOURCES_DIR_NAME
     PERSONAS_DIR: Path = DATA_DIR / PERSONAS_DIR_NAME
     LOGS_DIR: Path = DATA_DIR / LOGS_DIR_NAME
     CACHE_DIR: Path = DATA_DIR / CACHE_DIR_NAME
+    BLOBS_DIR: Path = DATA_DIR / BLOBS_DIR_NAME
     CUSTOM_TEMPLATES_DIR: Path = DATA_DIR / CUSTOM_TEMPLATES_DIR_NAME
     USER_PLUGINS_DIR: Path = DATA_DIR / CUSTOM_PLUGINS_DIR_NAME
 
     # Data dir files
     CONFIG_FILENAME: str = "ArchiveBox.conf"
     SQL_INDEX_FILENAME: str = "index.sqlite3"
+    QUEUE_DATABASE_FILENAME: str = "queue.sqlite3"
     CONFIG_FILE: Path = DATA_DIR / CONFIG_FILENAME
     DATABASE_FILE: Path = DATA_DIR / SQL_INDEX_FILENAME
+    QUEUE_DATABASE_FILE: Path = DATA_DIR / QUEUE_DATABASE_FILENAME
 
     JSON_INDEX_FILENAME: str = "index.json"
     JSONL_INDEX_FILENAME: str = "index.jsonl"
@@ -121,6 +126,7 @@ class ConstantsDict:
             USERS_DIR_NAME,
             SNAPSHOTS_DIR_NAME,
             CRAWLS_DIR_NAME,
+            TRASH_DIR_NAME,
             "invalid",
             ".DS_Store",
         ),
@@ -129,7 +135,7 @@ class ConstantsDict:
     # Config constants
     TIMEZONE: str = "UTC"
     DEFAULT_CLI_COLORS: dict[str, str] = DEFAULT_CLI_COLORS
-    DISABLED_CLI_COLORS: dict[str, str] = benedict({k: "" for k in DEFAULT_CLI_COLORS})
+    DISABLED_CLI_COLORS: dict[str, str] = {k: "" for k in DEFAULT_CLI_COLORS}
 
     # Hard safety limits (seconds)
     MAX_HOOK_RUNTIME_SECONDS: int = 60 * 60 * 12  # 12 hours
@@ -240,6 +246,7 @@ class ConstantsDict:
             LIB_DIR_NAME,
             TMP_DIR_NAME,
             PERSONAS_DIR_NAME,
+            BLOBS_DIR_NAME,
             CUSTOM_TEMPLATES_DIR_NAME,
             CUSTOM_PLUGINS_DIR_NAME,
             "invalid",
@@ -258,9 +265,9 @@ class ConstantsDict:
             f"{SQL_INDEX_FILENAME}-wal",
             f"{SQL_INDEX_FILENAME}-shm",
             "search.sqlite3",
-            "queue.sqlite3",
-            "queue.sqlite3-wal",
-            "queue.sqlite3-shm",
+            QUEUE_DATABASE_FILENAME,
+            f"{QUEUE_DATABASE_FILENAME}-wal",
+            f"{QUEUE_DATABASE_FILENAME}-shm",
             JSON_INDEX_FILENAME,
             JSONL_INDEX_FILENAME,
             HTML_INDEX_FILENAME,
@@ -286,14 +293,18 @@ class ConstantsDict:
         # so it behaves like a dict[key] == dict.key or object attr
         return getattr(cls, key)
 
+    @classmethod
+    def as_dict(cls) -> dict[str, Any]:
+        # only include uppercase keys that don't start with an underscore
+        return {key: value for key, value in cls.__dict__.items() if key.isupper() and not key.startswith("_")}
+
     @classmethod
     def __benedict__(cls):
-        # when casting to benedict, only include uppercase keys that don't start with an underscore
-        return benedict({key: value for key, value in cls.__dict__.items() if key.isupper() and not key.startswith("_")})
+        return benedict(cls.as_dict())
 
 
 CONSTANTS = ConstantsDict
-CONSTANTS_CONFIG = CONSTANTS.__benedict__()
+CONSTANTS_CONFIG = CONSTANTS.as_dict()
 
 # add all key: values to globals() for easier importing, e.g.:
 # from archivebox.config.constants import IS_ROOT, PERSONAS_DIR, ...
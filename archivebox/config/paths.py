@@ -8,9 +8,7 @@ import platform
 from pathlib import Path
 from functools import cache
 from datetime import datetime
-from typing import TYPE_CHECKING
-
-from benedict import benedict
+from typing import TYPE_CHECKING, Any
 
 from .permissions import SudoPermission, IS_ROOT, ARCHIVEBOX_USER
 
@@ -23,6 +21,16 @@ PACKAGE_DIR: Path = Path(__file__).resolve().parent.parent  # archivebox source
 DATA_DIR: Path = Path(os.environ.get("DATA_DIR", os.getcwd())).resolve()  # archivebox user data dir
 
 
+def benedict(*args: Any, **kwargs: Any):
+    """python-benedict, imported on first use: it pulls in openpyxl/bs4/xlrd/MailChecker and costs >1s of CLI startup"""
+    from benedict import benedict as _benedict
+
+    # fix benedict objects to pretty-print/repr more nicely with rich
+    # https://stackoverflow.com/a/79048811/2156113
+    _benedict.__rich_repr__ = lambda self: (dict(self),)  # type: ignore
+    return _benedict(*args, **kwargs)
+
+
 def _env_path(key: str, default: Path) -> Path:
     path = Path(os.environ.get(key) or default).expanduser()
     if not path.is_absolute():
@@ -195,7 +203,7 @@ def get_or_create_working_tmp_dir(autofix=True, quiet=True, config: "ArchiveBoxC
             create_and_chown_dir(candidate)
         except Exception:
             pass
-        if check_tmp_dir(candidate, throw=False, quiet=True, must_exist=True):
+        if check_tmp_dir(candidate, throw=False, quiet=True, must_exist=True, config=config):
             if autofix and config.TMP_DIR != candidate:
                 os.environ["TMP_DIR"] = str(candidate)
             return candidate
@@ -244,7 +252,7 @@ def get_or_create_working_lib_dir(autofix=True, quiet=False, config: "ArchiveBox
             create_and_chown_dir(candidate)
         except Exception:
             pass
-        if check_lib_dir(candidate, throw=False, quiet=True, must_exist=True):
+        if check_lib_dir(candidate, throw=False, quiet=True, must_exist=True, config=config):
             if autofix and config.LIB_DIR != candidate:
                 os.environ["LIB_DIR"] = str(candidate)
             return candidate
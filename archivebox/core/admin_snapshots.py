@@ -26,6 +26,7 @@ from archivebox.base_models.admin import BaseModelAdmin, ConfigEditorMixin
 from archivebox.workers.tasks import bg_archive_snapshots, bg_add
 
 from archivebox.core.models import Tag, Snapshot, ArchiveResult
+from archivebox.core.tag_utils import add_tags_to_snapshots, find_tags, get_or_create_tags, remove_tags_from_snapshots, replace_snapshot_tags
 from archivebox.core.admin_archiveresults import render_archiveresults_list
 from archivebox.core.widgets import TagEditorWidget, InlineTagEditorWidget
 
@@ -55,17 +56,8 @@ class SnapshotActionForm(ActionForm):
         if not tags_str:
             return []
 
-        tag_names = [name.strip() for name in tags_str.split(",") if name.strip()]
-        tags = []
-        for name in tag_names:
-            tag, _ = Tag.objects.get_or_create(
-                name__iexact=name,
-                defaults={"name": name},
-            )
-            # Use the existing tag if found by case-insensitive match
-            tag = Tag.objects.filter(name__iexact=name).first() or tag
-            tags.append(tag)
-        return tags
+        # existing tags are matched case-insensitively, missing ones are created in one bulk insert
+        return get_or_create_tags(tags_str.split(","))
 
     # TODO: allow selecting actions for specific extractor plugins? is this useful?
     # plugin = forms.ChoiceField(
@@ -122,19 +114,7 @@ class SnapshotAdminForm(forms.ModelForm):
 
             # Parse and save tags from tags_editor
             tags_str = self.cleaned_data.get("tags_editor", "")
-            if tags_str:
-                tag_names = [name.strip() for name in tags_str.split(",") if name.strip()]
-                tags = []
-                for name in tag_names:
-                    tag, _ = Tag.objects.get_or_create(
-                        name__iexact=name,
-                        defaults={"name": name},
-                    )
-                    tag = Tag.objects.filter(name__iexact=name).first() or tag
-                    tags.append(tag)
-                instance.tags.set(tags)
-            else:
-                instance.tags.clear()
+            replace_snapshot_tags([instance], tags_str.split(","))
 
         return instance
 
@@ -1132,24 +1112,14 @@ class SnapshotAdmin(SearchResultsAdminMixin, ConfigEditorMixin, BaseModelAdmin):
         description="+",
     )
     def add_tags(self, request, queryset):
-        from archivebox.core.models import SnapshotTag
-
         # Get tags from the form - now comma-separated string
         tags_str = request.POST.get("tags", "")
         if not tags_str:
             messages.warning(request, "No tags specified.")
             return
 
-        # Parse comma-separated tag names and get/create Tag objects
-        tag_names = [name.strip() for name in tags_str.split(",") if name.strip()]
-        tags = []
-        for name in tag_names:
-            tag, _ = Tag.objects.get_or_create(
-                name__iexact=name,
-                defaults={"name": name},
-            )
-            tag = Tag.objects.filter(name__iexact=name).first() or tag
-            tags.append(tag)
+        # Resolve/create all the tags at once (1 lookup + 1 bulk insert for any missing ones)
+        tags = get_or_create_tags(tags_str.split(","), created_by=request.user)
 
         # Get snapshot IDs efficiently (works with select_across for all pages)
         snapshot_ids = list(queryset.values_list("id", flat=True))
@@ -1157,37 +1127,26 @@ class SnapshotAdmin(SearchResultsAdminMixin, ConfigEditorMixin, BaseModelAdmin):
 
         print("[+] Adding tags", [t.name for t in tags], "to", num_snapshots, "Snapshots")
 
-        # Bulk create M2M relationships (1 query per tag, not per snapshot)
-        for tag in tags:
-            SnapshotTag.objects.bulk_create(
-                [SnapshotTag(snapshot_id=sid, tag=tag) for sid in snapshot_ids],
-                ignore_conflicts=True,  # Skip if relationship already exists
-            )
+        # Bulk create M2M relationships in chunked transactions (not per snapshot)
+        added = add_tags_to_snapshots(snapshot_ids, tags=tags)
 
         messages.success(
             request,
-            f"Added {len(tags)} tag(s) to {num_snapshots} Snapshot(s).",
+            f"Added {len(tags)} tag(s) to {num_snapshots} Snapshot(s) ({added} associations created).",
         )
 
     @admin.action(
         description="–",
     )
     def remove_tags(self, request, queryset):
-        from archivebox.core.models import SnapshotTag
-
         # Get tags from the form - now comma-separated string
         tags_str = request.POST.get("tags", "")
         if not tags_str:
             messages.warning(request, "No tags specified.")
             return
 
-        # Parse comma-separated tag names and find matching Tag objects (case-insensitive)
-        tag_names = [name.strip() for name in tags_str.split(",") if name.strip()]
-        tags = []
-        for name in tag_names:
-            tag = Tag.objects.filter(name__iexact=name).first()
-            if tag:
-                tags.append(tag)
+        # Find matching Tag objects (case-insensitive) in one query
+        tags = find_tags(tags_str.split(","))
 
         if not tags:
             messages.warning(request, "No matching tags found.")
@@ -1196,15 +1155,11 @@ class SnapshotAdmin(SearchResultsAdminMixin, ConfigEditorMixin, BaseModelAdmin):
         # Get snapshot IDs efficiently (works with select_across for all pages)
         snapshot_ids = list(queryset.values_list("id", flat=True))
         num_snapshots = len(snapshot_ids)
-        tag_ids = [t.pk for t in tags]
 
         print("[-] Removing tags", [t.name for t in tags], "from", num_snapshots, "Snapshots")
 
-        # Bulk delete M2M relationships (1 query total, not per snapshot)
-        deleted_count, _ = SnapshotTag.objects.filter(
-            snapshot_id__in=snapshot_ids,
-            tag_id__in=tag_ids,
-        ).delete()
+        # Bulk delete M2M relationships (1 query per chunk of snapshots, not per snapshot)
+        deleted_count = remove_tags_from_snapshots(snapshot_ids, tags=tags)
 
         messages.success(
             request,
@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-19 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0034_remove_tag_slug"),
+    ]
+
+    operations = [
+        # left empty for existing rows: output_dir falls back to resolving the path from disk until
+        # the next save()/archivebox update, or `archivebox snapshot verify --repair` fills them all in
+        migrations.AddField(
+            model_name="snapshot",
+            name="output_path",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default="",
+                editable=False,
+                help_text="Resolved output directory (relative to DATA_DIR when inside it), kept up to date on create/migrate/merge. Empty = resolve from fs_version on access.",
+                max_length=1024,
+            ),
+        ),
+    ]
@@ -113,11 +113,16 @@ class Tag(ModelWithUUID):
         if not name:
             return None
 
-        tag, _ = Tag.objects.get_or_create(name=name)
+        from archivebox.core.tag_utils import add_tags_to_snapshots, get_or_create_tags
+
+        tags = get_or_create_tags([name])
+        if not tags:
+            return None
+        tag = tags[0]
 
         # Auto-attach to snapshot if in overrides
-        if overrides and "snapshot" in overrides and tag:
-            overrides["snapshot"].tags.add(tag)
+        if overrides and "snapshot" in overrides:
+            add_tags_to_snapshots([overrides["snapshot"]], tags=[tag])
 
         return tag
 
@@ -334,7 +339,15 @@ class Snapshot(ModelWithOutputDir, ModelWithConfig, ModelWithNotes, ModelWithHea
     )
     config = models.JSONField(default=dict, null=False, blank=False, editable=True)
     notes = models.TextField(blank=True, null=False, default="")
-    # output_dir is computed via @cached_property from fs_version and get_storage_path_for_version()
+    output_path = models.CharField(
+        max_length=1024,
+        default="",
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text="Resolved output directory (relative to DATA_DIR when inside it), kept up to date on create/migrate/merge. Empty = resolve from fs_version on access.",
+    )
+    # output_dir returns output_path if set, otherwise it's resolved from fs_version and get_storage_path_for_version()
 
     tags = models.ManyToManyField(Tag, blank=True, through=SnapshotTag, related_name="snapshot_set", through_fields=("snapshot", "tag"))
 
@@ -408,6 +421,12 @@ class Snapshot(ModelWithOutputDir, ModelWithConfig, ModelWithNotes, ModelWithHea
             if legacy_dir.exists() and not legacy_dir.is_symlink() and current_dir.exists() and legacy_dir != current_dir:
                 self.migrate_filesystem_to_current_version(source_dir=legacy_dir)
 
+        if not self.output_path:
+            self.output_path = self.get_output_path_value(self.resolve_output_dir())
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "output_path" not in update_fields:
+            kwargs["update_fields"] = (*update_fields, "output_path")
+
         super().save(*args, **kwargs)
 
         migration_cleanup = getattr(self, "_pending_fs_migration_cleanup", None)
@@ -502,6 +521,7 @@ class Snapshot(ModelWithOutputDir, ModelWithConfig, ModelWithNotes, ModelWithHea
             cleanup = self._fs_migrate_legacy_to_0_9_0(source_dir=source_dir, target_dir=current_dir)
             if cleanup:
                 self._pending_fs_migration_cleanup = cleanup
+                self.output_path = self.get_output_path_value(current_dir)
             return
 
         while current != target:
@@ -522,6 +542,9 @@ class Snapshot(ModelWithOutputDir, ModelWithConfig, ModelWithNotes, ModelWithHea
         self.fs_version = target
         if cleanup:
             self._pending_fs_migration_cleanup = cleanup
+        current_dir = self.get_storage_path_for_version(target, config=runtime_config)
+        if current_dir.exists():
+            self.output_path = self.get_output_path_value(current_dir)
 
     def _fs_migrate_from_0_7_0_to_0_9_0(self, source_dir: Path | None = None, config: "ArchiveBoxBaseConfig | None" = None):
         return self._fs_migrate_legacy_to_0_9_0(source_dir=source_dir, config=config)
@@ -1068,8 +1091,6 @@ class Snapshot(ModelWithOutputDir, ModelWithConfig, ModelWithNotes, ModelWithHea
 
     def _merge_tags_from_index(self, index_data: dict):
         """Merge tags - union of both sources."""
-        from django.db import transaction
-
         index_tags = set(index_data.get("tags", "").split(",")) if index_data.get("tags") else set()
         index_tags = {t.strip() for t in index_tags if t.strip()}
 
@@ -1077,10 +1098,9 @@ class Snapshot(ModelWithOutputDir, ModelWithConfig, ModelWithNotes, ModelWithHea
 
         new_tags = index_tags - db_tags
         if new_tags:
-            with transaction.atomic():
-                for tag_name in new_tags:
-                    tag, _ = Tag.objects.get_or_create(name=tag_name)
-                    self.tags.add(tag)
+            from archivebox.core.tag_utils import add_tags_to_snapshots
+
+            add_tags_to_snapshots([self], sorted(new_tags))
 
     def _merge_archive_results_from_index(self, index_data: dict, update_existing: bool = True):
         """Merge ArchiveResults - keep both (by plugin+start_ts)."""
@@ -1517,8 +1537,9 @@ class Snapshot(ModelWithOutputDir, ModelWithConfig, ModelWithNotes, ModelWithHea
                     pass
 
             # Merge tags
-            for tag in dup.tags.all():
-                keeper.tags.add(tag)
+            from archivebox.core.tag_utils import add_tags_to_snapshots
+
+            add_tags_to_snapshots([keeper], tags=list(dup.tags.all()))
 
             # Move ArchiveResults
             ArchiveResult.objects.filter(snapshot=dup).update(snapshot=keeper)
@@ -1526,6 +1547,10 @@ class Snapshot(ModelWithOutputDir, ModelWithConfig, ModelWithNotes, ModelWithHea
             # Delete
             dup.delete()
 
+        # files may have been copied into a keeper dir that didn't exist before
+        keeper.output_path = keeper.get_output_path_value(keeper_dir)
+        cls.objects.filter(pk=keeper.pk).update(output_path=keeper.output_path)
+
     # =========================================================================
     # Output Directory Properties
     # =========================================================================
@@ -1715,10 +1740,26 @@ class Snapshot(ModelWithOutputDir, ModelWithConfig, ModelWithNotes, ModelWithHea
 
     @property
     def output_dir(self) -> Path:
-        """The filesystem path to the snapshot's output directory."""
+        """The filesystem path to the snapshot's output directory (from the persisted output_path when available)."""
+        if self.output_path:
+            output_path = Path(self.output_path)
+            return output_path if output_path.is_absolute() else CONSTANTS.DATA_DIR / output_path
+        return self.resolve_output_dir()
+
+    @staticmethod
+    def get_output_path_value(output_dir: Path) -> str:
+        """Value to persist in output_path: relative to DATA_DIR if inside it (so the collection can be moved), else absolute."""
+        output_dir = Path(output_dir)
+        try:
+            return str(output_dir.relative_to(CONSTANTS.DATA_DIR))
+        except ValueError:
+            return str(output_dir)
+
+    def resolve_output_dir(self, config: "ArchiveBoxBaseConfig | None" = None) -> Path:
+        """Find the snapshot's output directory on disk by probing the current layout and the legacy archive/<timestamp> symlink."""
         import os
 
-        runtime_config = getattr(self, "_runtime_config", None) or get_config()
+        runtime_config = config or getattr(self, "_runtime_config", None) or get_config()
         current_path = self.get_storage_path_for_version(self.fs_version, config=runtime_config)
 
         if current_path.exists():
@@ -1916,9 +1957,10 @@ class Snapshot(ModelWithOutputDir, ModelWithConfig, ModelWithNotes, ModelWithHea
             return 0
 
     def save_tags(self, tags: Iterable[str] = ()) -> None:
-        tags_id = [Tag.objects.get_or_create(name=tag)[0].pk for tag in tags if tag.strip()]
-        self.tags.clear()
-        self.tags.add(*tags_id)
+        from archivebox.core.tag_utils import replace_snapshot_tags
+
+        replace_snapshot_tags([self], tags)
+        getattr(self, "_prefetched_objects_cache", {}).pop("tags", None)
 
     def pending_archiveresults(self) -> QuerySet["ArchiveResult"]:
         return self.archiveresult_set.exclude(status__in=ArchiveResult.FINAL_OR_ACTIVE_STATES)
@@ -2146,9 +2188,9 @@ class Snapshot(ModelWithOutputDir, ModelWithConfig, ModelWithNotes, ModelWithHea
 
         # Update tags
         if tag_list:
-            existing_tags = set(snapshot.tags.values_list("name", flat=True))
-            new_tags = set(tag_list) | existing_tags
-            snapshot.save_tags(new_tags)
+            from archivebox.core.tag_utils import add_tags_to_snapshots
+
+            add_tags_to_snapshots([snapshot], tag_list)
 
         # Queue for extraction and update additional fields
         update_fields = []
@@ -4,7 +4,6 @@ import os
 import sys
 import inspect
 import importlib
-from typing import Any, cast
 
 from pathlib import Path
 
@@ -12,6 +11,7 @@ from django.conf.locale.en import formats as en_formats  # type: ignore
 from django.utils.crypto import get_random_string
 
 import archivebox
+import archivebox.misc.monkey_patches  # noqa # install monkey patches for third-party libraries before any apps load
 
 from archivebox.config.constants import CONSTANTS
 from archivebox.config.common import get_config
@@ -23,6 +23,7 @@ IS_MIGRATING = "makemigrations" in sys.argv[:3] or "migrate" in sys.argv[:3]
 IS_TESTING = "test" in sys.argv[:3] or "PYTEST_CURRENT_TEST" in os.environ
 IS_SHELL = "shell" in sys.argv[:3] or "shell_plus" in sys.argv[:3]
 IS_GETTING_VERSION_OR_HELP = "version" in sys.argv or "help" in sys.argv or "--version" in sys.argv or "--help" in sys.argv
+IS_SERVING = "server" in sys.argv[:3] or "runserver" in sys.argv[:4] or "daphne" in sys.modules
 CONFIG = get_config()
 PACKAGE_DIR = CONSTANTS.PACKAGE_DIR
 
@@ -51,7 +52,8 @@ DEBUG = CONFIG.DEBUG or ("--debug" in sys.argv)
 
 
 INSTALLED_APPS = [
-    "daphne",
+    # daphne (+ twisted) takes ~1s to import, only load it when serving (it overrides runserver to serve ASGI)
+    *(["daphne"] if IS_SERVING else []),
     # Django default apps
     "django.contrib.auth",
     "django.contrib.contenttypes",
@@ -450,10 +452,9 @@ SIGNAL_WEBHOOKS: dict[str, object] = {
     },
 }
 
-# Avoid background threads touching sqlite connections (especially during tests/migrations).
-default_database = cast(dict[str, Any], DATABASES["default"])
-if str(default_database["ENGINE"]).endswith("sqlite3"):
-    SIGNAL_WEBHOOKS["TASK_HANDLER"] = "signal_webhooks.handlers.sync_task_handler"
+# Model saves only append to the on-disk DATA_DIR/queue.sqlite3 webhook queue, they never block on HTTP
+# (and no background threads touch the sqlite connections), delivery happens in the worker_webhooks worker.
+SIGNAL_WEBHOOKS["TASK_HANDLER"] = "archivebox.api.webhooks.queue_task_handler"
 
 ################################################################################
 ### Admin Data View Settings
@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import json
 from collections import defaultdict
+from collections.abc import Iterable, Iterator
 from typing import Any
 from urllib.parse import unquote
 
 from django.contrib.auth.models import User
-from django.db.models import Count, F, QuerySet
+from django.db import transaction
+from django.db.models import Count, F, Q, QuerySet
 from django.db.models.functions import Lower
 from django.http import HttpRequest
 from django.urls import reverse
@@ -16,6 +18,7 @@ from archivebox.core.models import Snapshot, SnapshotTag, Tag
 
 
 TAG_SNAPSHOT_PREVIEW_LIMIT = 10
+TAG_BULK_CHUNK_SIZE = 500  # snapshots per transaction (and names per lookup query) in the bulk tagging functions
 TAG_SORT_CHOICES = (
     ("name_asc", "Name A-Z"),
     ("name_desc", "Name Z-A"),
@@ -162,6 +165,131 @@ def delete_tag(tag: Tag) -> tuple[int, dict[str, int]]:
     return tag.delete()
 
 
+# Bulk tagging: every tag entry point (CLI, REST API, admin, importers) goes through these so that tagging
+# N snapshots costs O(N / TAG_BULK_CHUNK_SIZE) queries instead of a get_or_create + M2M add per snapshot.
+# Snapshots can be passed as a QuerySet, Snapshot instances or ids. Note these write the SnapshotTag rows
+# directly, so (like the admin bulk actions always did) no per-row m2m_changed signals are sent.
+
+
+def _chunked(items: list, size: int = TAG_BULK_CHUNK_SIZE) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _get_snapshot_ids(snapshots: QuerySet[Snapshot] | Iterable[Snapshot | Any]) -> list[Any]:
+    if isinstance(snapshots, QuerySet):
+        # materialized up front, the queryset may filter on the same tags being added/removed
+        return list(snapshots.order_by().values_list("pk", flat=True).distinct())
+    to_python = Snapshot._meta.pk.to_python
+    return list(dict.fromkeys(to_python(getattr(snapshot, "pk", snapshot)) for snapshot in snapshots))
+
+
+def _find_tags(names: Iterable[str]) -> dict[str, Tag]:
+    """Existing tags matching the given names case-insensitively, keyed by lowercased name."""
+    names = list(names)
+    found: dict[str, Tag] = {}
+    for chunk in _chunked(names):
+        # LOWER() is ASCII-only on SQLite, so also match the exact names for non-ASCII tags
+        lowered = [name.lower() for name in chunk]
+        matches = Tag.objects.annotate(name_lower=Lower("name")).filter(Q(name_lower__in=lowered) | Q(name__in=chunk)).order_by("pk")
+        for tag in matches:
+            found.setdefault(tag.name.lower(), tag)
+    return found
+
+
+def find_tags(names: Iterable[str]) -> list[Tag]:
+    """Existing tags matching any of the given names (case-insensitively), without creating missing ones."""
+    return list(_find_tags(normalized for name in names if (normalized := normalize_tag_name(name))).values())
+
+
+def get_or_create_tags(names: Iterable[str], created_by: User | None = None) -> list[Tag]:
+    """Resolve tag names (case-insensitively, deduped, in order) with one lookup and one bulk insert for the missing ones."""
+    wanted: dict[str, str] = {}
+    for name in names:
+        normalized = normalize_tag_name(name)
+        if normalized:
+            wanted.setdefault(normalized.lower(), normalized)
+    if not wanted:
+        return []
+
+    found = _find_tags(wanted.values())
+    missing = [Tag(name=name, **({"created_by": created_by} if created_by else {})) for key, name in wanted.items() if key not in found]
+    if missing:
+        # another process may have created some of them since the lookup, so skip conflicts and re-read
+        Tag.objects.bulk_create(missing, ignore_conflicts=True, batch_size=TAG_BULK_CHUNK_SIZE)
+        found.update(_find_tags(tag.name for tag in missing))
+    return [found[key] for key in wanted if key in found]
+
+
+def _add_snapshot_tag_rows(snapshot_ids: list[Any], tag_ids: list[int]) -> int:
+    existing = set(SnapshotTag.objects.filter(snapshot_id__in=snapshot_ids, tag_id__in=tag_ids).values_list("snapshot_id", "tag_id"))
+    new_rows = [
+        SnapshotTag(snapshot_id=snapshot_id, tag_id=tag_id)
+        for snapshot_id in snapshot_ids
+        for tag_id in tag_ids
+        if (snapshot_id, tag_id) not in existing
+    ]
+    SnapshotTag.objects.bulk_create(new_rows, ignore_conflicts=True, batch_size=TAG_BULK_CHUNK_SIZE)
+    return len(new_rows)
+
+
+def add_tags_to_snapshots(
+    snapshots: QuerySet[Snapshot] | Iterable[Snapshot | Any],
+    tag_names: Iterable[str] = (),
+    *,
+    tags: Iterable[Tag] | None = None,
+    created_by: User | None = None,
+) -> int:
+    """Add tags (by name, created if missing, or as Tag objects) to many snapshots. Returns the number of new associations."""
+    tag_ids = [tag.pk for tag in (tags if tags is not None else get_or_create_tags(tag_names, created_by=created_by))]
+    snapshot_ids = _get_snapshot_ids(snapshots)
+    if not tag_ids or not snapshot_ids:
+        return 0
+
+    added = 0
+    for chunk in _chunked(snapshot_ids):
+        with transaction.atomic():
+            added += _add_snapshot_tag_rows(chunk, tag_ids)
+    return added
+
+
+def remove_tags_from_snapshots(
+    snapshots: QuerySet[Snapshot] | Iterable[Snapshot | Any],
+    tag_names: Iterable[str] = (),
+    *,
+    tags: Iterable[Tag] | None = None,
+) -> int:
+    """Remove tags (by name, case-insensitive, or as Tag objects) from many snapshots. Returns the number of deleted associations."""
+    tag_ids = [tag.pk for tag in (tags if tags is not None else find_tags(tag_names))]
+    if not tag_ids:
+        return 0
+
+    removed = 0
+    for chunk in _chunked(_get_snapshot_ids(snapshots)):
+        deleted, _ = SnapshotTag.objects.filter(snapshot_id__in=chunk, tag_id__in=tag_ids).delete()
+        removed += deleted
+    return removed
+
+
+def replace_snapshot_tags(
+    snapshots: QuerySet[Snapshot] | Iterable[Snapshot | Any],
+    tag_names: Iterable[str] = (),
+    *,
+    created_by: User | None = None,
+) -> tuple[int, int]:
+    """Set the exact tags of many snapshots (an empty list clears them). Returns (associations added, associations removed)."""
+    tag_ids = [tag.pk for tag in get_or_create_tags(tag_names, created_by=created_by)]
+
+    added = removed = 0
+    for chunk in _chunked(_get_snapshot_ids(snapshots)):
+        with transaction.atomic():
+            deleted, _ = SnapshotTag.objects.filter(snapshot_id__in=chunk).exclude(tag_id__in=tag_ids).delete()
+            removed += deleted
+            if tag_ids:
+                added += _add_snapshot_tag_rows(chunk, tag_ids)
+    return added, removed
+
+
 def export_tag_urls(tag: Tag) -> str:
     urls = tag.snapshot_set.order_by("-downloaded_at", "-created_at", "-pk").values_list("url", flat=True)
     return "\n".join(urls)
@@ -24,6 +24,7 @@ from archivebox.core.views import (
     AddView,
     WebAddView,
     HealthCheckView,
+    MetricsView,
     live_progress_view,
 )
 
@@ -73,6 +74,7 @@ urlpatterns = [
     path("admin/", archivebox_admin.urls),
     path("api/", include("archivebox.api.urls"), name="api"),
     path("health/", HealthCheckView.as_view(), name="healthcheck"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
     path("error/", lambda request: _raise_test_error(request)),
     # path('jet_api/', include('jet_django.urls')),  Enable to use https://www.jetadmin.io/integrations/django
     path("index.html", RedirectView.as_view(url="/")),
@@ -1232,6 +1232,29 @@ class HealthCheckView(View):
         return HttpResponse("OK", content_type="text/plain", status=200)
 
 
+class MetricsView(View):
+    """
+    Prometheus text-format metrics (runner timings and queue depths) for superusers and superuser API tokens
+    """
+
+    def get(self, request):
+        from archivebox.api.auth import auth_using_token
+        from archivebox.misc.metrics import PROMETHEUS_CONTENT_TYPE, render_metrics
+
+        user = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            authorization = request.headers.get("Authorization", "")
+            token = (
+                request.headers.get("X-ArchiveBox-API-Key")
+                or (authorization[7:] if authorization.lower().startswith("bearer ") else None)
+                or request.GET.get("api_key")
+            )
+            user = auth_using_token(token, request=request) if token else None
+        if user is None or not user.is_superuser:
+            return HttpResponse("Unauthorized", content_type="text/plain", status=401)
+        return HttpResponse(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
 def live_progress_view(request):
     """Simple JSON endpoint for live progress status - used by admin progress monitor."""
     try:
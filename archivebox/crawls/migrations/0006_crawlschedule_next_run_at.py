@@ -0,0 +1,38 @@
+# Generated by Django 6.0 on 2026-10-19 00:00
+
+from django.db import migrations, models
+
+
+def backfill_next_run_at(apps, schema_editor):
+    from archivebox.crawls.schedule_utils import next_run_for_schedule
+
+    CrawlSchedule = apps.get_model("crawls", "CrawlSchedule")
+    Crawl = apps.get_model("crawls", "Crawl")
+
+    for schedule in CrawlSchedule.objects.filter(next_run_at__isnull=True).select_related("template").iterator():
+        latest_crawl = Crawl.objects.filter(schedule_id=schedule.pk).order_by("-created_at").first()
+        last_run_at = latest_crawl.created_at if latest_crawl else (schedule.template.created_at if schedule.template_id else schedule.created_at)
+        try:
+            next_run_at = next_run_for_schedule(schedule.schedule, last_run_at)
+        except ValueError:
+            continue
+        CrawlSchedule.objects.filter(pk=schedule.pk).update(next_run_at=next_run_at)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("crawls", "0005_add_crawl_limits"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="crawlschedule",
+            name="next_run_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="crawlschedule",
+            index=models.Index(fields=["is_enabled", "next_run_at"], name="crawlschedule_due_idx"),
+        ),
+        migrations.RunPython(backfill_next_run_at, migrations.RunPython.noop),
+    ]
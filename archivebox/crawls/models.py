@@ -5,6 +5,7 @@ from io import StringIO
 import uuid
 import json
 import re
+from collections import defaultdict
 from datetime import timedelta
 from archivebox.uuid_compat import uuid7
 from pathlib import Path
@@ -33,6 +34,9 @@ if TYPE_CHECKING:
     from archivebox.core.models import Snapshot
 
 
+SCHEDULE_CATCHUP_GRACE = timedelta(minutes=5)
+
+
 class CrawlSchedule(ModelWithUUID, ModelWithNotes):
     id = models.UUIDField(primary_key=True, default=uuid7, editable=False, unique=True)
     created_at = models.DateTimeField(default=timezone.now, db_index=True)
@@ -44,6 +48,7 @@ class CrawlSchedule(ModelWithUUID, ModelWithNotes):
     is_enabled = models.BooleanField(default=True)
     label = models.CharField(max_length=64, blank=True, null=False, default="")
     notes = models.TextField(blank=True, null=False, default="")
+    next_run_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     crawl_set: models.Manager["Crawl"]
 
@@ -51,6 +56,9 @@ class CrawlSchedule(ModelWithUUID, ModelWithNotes):
         app_label = "crawls"
         verbose_name = "Scheduled Crawl"
         verbose_name_plural = "Scheduled Crawls"
+        indexes = [
+            models.Index(fields=["is_enabled", "next_run_at"], name="crawlschedule_due_idx"),
+        ]
 
     def __str__(self) -> str:
         urls_preview = self.template.urls[:64] if self.template and self.template.urls else ""
@@ -64,6 +72,17 @@ class CrawlSchedule(ModelWithUUID, ModelWithNotes):
         self.schedule = (self.schedule or "").strip()
         validate_schedule(self.schedule)
         self.label = self.label or (self.template.label if self.template else "")
+
+        # next_run_at is persisted so the runner can find due schedules with one indexed query,
+        # it only needs recomputing when the schedule itself changes or the schedule is re-enabled
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"schedule", "is_enabled"} & set(update_fields):
+            saved = CrawlSchedule.objects.filter(pk=self.pk).values_list("schedule", "is_enabled").first()
+            if self.next_run_at is None or saved != (self.schedule, self.is_enabled):
+                self.next_run_at = self.compute_next_run_at()
+                if update_fields is not None:
+                    kwargs["update_fields"] = {*update_fields, "next_run_at"}
+
         super().save(*args, **kwargs)
         if self.template:
             self.template.schedule = self
@@ -71,27 +90,26 @@ class CrawlSchedule(ModelWithUUID, ModelWithNotes):
 
     @property
     def last_run_at(self):
-        latest_crawl = self.crawl_set.order_by("-created_at").first()
+        latest_crawl = None if self._state.adding else self.crawl_set.order_by("-created_at").first()
         if latest_crawl:
             return latest_crawl.created_at
         if self.template:
             return self.template.created_at
         return self.created_at
 
-    @property
-    def next_run_at(self):
-        return next_run_for_schedule(self.schedule, self.last_run_at)
+    def compute_next_run_at(self, after=None):
+        return next_run_for_schedule(self.schedule, after or self.last_run_at)
 
     def is_due(self, now=None) -> bool:
         now = now or timezone.now()
-        return self.is_enabled and self.next_run_at <= now
+        return self.is_enabled and (self.next_run_at or self.compute_next_run_at()) <= now
 
-    def enqueue(self, queued_at=None) -> "Crawl":
+    def enqueue(self, queued_at=None, next_run_at=None) -> "Crawl":
         queued_at = queued_at or timezone.now()
         template = self.template
         label = template.label or self.label
 
-        return Crawl.objects.create(
+        crawl = Crawl.objects.create(
             urls=template.urls,
             config=template.config or {},
             max_depth=template.max_depth,
@@ -106,6 +124,56 @@ class CrawlSchedule(ModelWithUUID, ModelWithNotes):
             retry_at=queued_at,
             created_by=template.created_by,
         )
+        self.next_run_at = next_run_at or next_run_for_schedule(self.schedule, queued_at)
+        CrawlSchedule.objects.filter(pk=self.pk).update(next_run_at=self.next_run_at)
+        return crawl
+
+    def run_if_due(self, now=None, catchup: str | None = None) -> "Crawl | None":
+        """Enqueue the run at next_run_at if it's due, applying SCHEDULE_CATCHUP to runs missed while no runner was up.
+
+        once: missed runs collapse into a single run now (default)
+        all:  every missed run is enqueued, one per runner loop, until the schedule has caught up
+        skip: runs more than SCHEDULE_CATCHUP_GRACE late are dropped, the schedule resumes at its next slot
+        """
+        from archivebox.config.common import get_config
+
+        now = now or timezone.now()
+        if not self.is_due(now):
+            return None
+
+        due_at = self.next_run_at or self.compute_next_run_at()
+        catchup = catchup or get_config().SCHEDULE_CATCHUP
+        if catchup == "skip" and now - due_at > SCHEDULE_CATCHUP_GRACE:
+            self.next_run_at = next_run_for_schedule(self.schedule, now)
+            CrawlSchedule.objects.filter(pk=self.pk).update(next_run_at=self.next_run_at)
+            return None
+        if catchup == "all":
+            return self.enqueue(queued_at=now, next_run_at=next_run_for_schedule(self.schedule, due_at))
+        return self.enqueue(queued_at=now)
+
+    @classmethod
+    def enqueue_due(cls, now=None) -> list["Crawl"]:
+        from archivebox.config.common import get_config
+
+        now = now or timezone.now()
+        catchup = get_config().SCHEDULE_CATCHUP
+        due_schedules = (
+            cls.objects.filter(is_enabled=True)
+            .filter(models.Q(next_run_at__lte=now) | models.Q(next_run_at__isnull=True))
+            .select_related("template", "template__created_by")
+            .order_by("next_run_at")
+        )
+        return [crawl for schedule in due_schedules if (crawl := schedule.run_if_due(now, catchup=catchup)) is not None]
+
+    @classmethod
+    def seconds_until_next_run(cls, now=None) -> float | None:
+        now = now or timezone.now()
+        next_run_at = (
+            cls.objects.filter(is_enabled=True, next_run_at__isnull=False).order_by("next_run_at").values_list("next_run_at", flat=True).first()
+        )
+        if next_run_at is None:
+            return None
+        return max((next_run_at - now).total_seconds(), 0.0)
 
 
 class Crawl(ModelWithOutputDir, ModelWithConfig, ModelWithHealthStats, ModelWithStateMachine):
@@ -627,6 +695,7 @@ class Crawl(ModelWithOutputDir, ModelWithConfig, ModelWithHealthStats, ModelWith
             return []
 
         created_snapshots = []
+        snapshot_ids_by_tags: dict[str, list] = defaultdict(list)
 
         for line in self.urls.splitlines():
             if not line.strip():
@@ -676,9 +745,9 @@ class Crawl(ModelWithOutputDir, ModelWithConfig, ModelWithHealthStats, ModelWith
 
             if created:
                 created_snapshots.append(snapshot)
-                # Save tags if present
+                # Tags are added in bulk below, grouped by tag string
                 if tags:
-                    snapshot.save_tags(tags.split(","))
+                    snapshot_ids_by_tags[tags].append(snapshot.pk)
 
             # Ensure crawl -> snapshot symlink exists for both new and existing snapshots
             try:
@@ -686,6 +755,12 @@ class Crawl(ModelWithOutputDir, ModelWithConfig, ModelWithHealthStats, ModelWith
             except Exception:
                 pass
 
+        if snapshot_ids_by_tags:
+            from archivebox.core.tag_utils import add_tags_to_snapshots
+
+            for tags, snapshot_ids in snapshot_ids_by_tags.items():
+                add_tags_to_snapshots(snapshot_ids, tags.split(","))
+
         return created_snapshots
 
     def create_discovered_snapshot(
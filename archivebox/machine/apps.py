@@ -16,7 +16,15 @@ class MachineConfig(AppConfig):
 
         # Skip during makemigrations to avoid premature state machine access
         if "makemigrations" not in sys.argv:
-            from archivebox.machine import models  # noqa: F401
+            from django.db.models.signals import post_delete
+
+            from archivebox.machine import models
+
+            post_delete.connect(
+                models.invalidate_current_machine,
+                sender="machine.Machine",
+                dispatch_uid="invalidate_current_machine_delete",
+            )
 
 
 def register_admin(admin_site):
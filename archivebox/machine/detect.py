@@ -1,6 +1,7 @@
 import os
 import json
 import socket
+import hashlib
 import urllib.request
 from typing import Any
 from pathlib import Path
@@ -214,6 +215,45 @@ def get_host_network() -> dict[str, Any]:
     raise Exception("Could not determine host network info")
 
 
+# /proc/net route tables, with the columns that change on every lookup (RefCnt, Use) dropped
+ROUTE_TABLE_VOLATILE_COLUMNS = {
+    "/proc/net/route": (4, 5),
+    "/proc/net/ipv6_route": (6, 7),
+}
+
+
+def get_network_fingerprint() -> str:
+    """
+    Cheap hash of the interface addresses, routing tables and DNS resolver config (no network requests).
+
+    Changes whenever the result of the slow get_host_network() is likely to have changed, so callers
+    can re-run it only when this differs (a public IP change behind the same router isn't detected).
+    """
+    hasher = hashlib.sha256()
+    try:
+        if_stats = psutil.net_if_stats()
+        for interface, addrs in sorted(psutil.net_if_addrs().items()):
+            hasher.update(f"{interface}:{getattr(if_stats.get(interface), 'isup', None)}\n".encode())
+            for addr in addrs:
+                hasher.update(f"{addr.family}:{addr.address}:{addr.netmask}\n".encode())
+    except Exception:
+        pass
+
+    for path, volatile_columns in ROUTE_TABLE_VOLATILE_COLUMNS.items():
+        try:
+            lines = Path(path).read_text().splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            hasher.update(" ".join(col for idx, col in enumerate(line.split()) if idx not in volatile_columns).encode() + b"\n")
+
+    try:
+        hasher.update(Path("/etc/resolv.conf").read_bytes())
+    except OSError:
+        pass
+    return hasher.hexdigest()
+
+
 def get_os_info() -> dict[str, Any]:
     os_release = platform.release()
     if platform.system().lower() == "darwin":
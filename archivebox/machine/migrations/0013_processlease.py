@@ -0,0 +1,40 @@
+# Generated by Django 6.0 on 2026-10-19 00:00
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+from archivebox.uuid_compat import uuid7
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("machine", "0012_add_machine_config_if_missing"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProcessLease",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(default=uuid7, editable=False, primary_key=True, serialize=False, unique=True),
+                ),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("object_type", models.CharField(choices=[("crawl", "Crawl"), ("snapshot", "Snapshot")], max_length=16)),
+                ("object_id", models.UUIDField()),
+                ("heartbeat_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("expires_at", models.DateTimeField()),
+                (
+                    "owner",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="leases", to="machine.process"),
+                ),
+            ],
+            options={
+                "verbose_name": "Process Lease",
+                "verbose_name_plural": "Process Leases",
+                "indexes": [models.Index(fields=["object_type", "expires_at"], name="processlease_expiry_idx")],
+                "constraints": [models.UniqueConstraint(fields=("object_type", "object_id"), name="unique_lease_per_object")],
+            },
+        ),
+    ]
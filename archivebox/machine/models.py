@@ -4,6 +4,7 @@ __package__ = "archivebox.machine"
 
 import os
 import sys
+import time
 import uuid
 import socket
 from pathlib import Path
@@ -21,7 +22,7 @@ from django_stubs_ext.db.models import TypedModelMeta
 
 from archivebox.base_models.models import ModelWithHealthStats
 from archivebox.workers.models import BaseStateMachine, ModelWithStateMachine
-from .detect import get_host_guid, get_os_info, get_vm_info, get_host_network, get_host_stats
+from .detect import get_host_guid, get_os_info, get_vm_info, get_host_network, get_host_stats, get_network_fingerprint
 
 _psutil: Any | None = None
 try:
@@ -40,11 +41,14 @@ else:
     psutil = cast(Any, _psutil)
 
 _CURRENT_MACHINE: Machine | None = None
+_CURRENT_MACHINE_CHECKED_AT: float = 0.0  # time.monotonic() of the last check that the cached Machine row still exists
 _CURRENT_INTERFACE: NetworkInterface | None = None
+_CURRENT_INTERFACE_FINGERPRINT: str = ""  # get_network_fingerprint() when _CURRENT_INTERFACE was last detected
 _CURRENT_BINARIES: dict[str, Binary] = {}
 _CURRENT_PROCESS: Process | None = None
 
 MACHINE_RECHECK_INTERVAL = 7 * 24 * 60 * 60
+MACHINE_DB_RECHECK_INTERVAL = 60  # deletes in this process invalidate immediately (see post_delete below), other processes within 60s
 NETWORK_INTERFACE_RECHECK_INTERVAL = 1 * 60 * 60
 BINARY_RECHECK_INTERVAL = 1 * 30 * 60
 PROCESS_RECHECK_INTERVAL = 60  # Re-validate every 60 seconds
@@ -146,6 +150,12 @@ def _sanitize_machine_config(config: dict[str, Any] | None) -> dict[str, Any]:
     return sanitized
 
 
+def invalidate_current_machine(sender=None, instance=None, **kwargs) -> None:
+    """post_delete handler: make the next Machine.current() call re-check that its cached row still exists."""
+    global _CURRENT_MACHINE_CHECKED_AT
+    _CURRENT_MACHINE_CHECKED_AT = 0.0
+
+
 class MachineManager(models.Manager):
     def current(self) -> Machine:
         return Machine.current()
@@ -185,16 +195,20 @@ class Machine(ModelWithHealthStats):
 
     @classmethod
     def current(cls) -> Machine:
-        global _CURRENT_MACHINE
+        global _CURRENT_MACHINE, _CURRENT_MACHINE_CHECKED_AT
         if _CURRENT_MACHINE:
             if timezone.now() < _CURRENT_MACHINE.modified_at + timedelta(seconds=MACHINE_RECHECK_INTERVAL):
+                if time.monotonic() - _CURRENT_MACHINE_CHECKED_AT < MACHINE_DB_RECHECK_INTERVAL:
+                    return cls._sanitize_config(_CURRENT_MACHINE)
                 if not cls.objects.filter(id=_CURRENT_MACHINE.id).exists():
                     _CURRENT_MACHINE = None
                 else:
+                    _CURRENT_MACHINE_CHECKED_AT = time.monotonic()
                     return cls._sanitize_config(_CURRENT_MACHINE)
             else:
                 _CURRENT_MACHINE = None
 
+        _CURRENT_MACHINE_CHECKED_AT = time.monotonic()
         host_guid = get_host_guid()
         try:
             _CURRENT_MACHINE = cls.objects.get(guid=host_guid)
@@ -323,16 +337,24 @@ class NetworkInterface(ModelWithHealthStats):
 
     @classmethod
     def current(cls, refresh: bool = False) -> NetworkInterface:
-        global _CURRENT_INTERFACE
+        """
+        The NetworkInterface this host is using right now.
+
+        refresh=True (used before every hook) only re-runs the slow get_host_network() (public IP/ISP lookups)
+        when the cheap local fingerprint of interfaces, routes and DNS config has changed since the last detection.
+        """
+        global _CURRENT_INTERFACE, _CURRENT_INTERFACE_FINGERPRINT
         machine = Machine.current()
+        fingerprint = get_network_fingerprint() if refresh else _CURRENT_INTERFACE_FINGERPRINT
         if _CURRENT_INTERFACE:
             if (
-                not refresh
+                fingerprint == _CURRENT_INTERFACE_FINGERPRINT
                 and _CURRENT_INTERFACE.machine_id == machine.id
                 and timezone.now() < _CURRENT_INTERFACE.modified_at + timedelta(seconds=NETWORK_INTERFACE_RECHECK_INTERVAL)
             ):
                 return _CURRENT_INTERFACE
             _CURRENT_INTERFACE = None
+        _CURRENT_INTERFACE_FINGERPRINT = fingerprint if refresh else get_network_fingerprint()
         net_info = get_host_network()
         _CURRENT_INTERFACE, _ = cls.objects.update_or_create(
             machine=machine,
@@ -2422,6 +2444,81 @@ class Process(models.Model):
         return cleaned
 
 
+class ProcessLeaseManager(models.Manager):
+    """Manager for ProcessLease model."""
+
+    def acquire(self, object_type: str, object_id, owner: Process, ttl: int = 60) -> ProcessLease:
+        """Take (or take over) the lease on an object for the given owner Process."""
+        now = timezone.now()
+        lease, _created = self.update_or_create(
+            object_type=object_type,
+            object_id=object_id,
+            defaults={"owner": owner, "heartbeat_at": now, "expires_at": now + timedelta(seconds=ttl)},
+        )
+        return lease
+
+    def release(self, object_type: str, object_id, owner: Process | None = None) -> int:
+        leases = self.filter(object_type=object_type, object_id=object_id)
+        if owner is not None:
+            leases = leases.filter(owner=owner)
+        return leases.delete()[0]
+
+    def renew(self, owner: Process, ttl: int = 60) -> int:
+        """Heartbeat every lease held by owner, returns the number of leases extended."""
+        now = timezone.now()
+        return self.filter(owner=owner).update(heartbeat_at=now, expires_at=now + timedelta(seconds=ttl))
+
+    def live(self, object_type: str, now: datetime | None = None) -> QuerySet[ProcessLease]:
+        return self.filter(object_type=object_type, expires_at__gt=now or timezone.now())
+
+    def purge_expired(self, now: datetime | None = None) -> int:
+        return self.filter(expires_at__lte=now or timezone.now()).delete()[0]
+
+
+class ProcessLease(models.Model):
+    """
+    Marks a crawl or snapshot as actively being worked on by a live Process.
+
+    The runner acquires a lease before it starts working on an object, heartbeats it while
+    the work is in progress, and releases it when done. If the owner dies without releasing,
+    the lease simply expires, so orphan recovery is a single indexed query for STARTED objects
+    without a live lease instead of matching running process pwds against output dirs.
+    """
+
+    class ObjectTypeChoices(models.TextChoices):
+        CRAWL = "crawl", "Crawl"
+        SNAPSHOT = "snapshot", "Snapshot"
+
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False, unique=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    object_type = models.CharField(max_length=16, choices=ObjectTypeChoices.choices)
+    object_id = models.UUIDField()
+    owner = models.ForeignKey(Process, on_delete=models.CASCADE, related_name="leases")
+    heartbeat_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField()
+
+    objects = ProcessLeaseManager()  # pyright: ignore[reportIncompatibleVariableOverride]
+
+    class Meta(TypedModelMeta):
+        app_label = "machine"
+        verbose_name = "Process Lease"
+        verbose_name_plural = "Process Leases"
+        constraints = [
+            models.UniqueConstraint(fields=["object_type", "object_id"], name="unique_lease_per_object"),
+        ]
+        indexes = [
+            models.Index(fields=["object_type", "expires_at"], name="processlease_expiry_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"ProcessLease[{self.object_type}:{self.object_id}] owner={self.owner_id} expires={self.expires_at}"
+
+    @property
+    def is_expired(self) -> bool:
+        return self.expires_at <= timezone.now()
+
+
 # =============================================================================
 # Binary State Machine
 # =============================================================================
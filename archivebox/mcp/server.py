@@ -3,19 +3,33 @@ Model Context Protocol (MCP) server implementation for ArchiveBox.
 
 Dynamically exposes all ArchiveBox CLI commands as MCP tools by introspecting
 Click command metadata. Handles JSON-RPC 2.0 requests over stdio transport.
+
+Tool calls run concurrently on a bounded thread pool. Read-only tools (list, search,
+status) call the query functions directly, everything else runs the CLI command in a
+subprocess whose output is streamed back as notifications/progress messages.
 """
 
+import os
 import sys
 import json
+import threading
 import traceback
+import subprocess
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import click
-from click.testing import CliRunner
 
 from archivebox.config.version import VERSION
 
 
+MCP_MAX_WORKERS = 4  # tool calls that can run at the same time
+MCP_MAX_QUEUED_CALLS = 64  # tool calls that can wait for a free worker before new ones are rejected as busy
+MCP_RESULT_TAIL_LINES = 200  # lines of output returned in the final result of a streamed tool call
+
+
 class MCPJSONEncoder(json.JSONEncoder):
     """Custom JSON encoder that handles Click sentinel values and other special types"""
 
@@ -115,129 +129,183 @@ def click_command_to_mcp_tool(cmd_name: str, click_command: click.Command) -> di
     }
 
 
-def execute_click_command(cmd_name: str, click_command: click.Command, arguments: dict) -> dict:
-    """
-    Execute a Click command programmatically with given arguments.
-
-    Returns MCP-formatted result with captured output and error status.
-    """
-
-    # Setup Django for archive commands (commands that need database access)
-    from archivebox.cli import ArchiveBoxGroup
-
-    if cmd_name in ArchiveBoxGroup.archive_commands:
-        try:
-            from archivebox.config.django import setup_django
-            from archivebox.misc.checks import check_data_folder
-
-            setup_django()
-            check_data_folder()
-        except Exception as e:
-            # If Django setup fails, return error (unless it's manage/shell which handle this themselves)
-            if cmd_name not in ("manage", "shell"):
-                return {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": f"Error setting up Django: {str(e)}\n\nMake sure you're running the MCP server from inside an ArchiveBox data directory.",
-                        },
-                    ],
-                    "isError": True,
-                }
-
-    # Use Click's test runner to invoke command programmatically
-    runner = CliRunner()
+def build_cli_args(click_command: click.Command, arguments: dict) -> list[str]:
+    """Convert an MCP tool call's arguments dict into a CLI args list for the given Click command."""
 
     # Build a map of parameter names to their Click types (Argument vs Option)
     param_map = {param.name: param for param in click_command.params}
 
-    # Convert arguments dict to CLI args list
     args = []
     positional_args = []
 
     for key, value in arguments.items():
-        param_name = key.replace("_", "-")  # Click uses dashes
         param = param_map.get(key)
 
         # Check if this is a positional Argument (not an Option)
-        is_argument = isinstance(param, click.Argument)
-
-        if is_argument:
+        if isinstance(param, click.Argument):
             # Positional arguments - add them without dashes
             if isinstance(value, list):
                 positional_args.extend([str(v) for v in value])
             elif value is not None:
                 positional_args.append(str(value))
-        else:
-            # Options - add with dashes
-            if isinstance(value, bool):
-                if value:
-                    args.append(f"--{param_name}")
-            elif isinstance(value, list):
-                # Multiple values for an option (rare)
-                for item in value:
-                    args.append(f"--{param_name}")
-                    args.append(str(item))
-            elif value is not None:
-                args.append(f"--{param_name}")
-                args.append(str(value))
+            continue
+
+        # Options - use the option's real long flag (e.g. --url__icontains), fall back to --dashed-name for unknown keys
+        long_opts = [opt for opt in getattr(param, "opts", ()) if opt.startswith("--")]
+        flag = long_opts[0] if long_opts else f"--{key.replace('_', '-')}"
+        if isinstance(value, bool):
+            if value:
+                args.append(flag)
+        elif isinstance(value, list):
+            # Multiple values for an option (rare)
+            for item in value:
+                args.append(flag)
+                args.append(str(item))
+        elif value is not None:
+            args.append(flag)
+            args.append(str(value))
 
     # Add positional arguments at the end
     args.extend(positional_args)
+    return args
 
-    # Execute the command
-    try:
-        result = runner.invoke(click_command, args, catch_exceptions=False)
 
-        # Format output as MCP content
-        content = []
+def text_result(text: str, is_error: bool = False) -> dict:
+    return {
+        "content": [{"type": "text", "text": text or "(no output)"}],
+        "isError": is_error,
+    }
 
-        if result.output:
-            content.append(
-                {
-                    "type": "text",
-                    "text": result.output,
-                },
-            )
 
-        if result.stderr_bytes:
-            stderr_text = result.stderr_bytes.decode("utf-8", errors="replace")
-            if stderr_text.strip():
-                content.append(
-                    {
-                        "type": "text",
-                        "text": f"[stderr]\n{stderr_text}",
-                    },
-                )
+class ToolCall:
+    """
+    State for one in-flight tools/call request: its cancellation flag and progress notification stream.
+    """
 
-        # Check exit code
-        is_error = result.exit_code != 0
+    def __init__(self, request_id: Any, progress_token: Any, send: Callable[[dict], None]):
+        self.request_id = request_id
+        self.progress_token = progress_token
+        self.send = send
+        self.cancelled = threading.Event()
+        self.progress = 0
+        self._on_cancel: list[Callable[[], Any]] = []
+        self._lock = threading.Lock()
+
+    def on_cancel(self, callback: Callable[[], Any]) -> None:
+        with self._lock:
+            if not self.cancelled.is_set():
+                self._on_cancel.append(callback)
+                return
+        callback()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled.set()
+            callbacks, self._on_cancel = self._on_cancel, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    @property
+    def streaming(self) -> bool:
+        return self.progress_token is not None
+
+    def notify(self, message: str) -> None:
+        """Send an MCP notifications/progress message (only if the client asked for progress on this call)."""
+        if not self.streaming or self.cancelled.is_set():
+            return
+        self.progress += 1
+        self.send(
+            {
+                "jsonrpc": "2.0",
+                "method": "notifications/progress",
+                "params": {"progressToken": self.progress_token, "progress": self.progress, "message": message},
+            },
+        )
 
-        if is_error and not content:
-            content.append(
-                {
-                    "type": "text",
-                    "text": f"Command failed with exit code {result.exit_code}",
-                },
-            )
 
-        return {
-            "content": content or [{"type": "text", "text": "(no output)"}],
-            "isError": is_error,
-        }
+def run_cli_tool(cmd_name: str, args: list[str], call: ToolCall) -> dict:
+    """
+    Run an ArchiveBox CLI command in a subprocess, streaming its output lines as progress notifications.
 
-    except Exception as e:
-        # Capture any exceptions during execution
-        error_trace = traceback.format_exc()
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": f"Error executing {cmd_name}: {str(e)}\n\n{error_trace}",
-                },
-            ],
-            "isError": True,
-        }
+    Running each command in its own process (instead of re-entering the CLI in-process) lets many calls
+    run at once without fighting over sys.stdout, and lets a cancelled call be killed immediately.
+    """
+    from archivebox.config import DATA_DIR
+
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "archivebox", cmd_name, *args],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+        bufsize=1,
+        cwd=DATA_DIR,
+        env={**os.environ, "USE_COLOR": "False", "SHOW_PROGRESS": "False"},
+    )
+    call.on_cancel(proc.terminate)
+
+    # when streaming, the full output has already been sent as progress notifications, so only return the tail
+    output: deque[str] | list[str] = deque(maxlen=MCP_RESULT_TAIL_LINES) if call.streaming else []
+    num_lines = 0
+    assert proc.stdout is not None
+    for line in proc.stdout:
+        num_lines += 1
+        output.append(line)
+        call.notify(line.rstrip("\n"))
+    exit_code = proc.wait()
+
+    text = "".join(output)
+    if num_lines > len(output):
+        text = f"[... {num_lines - len(output)} earlier lines were sent as progress notifications ...]\n{text}"
+    if exit_code != 0 and not text.strip():
+        text = f"Command failed with exit code {exit_code}"
+    return text_result(text, is_error=exit_code != 0)
+
+
+def list_tool(params: dict) -> str:
+    from archivebox.cli.archivebox_snapshot import filter_snapshots
+
+    csv = params.pop("csv", None)
+    with_headers = params.pop("with_headers", False)
+    if with_headers and not csv:
+        raise click.UsageError("--with-headers requires --csv")
+
+    queryset = filter_snapshots(**{**params, "query": " ".join(params.get("query") or ())})
+    if csv:
+        cols = [col.strip() for col in csv.split(",") if col.strip()]
+        rows = [snapshot.to_csv(cols=cols, separator=",") for snapshot in queryset.iterator(chunk_size=500)]
+        return "\n".join([",".join(cols), *rows] if with_headers else rows)
+    return "\n".join(json.dumps(snapshot.to_json()) for snapshot in queryset.iterator(chunk_size=500))
+
+
+def search_tool(params: dict) -> str:
+    from archivebox.cli.archivebox_search import render_search
+
+    return render_search(**{**params, "filter_patterns": list(params.get("filter_patterns") or ())})
+
+
+def status_tool(params: dict) -> str:
+    if params.get("metrics"):
+        from archivebox.misc.metrics import render_metrics
+
+        return render_metrics()
+
+    from archivebox.cli.archivebox_status import get_status_summary
+
+    return json.dumps(get_status_summary(), indent=4)
+
+
+# Read-only tools answered in-process by calling the underlying query functions directly.
+# They get their arguments parsed+validated by the same Click command the CLI uses, but skip the CLI itself.
+DIRECT_TOOLS: dict[str, Callable[[dict], str]] = {
+    "list": list_tool,
+    "search": search_tool,
+    "status": status_tool,
+}
 
 
 class MCPServer:
@@ -245,16 +313,43 @@ class MCPServer:
     Model Context Protocol server for ArchiveBox.
 
     Provides JSON-RPC 2.0 interface over stdio, dynamically exposing
-    all Click commands as MCP tools.
+    all Click commands as MCP tools. tools/call requests run concurrently
+    on a bounded thread pool and can be cancelled with notifications/cancelled.
     """
 
-    def __init__(self):
+    def __init__(self, max_workers: int = MCP_MAX_WORKERS):
         # Import here to avoid circular imports
         from archivebox.cli import ArchiveBoxGroup
 
         self.cli_group = ArchiveBoxGroup()
         self.protocol_version = "2025-11-25"
+        self.max_workers = max_workers
         self._tool_cache = {}  # Cache loaded Click commands
+        self._calls: dict[Any, ToolCall] = {}  # in-flight tools/call requests by request id
+        self._calls_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._django_lock = threading.Lock()
+        self._django_ready = False
+        self._pool: ThreadPoolExecutor | None = None
+
+    def send(self, message: dict) -> None:
+        """Write one JSON-RPC message to stdout (responses and notifications come from many threads)."""
+        line = json.dumps(message, cls=MCPJSONEncoder)
+        with self._write_lock:
+            sys.stdout.write(line + "\n")
+            sys.stdout.flush()
+
+    def setup_django(self) -> None:
+        if self._django_ready:
+            return
+        with self._django_lock:
+            if not self._django_ready:
+                from archivebox.config.django import setup_django
+                from archivebox.misc.checks import check_data_folder
+
+                setup_django()
+                check_data_folder()
+                self._django_ready = True
 
     def get_click_command(self, cmd_name: str) -> click.Command | None:
         """Get a Click command by name, with caching"""
@@ -286,6 +381,8 @@ class MCPServer:
             if click_cmd:
                 try:
                     tool_def = click_command_to_mcp_tool(cmd_name, click_cmd)
+                    if cmd_name in DIRECT_TOOLS:
+                        tool_def["annotations"] = {"readOnlyHint": True}
                     tools.append(tool_def)
                 except Exception as e:
                     # Log but don't fail - skip problematic commands
@@ -293,10 +390,11 @@ class MCPServer:
 
         return {"tools": tools}
 
-    def handle_tools_call(self, params: dict) -> dict:
+    def handle_tools_call(self, params: dict, call: ToolCall | None = None) -> dict:
         """Handle MCP tools/call request - executes a CLI command"""
         tool_name = params.get("name")
-        arguments = params.get("arguments", {})
+        arguments = params.get("arguments") or {}
+        call = call or ToolCall(None, (params.get("_meta") or {}).get("progressToken"), self.send)
 
         if not tool_name:
             raise ValueError("Missing required parameter: name")
@@ -305,10 +403,22 @@ class MCPServer:
         if not click_cmd:
             raise ValueError(f"Unknown tool: {tool_name}")
 
-        # Execute the command and return MCP-formatted result
-        return execute_click_command(tool_name, click_cmd, arguments)
+        args = build_cli_args(click_cmd, arguments)
+        if tool_name not in DIRECT_TOOLS:
+            return run_cli_tool(tool_name, args, call)
 
-    def handle_request(self, request: dict) -> dict:
+        try:
+            # parse the arguments exactly like the CLI would, then call the query function directly
+            with click_cmd.make_context(tool_name, args) as ctx:
+                kwargs = dict(ctx.params)
+            self.setup_django()
+            return text_result(DIRECT_TOOLS[tool_name](kwargs))
+        except click.ClickException as e:
+            return text_result(f"Error: {e.format_message()}", is_error=True)
+        except (Exception, SystemExit) as e:
+            return text_result(f"Error executing {tool_name}: {e}\n\n{traceback.format_exc()}", is_error=True)
+
+    def handle_request(self, request: dict, call: ToolCall | None = None) -> dict:
         """
         Handle a JSON-RPC 2.0 request and return response.
 
@@ -316,7 +426,7 @@ class MCPServer:
         """
 
         method = request.get("method")
-        params = request.get("params", {})
+        params = request.get("params") or {}
         request_id = request.get("id")
 
         try:
@@ -326,7 +436,7 @@ class MCPServer:
             elif method == "tools/list":
                 result = self.handle_tools_list(params)
             elif method == "tools/call":
-                result = self.handle_tools_call(params)
+                result = self.handle_tools_call(params, call)
             else:
                 # Method not found
                 return {
@@ -358,45 +468,106 @@ class MCPServer:
                 },
             }
 
+    def handle_notification(self, request: dict) -> None:
+        """Handle a JSON-RPC notification (no id, never gets a response)"""
+        if request.get("method") == "notifications/cancelled":
+            request_id = (request.get("params") or {}).get("requestId")
+            with self._calls_lock:
+                call = self._calls.get(request_id)
+            if call is not None:
+                call.cancel()
+
+    def submit_tool_call(self, request: dict) -> None:
+        """Queue a tools/call request on the worker pool, its response is sent whenever it finishes"""
+        assert self._pool is not None
+        request_id = request.get("id")
+        params = request.get("params") or {}
+
+        call = None
+        with self._calls_lock:
+            if len(self._calls) < self.max_workers + MCP_MAX_QUEUED_CALLS:
+                call = ToolCall(request_id, (params.get("_meta") or {}).get("progressToken"), self.send)
+                self._calls[request_id] = call
+        if call is None:
+            self.send(
+                {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "error": {"code": -32000, "message": f"Server busy: too many tool calls in flight (max {self.max_workers + MCP_MAX_QUEUED_CALLS})"},
+                },
+            )
+            return
+
+        self._pool.submit(self._run_tool_call, request, call)
+
+    def _run_tool_call(self, request: dict, call: ToolCall) -> None:
+        try:
+            if call.cancelled.is_set():
+                return  # cancelled while still waiting in the queue
+            response = self.handle_request(request, call)
+            # per the MCP spec, cancelled requests get no response
+            if not call.cancelled.is_set():
+                self.send(response)
+        finally:
+            with self._calls_lock:
+                self._calls.pop(call.request_id, None)
+            if self._django_ready:
+                from django.db import connections
+
+                # DB connections are per-thread, don't leak one per pool thread
+                connections.close_all()
+
+    def dispatch(self, request: dict) -> None:
+        if "id" not in request:
+            self.handle_notification(request)
+        elif request.get("method") == "tools/call" and self._pool is not None:
+            self.submit_tool_call(request)
+        else:
+            self.send(self.handle_request(request))
+
     def run_stdio_server(self):
         """
         Run the MCP server in stdio mode.
 
-        Reads JSON-RPC requests from stdin (one per line),
-        writes JSON-RPC responses to stdout (one per line).
+        Reads JSON-RPC requests from stdin (one per line) and writes JSON-RPC
+        responses + notifications to stdout (one per line). tools/call requests
+        are answered out of order as they finish, the rest are answered inline.
         """
 
-        # Read requests from stdin line by line
-        for line in sys.stdin:
-            line = line.strip()
-            if not line:
-                continue
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mcp-tool") as pool:
+            self._pool = pool
 
-            try:
-                # Parse JSON-RPC request
-                request = json.loads(line)
+            # Read requests from stdin line by line
+            for line in sys.stdin:
+                line = line.strip()
+                if not line:
+                    continue
 
-                # Handle request
-                response = self.handle_request(request)
+                try:
+                    # Parse JSON-RPC request
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    # Invalid JSON
+                    self.send(
+                        {
+                            "jsonrpc": "2.0",
+                            "id": None,
+                            "error": {
+                                "code": -32700,
+                                "message": "Parse error",
+                                "data": str(e),
+                            },
+                        },
+                    )
+                    continue
 
-                # Write response to stdout (use custom encoder for Click types)
-                print(json.dumps(response, cls=MCPJSONEncoder), flush=True)
+                self.dispatch(request)
 
-            except json.JSONDecodeError as e:
-                # Invalid JSON
-                error_response = {
-                    "jsonrpc": "2.0",
-                    "id": None,
-                    "error": {
-                        "code": -32700,
-                        "message": "Parse error",
-                        "data": str(e),
-                    },
-                }
-                print(json.dumps(error_response, cls=MCPJSONEncoder), flush=True)
+            # stdin closed: let in-flight calls finish and send their responses before exiting
+        self._pool = None
 
 
-def run_mcp_server():
+def run_mcp_server(max_workers: int = MCP_MAX_WORKERS):
     """Main entry point for MCP server"""
-    server = MCPServer()
+    server = MCPServer(max_workers=max_workers)
     server.run_stdio_server()
@@ -0,0 +1,180 @@
+"""
+Content-addressed blob store used to deduplicate identical snapshot output files.
+
+Every deduplicated file is a hardlink to DATA_DIR/blobs/<sha256[:2]>/<sha256>, so the same favicon / CDN asset /
+response body archived thousands of times only takes up disk space (and page cache) once. The blob's own link
+count doubles as its reference count: once no snapshot links to it anymore (st_nlink == 1) it can be pruned.
+
+Each snapshot dir keeps a hidden .blobs manifest of the digests it links to so `archivebox remove` can prune
+just the blobs it may have orphaned without hashing or scanning anything else.
+
+Blobs are made read-only because writing into any one link in-place would silently change every snapshot
+sharing it, plugins that need to rewrite an output should replace the file rather than truncating it.
+"""
+
+__package__ = "archivebox.misc"
+
+import errno
+import hashlib
+import os
+import stat
+from dataclasses import dataclass
+from pathlib import Path
+from collections.abc import Iterable
+
+
+BLOB_MANIFEST_FILENAME = ".blobs"
+
+# files that are rewritten in place or are specific to one snapshot, never worth deduplicating
+DEDUPE_EXCLUDE_NAMES = {"stdout.log", "stderr.log", "process.pid", "hook.pid", "listener.pid", "cmd.sh", "index.json", "index.jsonl", "index.html"}
+
+_LINK_ERRNOS = {errno.EXDEV, errno.EMLINK, errno.EPERM, errno.EACCES, errno.ENOTSUP}
+
+
+@dataclass
+class DedupeStats:
+    files: int = 0
+    deduped: int = 0
+    bytes_saved: int = 0
+
+    def __iadd__(self, other: "DedupeStats") -> "DedupeStats":
+        self.files += other.files
+        self.deduped += other.deduped
+        self.bytes_saved += other.bytes_saved
+        return self
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_dedupable_files(snapshot_dir: Path) -> Iterable[Path]:
+    """Yield plugin output files under a snapshot dir, skipping logs, indexes and hidden/.hooks files."""
+    for plugin_dir in sorted(snapshot_dir.iterdir()):
+        if plugin_dir.name.startswith(".") or not plugin_dir.is_dir() or plugin_dir.is_symlink():
+            continue
+        for current_root, dirnames, filenames in os.walk(plugin_dir):
+            dirnames[:] = [name for name in dirnames if not name.startswith(".")]
+            for filename in filenames:
+                if filename.startswith(".") or filename in DEDUPE_EXCLUDE_NAMES:
+                    continue
+                yield Path(current_root) / filename
+
+
+class BlobStore:
+    def __init__(self, root: Path, min_size: int = 1):
+        self.root = Path(root)
+        self.min_size = min_size
+
+    def blob_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def dedupe_file(self, path: Path) -> tuple[str | None, int]:
+        """Replace path with a hardlink to its blob, returns (digest or None if skipped, bytes saved)."""
+        try:
+            stat_result = path.lstat()
+        except FileNotFoundError:
+            return None, 0
+        if not stat.S_ISREG(stat_result.st_mode) or stat_result.st_size < self.min_size:
+            return None, 0
+
+        digest = _sha256(path)
+        blob = self.blob_path(digest)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            # first copy of this content: the store just takes a link to it
+            os.link(path, blob)
+            os.chmod(blob, stat.S_IMODE(stat_result.st_mode) & ~0o222)
+            return digest, 0
+        except FileExistsError:
+            pass
+        except OSError as err:
+            if err.errno in _LINK_ERRNOS:
+                return None, 0
+            raise
+
+        blob_stat = blob.stat()
+        if blob_stat.st_ino == stat_result.st_ino and blob_stat.st_dev == stat_result.st_dev:
+            return digest, 0
+        if blob_stat.st_size != stat_result.st_size:
+            return None, 0
+
+        tmp_path = path.with_name(f".{path.name}.blob-tmp")
+        try:
+            tmp_path.unlink(missing_ok=True)
+            os.link(blob, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as err:
+            tmp_path.unlink(missing_ok=True)
+            if err.errno in _LINK_ERRNOS:
+                return None, 0
+            raise
+        return digest, stat_result.st_size
+
+    def dedupe_files(self, snapshot_dir: Path, paths: Iterable[Path]) -> DedupeStats:
+        stats = DedupeStats()
+        digests: set[str] = set()
+        for path in paths:
+            stats.files += 1
+            digest, saved = self.dedupe_file(path)
+            if digest is None:
+                continue
+            digests.add(digest)
+            if saved:
+                stats.deduped += 1
+                stats.bytes_saved += saved
+        if digests:
+            self.add_to_manifest(snapshot_dir, digests)
+        return stats
+
+    def dedupe_snapshot_dir(self, snapshot_dir: Path) -> DedupeStats:
+        if not snapshot_dir.is_dir():
+            return DedupeStats()
+        return self.dedupe_files(snapshot_dir, iter_dedupable_files(snapshot_dir))
+
+    def read_manifest(self, snapshot_dir: Path) -> set[str]:
+        try:
+            return {line.strip() for line in (snapshot_dir / BLOB_MANIFEST_FILENAME).read_text().splitlines() if line.strip()}
+        except FileNotFoundError:
+            return set()
+
+    def add_to_manifest(self, snapshot_dir: Path, digests: Iterable[str]) -> None:
+        manifest = self.read_manifest(snapshot_dir)
+        new_digests = set(digests) - manifest
+        if not new_digests:
+            return
+        with open(snapshot_dir / BLOB_MANIFEST_FILENAME, "a") as f:
+            f.writelines(f"{digest}\n" for digest in sorted(new_digests))
+
+    def prune(self, digests: Iterable[str] | None = None) -> int:
+        """Delete blobs nothing links to anymore, either the given digests or (if None) the whole store."""
+        if digests is None:
+            blobs: Iterable[Path] = (blob for blob in self.root.glob("*/*") if not blob.name.startswith("."))
+        else:
+            blobs = (self.blob_path(digest) for digest in digests)
+
+        freed = 0
+        for blob in blobs:
+            try:
+                stat_result = blob.lstat()
+                if stat_result.st_nlink > 1:
+                    continue
+                blob.unlink()
+            except FileNotFoundError:
+                continue
+            freed += stat_result.st_size
+        return freed
+
+
+def get_blob_store(config=None) -> BlobStore | None:
+    """Return the configured blob store, or None if DEDUPE_OUTPUTS is turned off."""
+    from archivebox.config.common import get_config
+
+    config = config or get_config()
+    if not config.DEDUPE_OUTPUTS:
+        return None
+    return BlobStore(config.BLOBS_DIR, min_size=config.DEDUPE_MIN_SIZE)
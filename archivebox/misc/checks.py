@@ -2,6 +2,7 @@ __package__ = "archivebox.misc"
 
 import os
 import sys
+import time
 from pathlib import Path
 
 from rich import print
@@ -19,6 +20,45 @@ from rich.panel import Panel
 # that the check is called after django.setup() has been called
 
 
+DATA_FOLDER_CHECK_STAMP = "data_folder_check.stamp"
+DATA_FOLDER_CHECK_MAX_AGE = 60 * 60  # re-run the full checks at least hourly even if nothing looks changed
+
+
+def get_data_folder_fingerprint(config) -> str:
+    """hash of everything the data folder checks depend on, changes whenever any of the checked dirs are modified"""
+    import hashlib
+
+    from archivebox import DATA_DIR
+    from archivebox.config import CONSTANTS
+    from archivebox.config.version import VERSION
+
+    parts = [VERSION, str(os.getuid()), str(os.getgid())]
+    for path in (DATA_DIR, CONSTANTS.CONFIG_FILE, config.ARCHIVE_DIR, config.USERS_DIR, config.TMP_DIR, config.LIB_DIR):
+        try:
+            stat = os.stat(path)
+            parts.append(f"{path}:{stat.st_mtime_ns}:{stat.st_uid}:{stat.st_gid}:{stat.st_mode}")
+        except OSError:
+            parts.append(f"{path}:missing")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def data_folder_check_is_cached(config) -> bool:
+    stamp = Path(config.TMP_DIR) / DATA_FOLDER_CHECK_STAMP
+    try:
+        if time.time() - stamp.stat().st_mtime > DATA_FOLDER_CHECK_MAX_AGE:
+            return False
+        return stamp.read_text().strip() == get_data_folder_fingerprint(config)
+    except OSError:
+        return False
+
+
+def save_data_folder_check(config) -> None:
+    try:
+        (Path(config.TMP_DIR) / DATA_FOLDER_CHECK_STAMP).write_text(get_data_folder_fingerprint(config))
+    except OSError:
+        pass
+
+
 def check_data_folder(config=None, **config_kwargs) -> None:
     from archivebox import DATA_DIR
     from archivebox.config import CONSTANTS
@@ -26,6 +66,12 @@ def check_data_folder(config=None, **config_kwargs) -> None:
     from archivebox.config.paths import create_and_chown_dir, get_or_create_working_tmp_dir, get_or_create_working_lib_dir
 
     config = config or get_config(**config_kwargs)
+
+    # skip the (slow) dir creation + permission checks if nothing has changed since they last passed
+    if data_folder_check_is_cached(config):
+        os.umask(0o777 - int(config.DIR_OUTPUT_PERMISSIONS, base=8))
+        return
+
     archive_dir = config.ARCHIVE_DIR
     archive_dir_exists = os.path.isdir(archive_dir)
     if not archive_dir_exists:
@@ -48,11 +94,15 @@ def check_data_folder(config=None, **config_kwargs) -> None:
     # create_and_chown_dir(CONSTANTS.CACHE_DIR)
 
     # Create /tmp and /lib dirs if they don't exist
-    get_or_create_working_tmp_dir(autofix=True, quiet=False, config=config)
-    get_or_create_working_lib_dir(autofix=True, quiet=False, config=config)
+    tmp_dir = get_or_create_working_tmp_dir(autofix=True, quiet=False, config=config)
+    lib_dir = get_or_create_working_lib_dir(autofix=True, quiet=False, config=config)
 
     # Check data dir permissions, /tmp, and /lib permissions
-    check_data_dir_permissions(config=config)
+    all_ok = check_data_dir_permissions(config=config)
+
+    # only cache a fully clean result, warnings and autofixed TMP_DIR/LIB_DIR fallbacks should be re-checked every time
+    if all_ok and tmp_dir == config.TMP_DIR and lib_dir == config.LIB_DIR:
+        save_data_folder_check(config)
 
 
 def check_migrations():
@@ -145,7 +195,7 @@ def check_not_inside_source_dir():
         raise SystemExit("[!] Cannot run from source dir, set DATA_DIR or cd to a data folder first")
 
 
-def check_data_dir_permissions(config=None, **config_kwargs):
+def check_data_dir_permissions(config=None, **config_kwargs) -> bool:
     from archivebox import DATA_DIR
     from archivebox.misc.logging import STDERR
     from archivebox.config.permissions import ARCHIVEBOX_USER, ARCHIVEBOX_GROUP, DEFAULT_PUID, DEFAULT_PGID, IS_ROOT, USER
@@ -201,13 +251,15 @@ def check_data_dir_permissions(config=None, **config_kwargs):
         lib_dir = config.LIB_DIR
 
     # Check /tmp dir permissions
-    check_tmp_dir(tmp_dir, throw=False, must_exist=True, config=config)
+    tmp_ok = check_tmp_dir(tmp_dir, throw=False, must_exist=True, config=config)
 
     # Check /lib dir permissions
-    check_lib_dir(lib_dir, throw=False, must_exist=True, config=config)
+    lib_ok = check_lib_dir(lib_dir, throw=False, must_exist=True, config=config)
 
     os.umask(0o777 - int(config.DIR_OUTPUT_PERMISSIONS, base=8))
 
+    return bool(tmp_ok and lib_ok and not (data_owned_by_root or data_owner_doesnt_match or data_not_writable))
+
 
 def check_tmp_dir(tmp_dir=None, throw=False, quiet=False, must_exist=True, config=None, **config_kwargs):
     from archivebox.config.paths import assert_dir_can_contain_unix_sockets, dir_is_writable, get_or_create_working_tmp_dir
@@ -18,12 +18,20 @@ Typed JSONL Format:
 Plain URLs (also supported):
     https://example.com
     https://foo.com
+
+Streaming:
+    Piped commands read stdin lazily in bounded batches (iter_batches) and write their output records
+    as soon as each batch is committed, so `archivebox crawl | archivebox snapshot | archivebox run`
+    starts working on the first records right away and runs in constant memory. Backpressure comes
+    from the pipes themselves: while a batch is being processed nothing is read from stdin, so once the
+    OS pipe buffer is full a faster upstream command blocks on its writes until we catch up.
 """
 
 __package__ = "archivebox.misc"
 
 import sys
 import json
+import time
 import select
 from typing import Any, TextIO
 from collections.abc import Iterable, Iterator
@@ -40,6 +48,11 @@ TYPE_BINARY = "Binary"
 TYPE_PROCESS = "Process"
 TYPE_MACHINE = "Machine"
 
+# max records held in memory / committed per transaction by piped commands, and how long a partial
+# batch may wait for more input before it's processed anyway (so slow producers still see progress)
+STDIN_BATCH_SIZE = 500
+STDIN_BATCH_MAX_WAIT = 2.0
+
 VALID_TYPES = {
     TYPE_SNAPSHOT,
     TYPE_ARCHIVERESULT,
@@ -156,6 +169,30 @@ def read_args_or_stdin(args: Iterable[str], stream: TextIO | None = None) -> Ite
         yield from read_stdin(stream)
 
 
+def iter_batches(
+    records: Iterable[dict[str, Any]],
+    batch_size: int = STDIN_BATCH_SIZE,
+    max_wait: float = STDIN_BATCH_MAX_WAIT,
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    Group a (possibly endless) stream of records into lists of at most batch_size records.
+
+    A partial batch is yielded early once max_wait seconds have passed since its first record arrived
+    (checked as each new record comes in), and the remainder is yielded when the stream ends.
+    """
+    batch: list[dict[str, Any]] = []
+    started_at = 0.0
+    for record in records:
+        if not batch:
+            started_at = time.monotonic()
+        batch.append(record)
+        if len(batch) >= batch_size or time.monotonic() - started_at >= max_wait:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
 def write_record(record: dict[str, Any], stream: TextIO | None = None) -> None:
     """
     Write a single JSONL record to stdout (or provided stream).
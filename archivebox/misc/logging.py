@@ -7,7 +7,6 @@ import sys
 from collections import defaultdict
 from random import randint
 
-from benedict import benedict
 from rich.console import Console
 from rich.highlighter import Highlighter
 
@@ -28,20 +27,18 @@ class RainbowHighlighter(Highlighter):
 rainbow = RainbowHighlighter()
 
 
-DEFAULT_CLI_COLORS = benedict(
-    {
-        "reset": "\033[00;00m",
-        "lightblue": "\033[01;30m",
-        "lightyellow": "\033[01;33m",
-        "lightred": "\033[01;35m",
-        "red": "\033[01;31m",
-        "green": "\033[01;32m",
-        "blue": "\033[01;34m",
-        "white": "\033[01;37m",
-        "black": "\033[01;30m",
-    },
-)
-ANSI = benedict({k: "" for k in DEFAULT_CLI_COLORS.keys()})
+DEFAULT_CLI_COLORS = {
+    "reset": "\033[00;00m",
+    "lightblue": "\033[01;30m",
+    "lightyellow": "\033[01;33m",
+    "lightred": "\033[01;35m",
+    "red": "\033[01;31m",
+    "green": "\033[01;32m",
+    "blue": "\033[01;34m",
+    "white": "\033[01;37m",
+    "black": "\033[01;30m",
+}
+ANSI = {k: "" for k in DEFAULT_CLI_COLORS.keys()}
 
 COLOR_DICT = defaultdict(
     lambda: [(0, 0, 0), (0, 0, 0)],
@@ -60,7 +57,7 @@ COLOR_DICT = defaultdict(
 
 
 # Logging Helpers (DEPRECATED, use rich.print instead going forward)
-def stdout(*args, color: str | None = None, prefix: str = "", config: benedict | None = None) -> None:
+def stdout(*args, color: str | None = None, prefix: str = "", config: dict | None = None) -> None:
     ansi = DEFAULT_CLI_COLORS if (config or {}).get("USE_COLOR") else ANSI
 
     if color:
@@ -71,7 +68,7 @@ def stdout(*args, color: str | None = None, prefix: str = "", config: benedict |
     sys.stdout.write(prefix + "".join(strs))
 
 
-def stderr(*args, color: str | None = None, prefix: str = "", config: benedict | None = None) -> None:
+def stderr(*args, color: str | None = None, prefix: str = "", config: dict | None = None) -> None:
     ansi = DEFAULT_CLI_COLORS if (config or {}).get("USE_COLOR") else ANSI
 
     if color:
@@ -82,7 +79,7 @@ def stderr(*args, color: str | None = None, prefix: str = "", config: benedict |
     sys.stderr.write(prefix + "".join(strs))
 
 
-def hint(text: tuple[str, ...] | list[str] | str, prefix="    ", config: benedict | None = None) -> None:
+def hint(text: tuple[str, ...] | list[str] | str, prefix="    ", config: dict | None = None) -> None:
     ansi = DEFAULT_CLI_COLORS if (config or {}).get("USE_COLOR") else ANSI
 
     if isinstance(text, str):
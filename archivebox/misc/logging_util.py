@@ -447,10 +447,13 @@ def log_removal_started(snapshots, yes: bool, delete: bool):
     count = snapshots.count() if hasattr(snapshots, "count") else len(snapshots)
     print(f"[yellow3][i] Found {count} matching URLs to remove.[/]")
     if delete:
-        file_counts = [s.num_outputs for s in snapshots if os.access(s.output_dir, os.R_OK)]
+        from archivebox.core.models import ArchiveResult
+
+        # one aggregate query instead of loading every snapshot and stat-ing its folder
+        num_outputs = ArchiveResult.objects.filter(snapshot__in=snapshots, status="succeeded").count()
         print(
             f"    {count} Links will be de-listed from the main index, and their archived content folders will be deleted from disk.\n"
-            f"    ({len(file_counts)} data folders with {sum(file_counts)} archived files will be deleted!)",
+            f"    ({count} data folders with {num_outputs} archived outputs will be deleted!)",
         )
     else:
         print(
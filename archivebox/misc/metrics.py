@@ -0,0 +1,311 @@
+"""
+Low-overhead in-process counters and histograms for the runner, rendered in the Prometheus text format.
+
+Every ArchiveBox process (server, `archivebox run`, CLI commands) records into its own in-memory registry and
+periodically flushes a snapshot of it to TMP_DIR/metrics/<pid>-<started>.json. `/metrics` and
+`archivebox status --metrics` merge those files (summing counters and histogram buckets across processes) and add
+queue-depth gauges computed from the DB at scrape time, so no metrics daemon or extra dependency is needed.
+"""
+
+__package__ = "archivebox.misc"
+
+import os
+import json
+import time
+import atexit
+import inspect
+import threading
+import functools
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from collections.abc import Callable, Iterator
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRICS_DIR_NAME = "metrics"
+METRICS_FLUSH_INTERVAL = 5.0  # seconds between snapshot writes while a process is busy
+METRICS_FILE_MAX_AGE = 24 * 60 * 60  # forget snapshots from processes that exited more than a day ago
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+HOOK_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+
+LabelValues = tuple[str, ...]
+
+
+class Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.registry: "MetricsRegistry | None" = None
+        self._lock = threading.Lock()
+        self._samples: dict[LabelValues, Any] = {}
+
+    def _key(self, labels: dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def dump(self) -> list[list[Any]]:
+        with self._lock:
+            return [[list(key), value] for key, value in self._samples.items()]
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._samples[key] = self._samples.get(key, 0) + amount
+        if self.registry is not None:
+            self.registry.maybe_flush()
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            # [per-bucket counts (non-cumulative, last one is +Inf), sum, count]
+            sample = self._samples.get(key)
+            if sample is None:
+                sample = self._samples[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            sample[0][bisect_left(self.buckets, value)] += 1
+            sample[1] += value
+            sample[2] += 1
+        if self.registry is not None:
+            self.registry.maybe_flush()
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+        self.started_at = int(time.time())
+        self._last_flush = 0.0
+        self._flush_lock = threading.Lock()
+        self._metrics_dir: Path | None = None
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        metric.registry = self
+        return metric
+
+    def dump(self) -> dict[str, list[list[Any]]]:
+        return {name: metric.dump() for name, metric in self.metrics.items()}
+
+    @property
+    def metrics_dir(self) -> Path:
+        if self._metrics_dir is None:
+            from archivebox.config.common import get_config
+
+            self._metrics_dir = Path(get_config().TMP_DIR) / METRICS_DIR_NAME
+        return self._metrics_dir
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.metrics_dir / f"{os.getpid()}-{self.started_at}.json"
+
+    def maybe_flush(self) -> None:
+        if time.monotonic() - self._last_flush >= METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write this process's samples to its snapshot file so other processes can merge them."""
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_flush = time.monotonic()
+            samples = self.dump()
+            if not any(samples.values()):
+                return
+            path = self.snapshot_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps({"pid": os.getpid(), "samples": samples}))
+            os.replace(tmp_path, path)
+        except Exception:
+            # metrics must never break the thing being measured
+            pass
+        finally:
+            self._flush_lock.release()
+
+    def collect(self) -> dict[str, dict[LabelValues, Any]]:
+        """Merge this process's live samples with every other process's last flushed snapshot."""
+        merged: dict[str, dict[LabelValues, Any]] = {name: {} for name in self.metrics}
+
+        def merge(name: str, samples: list[list[Any]]) -> None:
+            metric = self.metrics.get(name)
+            if metric is None:
+                return
+            into = merged[name]
+            for key, value in samples:
+                key = tuple(key)
+                if isinstance(metric, Histogram):
+                    if len(value[0]) != len(metric.buckets) + 1:
+                        continue
+                    existing = into.setdefault(key, [[0] * len(value[0]), 0.0, 0])
+                    existing[0] = [a + b for a, b in zip(existing[0], value[0])]
+                    existing[1] += value[1]
+                    existing[2] += value[2]
+                else:
+                    into[key] = into.get(key, 0) + value
+
+        own_path = self.snapshot_path
+        now = time.time()
+        metrics_dir = self.metrics_dir
+        if metrics_dir.is_dir():
+            for path in metrics_dir.glob("*.json"):
+                if path == own_path:
+                    continue
+                try:
+                    if now - path.stat().st_mtime > METRICS_FILE_MAX_AGE:
+                        path.unlink(missing_ok=True)
+                        continue
+                    snapshot = json.loads(path.read_text())
+                except (OSError, ValueError):
+                    continue
+                for name, samples in snapshot.get("samples", {}).items():
+                    merge(name, samples)
+        for name, samples in self.dump().items():
+            merge(name, samples)
+        return merged
+
+
+REGISTRY = MetricsRegistry()
+atexit.register(REGISTRY.flush)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: tuple[str, ...], values: tuple[str, ...], extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = [*zip(labelnames, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def get_queue_depths() -> dict[tuple[str, str], int]:
+    """Count Crawls/Snapshots/ArchiveResults/Binaries by status straight from the DB."""
+    from django.db.models import Count
+
+    from archivebox.core.models import ArchiveResult, Snapshot
+    from archivebox.crawls.models import Crawl
+    from archivebox.machine.models import Binary
+
+    depths: dict[tuple[str, str], int] = {}
+    for model in (Crawl, Snapshot, ArchiveResult, Binary):
+        for row in model.objects.order_by().values("status").annotate(count=Count("pk")):
+            depths[(model._meta.model_name, row["status"])] = row["count"]
+    return depths
+
+
+def render_metrics(registry: MetricsRegistry | None = None, include_queue_depths: bool = True) -> str:
+    """Render all known metrics (merged across processes) in the Prometheus text exposition format."""
+    lines: list[str] = []
+    if include_queue_depths:
+        lines += [
+            "# HELP archivebox_queue_depth Number of rows in each state, read from the DB at scrape time",
+            "# TYPE archivebox_queue_depth gauge",
+        ]
+        for (model, status), count in sorted(get_queue_depths().items()):
+            lines.append(f"archivebox_queue_depth{_format_labels(('model', 'status'), (model, status))} {count}")
+
+    registry = registry or REGISTRY
+    for name, samples in registry.collect().items():
+        metric = registry.metrics[name]
+        lines += [f"# HELP {name} {metric.documentation}", f"# TYPE {name} {metric.type_name}"]
+        for key, value in sorted(samples.items()):
+            if isinstance(metric, Histogram):
+                cumulative = 0
+                for upper_bound, count in zip((*metric.buckets, float("inf")), value[0]):
+                    cumulative += count
+                    labels = _format_labels(metric.labelnames, key, (("le", _format_value(upper_bound)),))
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(metric.labelnames, key)} {_format_value(value[1])}")
+                lines.append(f"{name}_count{_format_labels(metric.labelnames, key)} {value[2]}")
+            else:
+                lines.append(f"{name}{_format_labels(metric.labelnames, key)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _event_age(event: Any) -> float | None:
+    created_at = getattr(event, "event_created_at", None)
+    if not created_at:
+        return None
+    try:
+        created = datetime.fromisoformat(str(created_at).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=timezone.utc)
+    return max((datetime.now(timezone.utc) - created).total_seconds(), 0.0)
+
+
+def track_handler(func: Callable) -> Callable:
+    """Record abxbus dispatch lag and handler (DB write) latency for an async `on_<Event>__save_to_db` handler."""
+    assert inspect.iscoroutinefunction(func), f"{func.__qualname__} must be async"
+    handler = func.__qualname__
+
+    @functools.wraps(func)
+    async def wrapper(self, event, *args, **kwargs):
+        lag = _event_age(event)
+        if lag is not None:
+            BUS_DISPATCH_SECONDS.observe(lag, handler=handler)
+        start = time.perf_counter()
+        try:
+            return await func(self, event, *args, **kwargs)
+        finally:
+            DB_WRITE_SECONDS.observe(time.perf_counter() - start, handler=handler)
+
+    return wrapper
+
+
+HOOK_DURATION_SECONDS = REGISTRY.register(
+    Histogram("archivebox_hook_duration_seconds", "Wall-clock runtime of plugin hook subprocesses", ("plugin", "outcome"), buckets=HOOK_BUCKETS),
+)
+EXTRACTOR_OUTPUT_BYTES = REGISTRY.register(
+    Counter("archivebox_extractor_output_bytes_total", "Bytes of output files recorded per extractor plugin", ("plugin",)),
+)
+CLAIM_SECONDS = REGISTRY.register(
+    Histogram("archivebox_claim_seconds", "Time for the runner to find and lock the next queued object", ("object_type",)),
+)
+DB_WRITE_SECONDS = REGISTRY.register(
+    Histogram("archivebox_db_write_seconds", "Time spent in abxbus save_to_db handlers", ("handler",)),
+)
+BUS_DISPATCH_SECONDS = REGISTRY.register(
+    Histogram("archivebox_bus_dispatch_seconds", "Delay between an abxbus event being emitted and a handler starting on it", ("handler",)),
+)
+FS_SCAN_SECONDS = REGISTRY.register(
+    Histogram("archivebox_fs_scan_seconds", "Time spent scanning plugin output dirs for output file metadata", ("plugin",)),
+)
+RUNNER_PHASE_SECONDS = REGISTRY.register(
+    Histogram("archivebox_runner_phase_seconds", "Time the crawl runner spends in each phase of a run", ("phase",), buckets=HOOK_BUCKETS),
+)
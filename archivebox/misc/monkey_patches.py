@@ -1,11 +1,11 @@
 __package__ = "archivebox"
 
 
+import sys
 import datetime
 import warnings
+from typing import TextIO
 
-import benedict
-from daphne import access
 import django_stubs_ext
 from django.utils import timezone
 
@@ -32,9 +32,18 @@ warnings.filterwarnings("ignore", category=SyntaxWarning, module="sonic")
 
 
 # Make daphne log requests quieter and easier to read
-class ModifiedAccessLogGenerator(access.AccessLogGenerator):
+# (only when daphne is already loaded, i.e. in server processes, importing it costs ~1s on every CLI invocation)
+def patch_daphne_access_log() -> None:
+    from daphne import access
+
+    access.AccessLogGenerator.write_entry = ModifiedAccessLogGenerator.write_entry  # type: ignore
+
+
+class ModifiedAccessLogGenerator:
     """Clutge workaround until daphne uses the Python logging framework. https://github.com/django/daphne/pull/473/files"""
 
+    stream: TextIO
+
     def write_entry(self, host, date, request, status=None, length=None, ident=None, user=None):
 
         # Ignore noisy requests to staticfiles / favicons / etc.
@@ -63,10 +72,6 @@ class ModifiedAccessLogGenerator(access.AccessLogGenerator):
         )
 
 
-access.AccessLogGenerator.write_entry = ModifiedAccessLogGenerator.write_entry  # type: ignore
-
+if "daphne" in sys.modules or "runserver" in sys.argv[:4]:
+    patch_daphne_access_log()
 
-# fix benedict objects to pretty-print/repr more nicely with rich
-# https://stackoverflow.com/a/79048811/2156113
-# https://rich.readthedocs.io/en/stable/pretty.html#rich-repr-protocol
-benedict.benedict.__rich_repr__ = lambda self: (dict(self),)  # type: ignore
@@ -7,10 +7,6 @@ import asyncio
 import posixpath
 import mimetypes
 import importlib
-import queue
-import threading
-import time
-import zipfile
 from datetime import datetime
 from collections.abc import Callable
 from pathlib import Path
@@ -25,6 +21,7 @@ from django.utils.http import http_date
 from django.utils.translation import gettext as _
 from archivebox.config.common import get_config
 from archivebox.misc.logging_util import printable_filesize
+from archivebox.misc.zip_stream import ZipStream
 
 
 _HASHES_CACHE: dict[Path, tuple[float, dict[str, str]]] = {}
@@ -75,35 +72,6 @@ def _safe_zip_stem(name: str) -> str:
     return safe_name or "archivebox"
 
 
-class _StreamingQueueWriter:
-    """Expose a write-only file-like object so zipfile can stream into a queue."""
-
-    def __init__(self, output_queue: queue.Queue[bytes | BaseException | object]) -> None:
-        self.output_queue = output_queue
-        self.position = 0
-
-    def write(self, data: bytes) -> int:
-        if data:
-            self.output_queue.put(data)
-            self.position += len(data)
-        return len(data)
-
-    def tell(self) -> int:
-        return self.position
-
-    def flush(self) -> None:
-        return None
-
-    def close(self) -> None:
-        return None
-
-    def writable(self) -> bool:
-        return True
-
-    def seekable(self) -> bool:
-        return False
-
-
 def _iter_visible_files(root: Path):
     """Yield non-hidden files in a stable order so ZIP output is deterministic."""
 
@@ -114,65 +82,33 @@ def _iter_visible_files(root: Path):
 
 
 def _build_directory_zip_response(
+    request,
     fullpath: Path,
     path: str,
     *,
     is_archive_replay: bool,
     use_async_stream: bool,
-) -> StreamingHttpResponse:
+) -> HttpResponse:
     root_name = _safe_zip_stem(fullpath.name or Path(path).name or "archivebox")
-    sentinel = object()
-    output_queue: queue.Queue[bytes | BaseException | object] = queue.Queue(maxsize=8)
-    initial_chunk_target = 64 * 1024
-    initial_chunk_wait = 0.05
-
-    def build_zip() -> None:
-        # zipfile wants a write-only file object. Feed those bytes straight into
-        # a queue so the response can stream them out as soon as they are ready.
-        writer = _StreamingQueueWriter(output_queue)
+    # already-compressed files (media, WARCs, archives...) are STORED, the rest is deflated in parallel chunks.
+    # If nothing needs deflating the exact archive size is known up-front, so send Content-Length and honor Range.
+    zip_stream = ZipStream.from_directory(fullpath, root_name, _iter_visible_files(fullpath))
+    size = zip_stream.size
+    start, stop = 0, None
+    status = 200
+    if size is not None and "HTTP_RANGE" in request.META:
         try:
-            with zipfile.ZipFile(writer, mode="w", compression=zipfile.ZIP_DEFLATED, compresslevel=6) as zip_file:
-                for entry in _iter_visible_files(fullpath):
-                    rel_parts = entry.relative_to(fullpath).parts
-                    arcname = Path(root_name, *rel_parts).as_posix()
-                    zip_file.write(entry, arcname)
-        except BaseException as err:
-            output_queue.put(err)
-        finally:
-            output_queue.put(sentinel)
-
-    threading.Thread(target=build_zip, name=f"zip-stream-{root_name}", daemon=True).start()
+            ranges = parse_range_header(request.META["HTTP_RANGE"], size)
+        except ValueError:
+            ranges = None
+        if ranges is not None and len(ranges) == 1:
+            start, stop = ranges[0]
+            if stop > size:
+                return HttpResponse(status=416)
+            status = 206
 
     def iter_zip_chunks():
-        # Emit a meaningful first chunk quickly so browsers show the download
-        # immediately instead of waiting on dozens of tiny ZIP header writes.
-        first_chunk = bytearray()
-        initial_deadline = time.monotonic() + initial_chunk_wait
-
-        while True:
-            timeout = max(initial_deadline - time.monotonic(), 0) if len(first_chunk) < initial_chunk_target else None
-            try:
-                chunk = output_queue.get(timeout=timeout) if timeout is not None else output_queue.get()
-            except queue.Empty:
-                if first_chunk:
-                    yield bytes(first_chunk)
-                    first_chunk.clear()
-                    continue
-                chunk = output_queue.get()
-
-            if chunk is sentinel:
-                if first_chunk:
-                    yield bytes(first_chunk)
-                break
-            if isinstance(chunk, BaseException):
-                raise chunk
-            if len(first_chunk) < initial_chunk_target:
-                first_chunk.extend(chunk)
-                if len(first_chunk) >= initial_chunk_target or time.monotonic() >= initial_deadline:
-                    yield bytes(first_chunk)
-                    first_chunk.clear()
-                continue
-            yield chunk
+        return zip_stream.iter_bytes(start, stop)
 
     async def stream_zip_async():
         # Django ASGI buffers sync StreamingHttpResponse iterators by consuming
@@ -188,11 +124,17 @@ def _build_directory_zip_response(
     response = StreamingHttpResponse(
         stream_zip_async() if use_async_stream else iter_zip_chunks(),
         content_type="application/zip",
+        status=status,
     )
     response.headers["Content-Disposition"] = f'attachment; filename="{root_name}.zip"'
     response.headers["Cache-Control"] = f"{_cache_policy()}, max-age=60, stale-while-revalidate=300"
     response.headers["Last-Modified"] = http_date(fullpath.stat().st_mtime)
     response.headers["X-Accel-Buffering"] = "no"
+    if size is not None:
+        response.headers["Accept-Ranges"] = "bytes"
+        response.headers["Content-Length"] = str((stop if stop is not None else size) - start)
+        if status == 206:
+            response.headers["Content-Range"] = "bytes %d-%d/%d" % (start, stop - 1, size)
     return _apply_archive_replay_headers(
         response,
         fullpath=fullpath,
@@ -654,6 +596,7 @@ def serve_static_with_byterange_support(request, path, document_root=None, show_
     if os.access(fullpath, os.R_OK) and fullpath.is_dir():
         if request.GET.get("download") == "zip" and show_indexes:
             return _build_directory_zip_response(
+                request,
                 fullpath,
                 path,
                 is_archive_replay=is_archive_replay,
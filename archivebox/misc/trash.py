@@ -0,0 +1,175 @@
+"""
+Trash area for deleted snapshot output directories.
+
+`archivebox remove --delete` only renames each snapshot folder into a .trash/ dir next to it (an atomic,
+O(1) operation on the same filesystem) once its DB rows are gone, and leaves the slow recursive delete to
+TrashReaper, which runs in the background (`archivebox manage reap_trash`) with a pool of threads.
+
+    ARCHIVE_DIR/.trash/<YYYYMMDDHHMMSS>-<snapshot dir name>/    (USERS_DIR/.trash if USERS_DIR is outside ARCHIVE_DIR)
+
+Reaping is resumable: every entry still in the trash is simply picked up again by the next run, and only
+one reaper can hold the lock on a trash dir at a time. Blobs from the dedupe store that the deleted
+snapshots linked to are pruned after their entry is removed (they are still hardlinked until then).
+"""
+
+__package__ = "archivebox.misc"
+
+import errno
+import fcntl
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
+
+from archivebox.config import CONSTANTS
+
+
+logger = logging.getLogger(__name__)
+
+TRASH_LOCK_FILENAME = ".reaper.lock"
+TRASH_REAPER_WORKERS = 4
+
+
+def get_trash_dirs(config=None) -> list[Path]:
+    from archivebox.config.common import get_config
+
+    config = config or get_config()
+    trash_dirs = [config.ARCHIVE_DIR / CONSTANTS.TRASH_DIR_NAME]
+    if not config.USERS_DIR.is_relative_to(config.ARCHIVE_DIR):
+        trash_dirs.append(config.USERS_DIR / CONSTANTS.TRASH_DIR_NAME)
+    return trash_dirs
+
+
+def get_trash_dir_for(path: Path, config=None) -> Path:
+    """The trash dir on the same filesystem (and under the same root) as a snapshot dir, so moving it there is a rename."""
+    from archivebox.config.common import get_config
+
+    config = config or get_config()
+    if Path(path).is_relative_to(config.USERS_DIR) and not config.USERS_DIR.is_relative_to(config.ARCHIVE_DIR):
+        return config.USERS_DIR / CONSTANTS.TRASH_DIR_NAME
+    return config.ARCHIVE_DIR / CONSTANTS.TRASH_DIR_NAME
+
+
+def move_to_trash(path: Path, config=None) -> Path | None:
+    """Atomically move a directory into the trash, returns its new path (or None if there was nothing to move)."""
+    path = Path(path)
+    if path.is_symlink():
+        path.unlink(missing_ok=True)
+        return None
+    if not path.is_dir():
+        return None
+
+    trash_dir = get_trash_dir_for(path, config)
+    trash_dir.mkdir(parents=True, exist_ok=True)
+    dest = trash_dir / f"{time.strftime('%Y%m%d%H%M%S')}-{path.name}"
+    counter = 1
+    while dest.exists():
+        dest = trash_dir / f"{time.strftime('%Y%m%d%H%M%S')}-{path.name}_{counter}"
+        counter += 1
+
+    try:
+        os.rename(path, dest)
+    except OSError as err:
+        if err.errno != errno.EXDEV:
+            raise
+        # trash dir ended up on another filesystem (e.g. a bind-mounted user dir), can't rename so delete in place
+        shutil.rmtree(path, ignore_errors=True)
+        return None
+    return dest
+
+
+@contextmanager
+def _reaper_lock(trash_dir: Path) -> Iterator[bool]:
+    trash_dir.mkdir(parents=True, exist_ok=True)
+    with open(trash_dir / TRASH_LOCK_FILENAME, "a") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class TrashReaper:
+    """Deletes everything in the trash dirs with a thread pool, see module docstring."""
+
+    def __init__(self, config=None, workers: int = TRASH_REAPER_WORKERS):
+        from archivebox.config.common import get_config
+        from archivebox.misc.blobstore import get_blob_store
+
+        self.config = config or get_config()
+        self.workers = max(1, workers)
+        self.blob_store = get_blob_store(self.config)
+
+    def pending(self) -> list[Path]:
+        """Trash entries left to reclaim, oldest first."""
+        entries = []
+        for trash_dir in get_trash_dirs(self.config):
+            if trash_dir.is_dir():
+                entries += [entry for entry in trash_dir.iterdir() if entry.name != TRASH_LOCK_FILENAME]
+        return sorted(entries, key=lambda entry: entry.name)
+
+    def reap_entry(self, entry: Path) -> int:
+        """Delete one trash entry, returns the number of blob bytes freed from the dedupe store."""
+        digests = self.blob_store.read_manifest(entry) if self.blob_store is not None and entry.is_dir() else set()
+        if entry.is_dir() and not entry.is_symlink():
+            shutil.rmtree(entry)
+        else:
+            entry.unlink(missing_ok=True)
+        return self.blob_store.prune(digests) if digests and self.blob_store is not None else 0
+
+    def reap(self, progress: Callable[[int, int, Path], None] | None = None) -> dict[str, int]:
+        """Reclaim all pending trash entries, calling progress(done, total, entry) after each one."""
+        stats = {"total": 0, "reaped": 0, "failed": 0, "blob_bytes_freed": 0, "locked": 0}
+        for trash_dir in get_trash_dirs(self.config):
+            if not trash_dir.is_dir():
+                continue
+            with _reaper_lock(trash_dir) as acquired:
+                if not acquired:
+                    # another reaper is already working through this trash dir
+                    stats["locked"] += 1
+                    continue
+                entries = sorted((entry for entry in trash_dir.iterdir() if entry.name != TRASH_LOCK_FILENAME), key=lambda entry: entry.name)
+                stats["total"] += len(entries)
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    futures = {pool.submit(self.reap_entry, entry): entry for entry in entries}
+                    for future in as_completed(futures):
+                        entry = futures[future]
+                        try:
+                            stats["blob_bytes_freed"] += future.result()
+                            stats["reaped"] += 1
+                        except Exception as err:
+                            # left in the trash, the next run will try again
+                            stats["failed"] += 1
+                            logger.warning(f"Failed to delete {entry} from the trash: {err}")
+                        if progress is not None:
+                            progress(stats["reaped"] + stats["failed"], stats["total"], entry)
+        return stats
+
+
+def start_trash_reaper() -> subprocess.Popen | None:
+    """Reclaim the trash in a detached background process that outlives the current CLI command."""
+    log_file = CONSTANTS.LOGS_DIR / "trash_reaper.log"
+    try:
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_file, "a") as log:
+            return subprocess.Popen(
+                [sys.executable, "-m", "archivebox", "manage", "reap_trash"],
+                cwd=CONSTANTS.DATA_DIR,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+    except OSError as err:
+        logger.warning(f"Could not start the background trash reaper (run archivebox manage reap_trash manually): {err}")
+        return None
@@ -1,11 +1,9 @@
 __package__ = "archivebox.misc"
 
 import re
-import requests
 import json as pyjson
 import http.cookiejar
 from decimal import Decimal, InvalidOperation
-from dateparser import parse as dateparser
 
 from typing import Any
 from collections.abc import Callable
@@ -16,7 +14,6 @@ from hashlib import sha256
 from urllib.parse import urlparse, quote, unquote
 from html import escape, unescape
 from datetime import datetime, timezone
-from requests.exceptions import RequestException, ReadTimeout
 
 from base32_crockford import encode as base32_encode
 from w3lib.encoding import html_body_declared_encoding, http_content_type_encoding
@@ -395,6 +392,8 @@ def parse_date(date: Any) -> datetime | None:
         except ValueError:
             pass
 
+        from dateparser import parse as dateparser  # slow to import (~0.5s), only needed for non-ISO dates
+
         parsed_date = dateparser(normalized, settings={"TIMEZONE": "UTC"})
         if parsed_date is None:
             raise ValueError(f"Tried to parse invalid date string! {date}")
@@ -407,6 +406,8 @@ def parse_date(date: Any) -> datetime | None:
 def download_url(url: str, timeout: int | None = None, config=None, **config_kwargs) -> str:
     """Download the contents of a remote url and return the text"""
 
+    import requests
+
     from archivebox.config.common import get_config
 
     config = config or get_config(**config_kwargs)
@@ -445,6 +446,9 @@ def get_headers(url: str, timeout: int | None = None, config=None, **config_kwar
     """Download the contents of a remote url and return the headers"""
     # TODO: get rid of this and use an abx pluggy hook instead
 
+    import requests
+    from requests.exceptions import RequestException, ReadTimeout
+
     from archivebox.config.common import get_config
 
     config = config or get_config(**config_kwargs)
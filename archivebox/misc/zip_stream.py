@@ -0,0 +1,411 @@
+"""
+Streaming ZIP writer for directory downloads.
+
+Files that are already compressed (images, audio/video, archives, WARCs, fonts...) are STORED as-is,
+everything else is deflated in independent 1MB chunks across a small thread pool (zlib releases the GIL),
+pigz-style: each chunk ends on a byte-aligned sync flush so the chunks concatenate into one valid deflate stream.
+
+Every entry is written with a trailing data descriptor so nothing has to be known before its bytes are sent.
+When every entry is STORED the whole archive layout is known up-front from the file sizes alone, so the exact
+archive size can be sent as Content-Length and any byte range can be produced without building what comes before it.
+"""
+
+__package__ = "archivebox.misc"
+
+import os
+import struct
+import time
+import zlib
+import mimetypes
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP_FILECOUNT_LIMIT = 0xFFFF
+
+DEFLATE_LEVEL = 6
+DEFLATE_CHUNK_SIZE = 1024 * 1024
+DEFLATE_WORKERS = min(4, os.cpu_count() or 1)
+OUTPUT_CHUNK_SIZE = 64 * 1024
+READ_BLOCK_SIZE = 1024 * 1024
+
+INCOMPRESSIBLE_MIMETYPE_PREFIXES = ("image/", "video/", "audio/", "font/")
+COMPRESSIBLE_MIMETYPES = {"image/svg+xml", "image/bmp", "image/x-ms-bmp", "image/x-icon", "image/vnd.microsoft.icon", "font/ttf", "font/otf"}
+INCOMPRESSIBLE_MIMETYPES = {
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-bzip2",
+    "application/x-xz",
+    "application/zstd",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/vnd.rar",
+    "application/epub+zip",
+    "application/java-archive",
+    "application/pdf",
+    "application/wasm",
+}
+INCOMPRESSIBLE_SUFFIXES = {".gz", ".tgz", ".bz2", ".xz", ".zst", ".br", ".zip", ".wacz", ".7z", ".rar", ".woff", ".woff2", ".webm", ".mkv", ".webp", ".avif"}
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_DATA_DESCRIPTOR = struct.Struct("<IIII")
+_DATA_DESCRIPTOR64 = struct.Struct("<IIQQ")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_ZIP64_END = struct.Struct("<IQHHIIQQQQ")
+_ZIP64_LOCATOR = struct.Struct("<IIQI")
+_END = struct.Struct("<IHHHHIIH")
+
+_FLAGS = 0x08 | 0x800  # sizes + crc in a trailing data descriptor, utf-8 filenames
+_VERSION = 45  # zip64 capable
+_VERSION_MADE_BY = (3 << 8) | _VERSION  # unix
+
+
+def is_incompressible(path: str | Path) -> bool:
+    """Guess whether deflating a file would be wasted CPU because its format is already compressed."""
+    name = str(path).lower()
+    if Path(name).suffix in INCOMPRESSIBLE_SUFFIXES:
+        return True
+    mimetype, encoding = mimetypes.guess_type(name)
+    if encoding:
+        return True
+    if not mimetype or mimetype in COMPRESSIBLE_MIMETYPES:
+        return False
+    return mimetype in INCOMPRESSIBLE_MIMETYPES or mimetype.startswith(INCOMPRESSIBLE_MIMETYPE_PREFIXES)
+
+
+@lru_cache(maxsize=65536)
+def _cached_file_crc32(filepath: str, size: int, mtime_ns: int) -> int:
+    """CRC32 of a file, cached by path, size and mtime so resumed range requests don't re-read everything."""
+    crc = 0
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_BLOCK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _dos_datetime(mtime: float) -> tuple[int, int]:
+    year, month, day, hour, minute, second = time.localtime(mtime)[:6]
+    if year < 1980:
+        year, month, day, hour, minute, second = 1980, 1, 1, 0, 0, 0
+    return (year - 1980) << 9 | month << 5 | day, hour << 11 | minute << 5 | second // 2
+
+
+@dataclass
+class ZipEntry:
+    path: Path
+    arcname: str
+    size: int
+    mtime_ns: int
+    mode: int
+    method: int
+
+    @property
+    def name_bytes(self) -> bytes:
+        return self.arcname.encode("utf-8")
+
+    def crc32(self) -> int:
+        return _cached_file_crc32(str(self.path), self.size, self.mtime_ns)
+
+
+@dataclass
+class _WrittenEntry:
+    entry: ZipEntry
+    offset: int
+    compressed_size: int
+    size: int
+    crc: int | None = None
+
+    def get_crc(self) -> int:
+        # STORED entries skipped over by a range request never get read, compute (and cache) their CRC on demand
+        if self.crc is None:
+            self.crc = self.entry.crc32()
+        return self.crc
+
+
+class ZipStream:
+    """A ZIP archive of a list of files, produced on the fly as an iterator of byte chunks."""
+
+    def __init__(self, entries: list[ZipEntry]):
+        self.entries = entries
+
+    @classmethod
+    def from_directory(cls, root: Path, arcroot: str, paths: Iterable[Path]) -> "ZipStream":
+        entries = []
+        for path in paths:
+            stat_result = path.stat()
+            entries.append(
+                ZipEntry(
+                    path=path,
+                    arcname=Path(arcroot, *path.relative_to(root).parts).as_posix(),
+                    size=stat_result.st_size,
+                    mtime_ns=stat_result.st_mtime_ns,
+                    mode=stat_result.st_mode,
+                    method=ZIP_STORED if is_incompressible(path) else ZIP_DEFLATED,
+                ),
+            )
+        return cls(entries)
+
+    @property
+    def all_stored(self) -> bool:
+        return all(entry.method == ZIP_STORED for entry in self.entries)
+
+    @property
+    def size(self) -> int | None:
+        """Exact archive size in bytes, only known up-front when every entry is STORED."""
+        if not self.all_stored:
+            return None
+        return sum(length for length, _render in self._stored_segments())
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self.iter_bytes()
+
+    def iter_bytes(self, start: int = 0, stop: int | None = None) -> Iterator[bytes]:
+        """Yield the archive bytes in [start, stop), ranges other than the whole archive need all_stored."""
+        if self.all_stored:
+            return _coalesce(self._iter_stored(start, stop))
+        if start or stop is not None:
+            raise ValueError("Byte ranges are only supported for archives where every entry is STORED")
+        return _coalesce(self._iter_deflated())
+
+    # Every entry STORED: offsets are a pure function of the file sizes
+
+    def _stored_segments(self) -> Iterator[tuple[int, Callable[[int, int], Iterator[bytes]]]]:
+        written: list[_WrittenEntry] = []
+        offset = 0
+        for entry in self.entries:
+            name = entry.name_bytes
+            header = _local_header(entry, name)
+            written_entry = _WrittenEntry(entry=entry, offset=offset, compressed_size=entry.size, size=entry.size)
+            written.append(written_entry)
+            yield len(header), _const(header)
+            yield entry.size, _file_range(written_entry)
+            descriptor_size = _DATA_DESCRIPTOR64.size if _needs_zip64(entry.size, entry.size) else _DATA_DESCRIPTOR.size
+            yield descriptor_size, _lazy(lambda written_entry=written_entry: _data_descriptor(written_entry))
+            offset += len(header) + entry.size + descriptor_size
+
+        central_offset = offset
+        for written_entry in written:
+            central_size = _central_header_size(written_entry)
+            yield central_size, _lazy(lambda written_entry=written_entry: _central_header(written_entry))
+            offset += central_size
+        end = _end_records(len(written), offset - central_offset, central_offset)
+        yield len(end), _const(end)
+
+    def _iter_stored(self, start: int, stop: int | None) -> Iterator[bytes]:
+        position = 0
+        for length, render in self._stored_segments():
+            segment_start, position = position, position + length
+            if position <= start:
+                continue
+            if stop is not None and segment_start >= stop:
+                break
+            lo = max(start - segment_start, 0)
+            hi = length if stop is None else min(stop - segment_start, length)
+            yield from render(lo, hi)
+
+    # Some entries DEFLATED: compress chunks in parallel, offsets are only known as we go
+
+    def _iter_deflated(self) -> Iterator[bytes]:
+        written: list[_WrittenEntry] = []
+        offset = 0
+        pending: deque[tuple[ZipEntry, bool, bool, Future[tuple[bytes, bytes]]]] = deque()
+        chunks = _iter_entry_chunks(self.entries)
+        executor = ThreadPoolExecutor(max_workers=DEFLATE_WORKERS, thread_name_prefix="zip-deflate")
+        current: _WrittenEntry | None = None
+        try:
+            while True:
+                while len(pending) < DEFLATE_WORKERS * 2:
+                    task = next(chunks, None)
+                    if task is None:
+                        break
+                    entry, chunk_offset, is_first, is_last = task
+                    pending.append((entry, is_first, is_last, executor.submit(_read_chunk, entry, chunk_offset, is_last)))
+                if not pending:
+                    break
+
+                entry, is_first, is_last, future = pending.popleft()
+                raw, data = future.result()
+                if is_first:
+                    header = _local_header(entry, entry.name_bytes)
+                    current = _WrittenEntry(entry=entry, offset=offset, compressed_size=0, size=0, crc=0)
+                    offset += len(header)
+                    yield header
+                assert current is not None
+                current.crc = zlib.crc32(raw, current.get_crc())
+                current.size += len(raw)
+                current.compressed_size += len(data)
+                offset += len(data)
+                yield data
+                if is_last:
+                    descriptor = _data_descriptor(current)
+                    offset += len(descriptor)
+                    yield descriptor
+                    written.append(current)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        central_offset = offset
+        for written_entry in written:
+            central = _central_header(written_entry)
+            offset += len(central)
+            yield central
+        yield _end_records(len(written), offset - central_offset, central_offset)
+
+
+def _needs_zip64(compressed_size: int, size: int) -> bool:
+    return compressed_size >= ZIP64_LIMIT or size >= ZIP64_LIMIT
+
+
+def _local_header(entry: ZipEntry, name: bytes) -> bytes:
+    dosdate, dostime = _dos_datetime(entry.mtime_ns / 1e9)
+    return _LOCAL_HEADER.pack(0x04034B50, _VERSION, _FLAGS, entry.method, dostime, dosdate, 0, 0, 0, len(name), 0) + name
+
+
+def _data_descriptor(written: _WrittenEntry) -> bytes:
+    if _needs_zip64(written.compressed_size, written.size):
+        return _DATA_DESCRIPTOR64.pack(0x08074B50, written.get_crc(), written.compressed_size, written.size)
+    return _DATA_DESCRIPTOR.pack(0x08074B50, written.get_crc(), written.compressed_size, written.size)
+
+
+def _zip64_extra(written: _WrittenEntry) -> bytes:
+    fields = b""
+    if _needs_zip64(written.compressed_size, written.size):
+        fields += struct.pack("<QQ", written.size, written.compressed_size)
+    if written.offset >= ZIP64_LIMIT:
+        fields += struct.pack("<Q", written.offset)
+    return struct.pack("<HH", 0x0001, len(fields)) + fields if fields else b""
+
+
+def _central_header_size(written: _WrittenEntry) -> int:
+    extra_size = (16 if _needs_zip64(written.compressed_size, written.size) else 0) + (8 if written.offset >= ZIP64_LIMIT else 0)
+    return _CENTRAL_HEADER.size + len(written.entry.name_bytes) + (4 + extra_size if extra_size else 0)
+
+
+def _central_header(written: _WrittenEntry) -> bytes:
+    entry = written.entry
+    name = entry.name_bytes
+    extra = _zip64_extra(written)
+    sizes_zip64 = _needs_zip64(written.compressed_size, written.size)
+    dosdate, dostime = _dos_datetime(entry.mtime_ns / 1e9)
+    return (
+        _CENTRAL_HEADER.pack(
+            0x02014B50,
+            _VERSION_MADE_BY,
+            _VERSION,
+            _FLAGS,
+            entry.method,
+            dostime,
+            dosdate,
+            written.get_crc(),
+            0xFFFFFFFF if sizes_zip64 else written.compressed_size,
+            0xFFFFFFFF if sizes_zip64 else written.size,
+            len(name),
+            len(extra),
+            0,
+            0,
+            0,
+            (entry.mode & 0xFFFF) << 16,
+            0xFFFFFFFF if written.offset >= ZIP64_LIMIT else written.offset,
+        )
+        + name
+        + extra
+    )
+
+
+def _end_records(count: int, central_size: int, central_offset: int) -> bytes:
+    records = b""
+    if count >= ZIP_FILECOUNT_LIMIT or central_size >= ZIP64_LIMIT or central_offset >= ZIP64_LIMIT:
+        zip64_end_offset = central_offset + central_size
+        records += _ZIP64_END.pack(0x06064B50, _ZIP64_END.size - 12, _VERSION_MADE_BY, _VERSION, 0, 0, count, count, central_size, central_offset)
+        records += _ZIP64_LOCATOR.pack(0x07064B50, 0, zip64_end_offset, 1)
+    return records + _END.pack(
+        0x06054B50,
+        0,
+        0,
+        min(count, ZIP_FILECOUNT_LIMIT),
+        min(count, ZIP_FILECOUNT_LIMIT),
+        min(central_size, 0xFFFFFFFF),
+        min(central_offset, 0xFFFFFFFF),
+        0,
+    )
+
+
+def _const(data: bytes) -> Callable[[int, int], Iterator[bytes]]:
+    def render(lo: int, hi: int) -> Iterator[bytes]:
+        yield data[lo:hi]
+
+    return render
+
+
+def _lazy(build: Callable[[], bytes]) -> Callable[[int, int], Iterator[bytes]]:
+    def render(lo: int, hi: int) -> Iterator[bytes]:
+        yield build()[lo:hi]
+
+    return render
+
+
+def _file_range(written: _WrittenEntry) -> Callable[[int, int], Iterator[bytes]]:
+    def render(lo: int, hi: int) -> Iterator[bytes]:
+        entry = written.entry
+        # when the whole file is sent, CRC it on the way through instead of reading it twice
+        crc = 0 if lo == 0 and hi == entry.size and written.crc is None else None
+        with open(entry.path, "rb") as f:
+            f.seek(lo)
+            remaining = hi - lo
+            while remaining > 0:
+                data = f.read(min(READ_BLOCK_SIZE, remaining))
+                if not data:
+                    raise OSError(f"{entry.path} shrank while it was being zipped")
+                remaining -= len(data)
+                if crc is not None:
+                    crc = zlib.crc32(data, crc)
+                yield data
+        if crc is not None:
+            written.crc = crc
+
+    return render
+
+
+def _iter_entry_chunks(entries: list[ZipEntry]) -> Iterator[tuple[ZipEntry, int, bool, bool]]:
+    for entry in entries:
+        chunk_offset = 0
+        while True:
+            is_last = chunk_offset + DEFLATE_CHUNK_SIZE >= entry.size
+            yield entry, chunk_offset, chunk_offset == 0, is_last
+            if is_last:
+                break
+            chunk_offset += DEFLATE_CHUNK_SIZE
+
+
+def _read_chunk(entry: ZipEntry, chunk_offset: int, is_last: bool) -> tuple[bytes, bytes]:
+    with open(entry.path, "rb") as f:
+        f.seek(chunk_offset)
+        raw = f.read(DEFLATE_CHUNK_SIZE)
+    if entry.method == ZIP_STORED:
+        return raw, raw
+    compressor = zlib.compressobj(DEFLATE_LEVEL, zlib.DEFLATED, -15)
+    return raw, compressor.compress(raw) + compressor.flush(zlib.Z_FINISH if is_last else zlib.Z_SYNC_FLUSH)
+
+
+def _coalesce(pieces: Iterable[bytes]) -> Iterator[bytes]:
+    """Merge the many tiny header writes into OUTPUT_CHUNK_SIZE chunks so the response isn't flooded with small sends."""
+    buffer = bytearray()
+    for piece in pieces:
+        if not buffer and len(piece) >= OUTPUT_CHUNK_SIZE:
+            yield piece
+            continue
+        buffer += piece
+        if len(buffer) >= OUTPUT_CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
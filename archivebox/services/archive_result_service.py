@@ -13,6 +13,8 @@ from abx_dl.events import ArchiveResultEvent, ProcessCompletedEvent, ProcessStar
 from abx_dl.output_files import guess_mimetype
 from abx_dl.services.base import BaseService
 
+from archivebox.misc.metrics import EXTRACTOR_OUTPUT_BYTES, FS_SCAN_SECONDS, track_handler
+
 from .process_service import parse_event_datetime
 
 
@@ -189,6 +191,22 @@ def _has_content_files(output_files: Any) -> bool:
     return any(Path(path).suffix not in {".log", ".pid", ".sh"} for path in _normalize_output_files(output_files))
 
 
+def _dedupe_output_files(plugin_dir: Path, output_files: dict[str, dict]) -> None:
+    from archivebox.misc.blobstore import DEDUPE_EXCLUDE_NAMES, get_blob_store
+
+    blob_store = get_blob_store()
+    if blob_store is None:
+        return
+    paths = [
+        plugin_dir / relative_path
+        for relative_path in output_files
+        if ".." not in Path(relative_path).parts
+        and Path(relative_path).name not in DEDUPE_EXCLUDE_NAMES
+        and not Path(relative_path).name.startswith(".")
+    ]
+    blob_store.dedupe_files(plugin_dir.parent, paths)
+
+
 def _iter_archiveresult_records(stdout: str) -> list[dict]:
     records: list[dict] = []
     for raw_line in stdout.splitlines():
@@ -213,6 +231,7 @@ class ArchiveResultService(BaseService):
         self.bus.on(ArchiveResultEvent, self.on_ArchiveResultEvent__save_to_db)
         self.bus.on(ProcessCompletedEvent, self.on_ProcessCompletedEvent__save_to_db)
 
+    @track_handler
     async def on_ArchiveResultEvent__save_to_db(self, event: ArchiveResultEvent) -> None:
         from archivebox.core.models import ArchiveResult, Snapshot
         from archivebox.machine.models import Process
@@ -221,7 +240,8 @@ class ArchiveResultService(BaseService):
         if snapshot is None:
             return
         plugin_dir = Path(snapshot.output_dir) / event.plugin
-        output_files, output_size, output_mimetypes = await sync_to_async(_resolve_output_metadata)(event.output_files, plugin_dir)
+        with FS_SCAN_SECONDS.time(plugin=event.plugin):
+            output_files, output_size, output_mimetypes = await sync_to_async(_resolve_output_metadata)(event.output_files, plugin_dir)
         process_started = await self.bus.find(
             ProcessStartedEvent,
             past=True,
@@ -266,12 +286,18 @@ class ArchiveResultService(BaseService):
             defaults=defaults,
         )
 
+        if output_size:
+            EXTRACTOR_OUTPUT_BYTES.inc(output_size, plugin=event.plugin)
+        if result.status == ArchiveResult.StatusChoices.SUCCEEDED and output_files:
+            await sync_to_async(_dedupe_output_files)(plugin_dir, output_files)
+
         if result.status in (ArchiveResult.StatusChoices.SUCCEEDED, ArchiveResult.StatusChoices.NORESULTS):
             next_title = _extract_snapshot_title(str(snapshot.output_dir), event.plugin, result.output_str, snapshot_url=snapshot.url)
             if next_title and _should_update_snapshot_title(snapshot.title or "", next_title, snapshot_url=snapshot.url):
                 snapshot.title = next_title
                 await snapshot.asave(update_fields=["title", "modified_at"])
 
+    @track_handler
     async def on_ProcessCompletedEvent__save_to_db(self, event: ProcessCompletedEvent) -> None:
         if not event.hook_name.startswith("on_Snapshot"):
             return
@@ -5,6 +5,8 @@ from asgiref.sync import sync_to_async
 from abx_dl.events import BinaryRequestEvent, BinaryEvent
 from abx_dl.services.base import BaseService
 
+from archivebox.misc.metrics import track_handler
+
 
 class BinaryService(BaseService):
     LISTENS_TO = [BinaryRequestEvent, BinaryEvent]
@@ -15,6 +17,7 @@ class BinaryService(BaseService):
         self.bus.on(BinaryRequestEvent, self.on_BinaryRequestEvent)
         self.bus.on(BinaryEvent, self.on_BinaryEvent)
 
+    @track_handler
     async def on_BinaryRequestEvent(self, event: BinaryRequestEvent) -> str | None:
         from archivebox.machine.models import Binary, Machine
 
@@ -75,6 +78,7 @@ class BinaryService(BaseService):
             return binary_event.abspath
         return None
 
+    @track_handler
     async def on_BinaryEvent(self, event: BinaryEvent) -> None:
         from archivebox.machine.models import Binary, Machine
 
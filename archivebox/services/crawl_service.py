@@ -5,6 +5,8 @@ from django.utils import timezone
 from abx_dl.events import CrawlCleanupEvent, CrawlCompletedEvent, CrawlSetupEvent, CrawlStartEvent
 from abx_dl.services.base import BaseService
 
+from archivebox.misc.metrics import track_handler
+
 
 class CrawlService(BaseService):
     LISTENS_TO = [CrawlSetupEvent, CrawlStartEvent, CrawlCleanupEvent, CrawlCompletedEvent]
@@ -18,6 +20,7 @@ class CrawlService(BaseService):
         self.bus.on(CrawlCleanupEvent, self.on_CrawlCleanupEvent__save_to_db)
         self.bus.on(CrawlCompletedEvent, self.on_CrawlCompletedEvent__save_to_db)
 
+    @track_handler
     async def on_CrawlSetupEvent__save_to_db(self, event: CrawlSetupEvent) -> None:
         from archivebox.crawls.models import Crawl
 
@@ -27,6 +30,7 @@ class CrawlService(BaseService):
         crawl.retry_at = None
         await crawl.asave(update_fields=["status", "retry_at", "modified_at"])
 
+    @track_handler
     async def on_CrawlStartEvent__save_to_db(self, event: CrawlStartEvent) -> None:
         from archivebox.crawls.models import Crawl
 
@@ -36,6 +40,7 @@ class CrawlService(BaseService):
         crawl.retry_at = None
         await crawl.asave(update_fields=["status", "retry_at", "modified_at"])
 
+    @track_handler
     async def on_CrawlCleanupEvent__save_to_db(self, event: CrawlCleanupEvent) -> None:
         from archivebox.crawls.models import Crawl
         from archivebox.core.models import Snapshot
@@ -54,6 +59,7 @@ class CrawlService(BaseService):
             crawl.retry_at = None
         await crawl.asave(update_fields=["status", "retry_at", "modified_at"])
 
+    @track_handler
     async def on_CrawlCompletedEvent__save_to_db(self, event: CrawlCompletedEvent) -> None:
         from archivebox.crawls.models import Crawl
         from archivebox.core.models import Snapshot
@@ -5,6 +5,8 @@ from asgiref.sync import sync_to_async
 from abx_dl.events import MachineEvent
 from abx_dl.services.base import BaseService
 
+from archivebox.misc.metrics import track_handler
+
 
 class MachineService(BaseService):
     LISTENS_TO = [MachineEvent]
@@ -14,6 +16,7 @@ class MachineService(BaseService):
         super().__init__(bus)
         self.bus.on(MachineEvent, self.on_MachineEvent__save_to_db)
 
+    @track_handler
     async def on_MachineEvent__save_to_db(self, event: MachineEvent) -> None:
         from archivebox.machine.models import Machine, _sanitize_machine_config
 
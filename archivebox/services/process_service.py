@@ -10,6 +10,8 @@ from abxbus import BaseEvent
 from abx_dl.events import ProcessCompletedEvent, ProcessStartedEvent
 from abx_dl.services.base import BaseService
 
+from archivebox.misc.metrics import HOOK_DURATION_SECONDS, track_handler
+
 
 def parse_event_datetime(value: str | None):
     if not value:
@@ -39,6 +41,7 @@ class ProcessService(BaseService):
         self.bus.on(ProcessStartedEvent, self.on_ProcessStartedEvent__save_to_db)
         self.bus.on(ProcessCompletedEvent, self.on_ProcessCompletedEvent__save_to_db)
 
+    @track_handler
     async def on_ProcessStartedEvent__save_to_db(self, event: ProcessStartedEvent) -> None:
         from archivebox.machine.models import Process
 
@@ -98,6 +101,7 @@ class ProcessService(BaseService):
         )
         await process.asave()
 
+    @track_handler
     async def on_ProcessCompletedEvent__save_to_db(self, event: ProcessCompletedEvent) -> None:
         from archivebox.machine.models import Process
 
@@ -160,3 +164,8 @@ class ProcessService(BaseService):
             hook_path=event.hook_path,
         )
         await process.asave()
+        HOOK_DURATION_SECONDS.observe(
+            max((process.ended_at - started_at).total_seconds(), 0.0),
+            plugin=event.plugin_name,
+            outcome="ok" if event.exit_code == 0 else "error",
+        )
@@ -53,6 +53,7 @@ from abxbus.event_bus import EventBus, get_current_event, in_handler_context
 from abxbus.event_handler import EventHandlerAbortedError, EventHandlerCancelledError
 
 from archivebox.config.configset import BaseConfigSet
+from archivebox.misc.metrics import CLAIM_SECONDS, RUNNER_PHASE_SECONDS
 from archivebox.search.sonic_daemon import register_sonic_daemon_event_handler
 
 from .archive_result_service import ArchiveResultService
@@ -174,6 +175,8 @@ def ensure_background_runner(*, allow_under_pytest: bool = False) -> bool:
 
 class CrawlRunner:
     MAX_CONCURRENT_SNAPSHOTS = 8
+    LEASE_SECONDS = 60
+    LEASE_RENEW_INTERVAL = 10
 
     def __init__(
         self,
@@ -217,6 +220,7 @@ class CrawlRunner:
         self.root_crawl_event_id: str | None = None
         self.root_crawl_start_event_id: str | None = None
         self._skip_wait_until_idle = False
+        self.lease_owner = None
 
     async def crawl_is_cancelled(self) -> bool:
         from archivebox.crawls.models import Crawl
@@ -242,8 +246,11 @@ class CrawlRunner:
             crawl_id=str(self.crawl.id),
         )
         root_snapshot_id: str | None = None
+        lease_task: asyncio.Task[None] | None = None
         try:
-            snapshot_ids = await sync_to_async(self.load_run_state, thread_sensitive=True)()
+            with RUNNER_PHASE_SECONDS.time(phase="load_run_state"):
+                snapshot_ids = await sync_to_async(self.load_run_state, thread_sensitive=True)()
+            lease_task = asyncio.create_task(self.renew_leases())
             live_ui = self._create_live_ui()
             with live_ui if live_ui is not None else nullcontext():
                 await heartbeat.start()
@@ -257,18 +264,46 @@ class CrawlRunner:
                 )
                 if snapshot_ids:
                     root_snapshot_id = snapshot_ids[0]
-                    await self.run_crawl(root_snapshot_id, snapshot_ids)
+                    with RUNNER_PHASE_SECONDS.time(phase="run_crawl"):
+                        await self.run_crawl(root_snapshot_id, snapshot_ids)
         finally:
             await heartbeat.stop()
+            if lease_task is not None:
+                lease_task.cancel()
             if not self._skip_wait_until_idle:
-                await self.bus.wait_until_idle()
+                with RUNNER_PHASE_SECONDS.time(phase="wait_until_idle"):
+                    await self.bus.wait_until_idle()
             if self._live_stream is not None:
                 try:
                     self._live_stream.close()
                 except Exception:
                     pass
                 self._live_stream = None
-            await sync_to_async(self.finalize_run_state, thread_sensitive=True)()
+            try:
+                with RUNNER_PHASE_SECONDS.time(phase="finalize_run_state"):
+                    await sync_to_async(self.finalize_run_state, thread_sensitive=True)()
+            finally:
+                await sync_to_async(self.release_lease, thread_sensitive=True)("crawl", str(self.crawl.id))
+
+    def acquire_lease(self, object_type: str, object_id: str) -> None:
+        from archivebox.machine.models import ProcessLease
+
+        if self.lease_owner is not None:
+            ProcessLease.objects.acquire(object_type, object_id, owner=self.lease_owner, ttl=self.LEASE_SECONDS)
+
+    def release_lease(self, object_type: str, object_id: str) -> None:
+        from archivebox.machine.models import ProcessLease
+
+        if self.lease_owner is not None:
+            ProcessLease.objects.release(object_type, object_id, owner=self.lease_owner)
+
+    async def renew_leases(self) -> None:
+        from archivebox.machine.models import ProcessLease
+
+        while True:
+            await asyncio.sleep(self.LEASE_RENEW_INTERVAL)
+            if self.lease_owner is not None:
+                await sync_to_async(ProcessLease.objects.renew, thread_sensitive=True)(self.lease_owner, ttl=self.LEASE_SECONDS)
 
     async def enqueue_snapshot(self, snapshot_id: str) -> None:
         task = self.snapshot_tasks.get(snapshot_id)
@@ -360,6 +395,10 @@ class CrawlRunner:
             current_process.iface = current_iface
             current_process.machine = current_iface.machine
             current_process.save(update_fields=["iface", "machine", "modified_at"])
+        # lease the crawl to this process so recover_orphaned_crawls() leaves it alone while we're alive
+        if isinstance(current_process, Process):
+            self.lease_owner = current_process
+            self.acquire_lease("crawl", str(self.crawl.id))
         self.persona = self.crawl.resolve_persona()
         self.base_config = get_config(crawl=self.crawl)
         self.derived_config = _sanitize_machine_config(Machine.current().config)
@@ -730,60 +769,67 @@ class CrawlRunner:
 
     async def run_snapshot(self, snapshot_id: str) -> None:
         async with self.snapshot_semaphore:
-            crawl_start_event = get_current_event()
-            if not isinstance(crawl_start_event, CrawlStartEvent):
-                raise RuntimeError("Snapshot events must be emitted from a CrawlStartEvent handler")
-            snapshot = await sync_to_async(self.load_snapshot_payload, thread_sensitive=True)(snapshot_id)
-            if snapshot["status"] == "sealed":
-                return
-            if snapshot["depth"] > 0 and CrawlLimitState.from_config(snapshot["config"]).get_stop_reason() == "max_size":
-                await sync_to_async(self.seal_snapshot_due_to_limit, thread_sensitive=True)(snapshot_id)
-                return
-            config = _normalize_runtime_config(snapshot["config"])
-            derived_config = _normalize_runtime_config(self.derived_config)
-            output_dir = Path(snapshot["output_dir"])
-            plugins = self.runtime_plugins()
-            abx_snapshot = AbxSnapshot(
-                id=snapshot["id"],
-                url=snapshot["url"],
-                depth=int(snapshot["depth"]),
-                crawl_id=str(self.crawl.id),
-            )
-            snapshot_hooks = [(plugin, hook) for plugin in plugins.values() for hook in plugin.filter_hooks("Snapshot")]
-            snapshot_phase_timeout = compute_phase_timeout(snapshot_hooks, config)
-            await _emit_machine_config(self.bus, config=config, derived_config=derived_config, parent_event=crawl_start_event)
-            HookSnapshotService(
-                self.bus,
-                url=snapshot["url"],
-                snapshot=abx_snapshot,
-                output_dir=output_dir,
-                plugins=plugins,
-                snapshot_phase_timeout=snapshot_phase_timeout,
-                snapshot_cleanup_enabled=True,
-                snapshot_cleanup_phase_timeout=snapshot_phase_timeout,
-                abort_requested=self.crawl_is_cancelled,
-            )
-            snapshot_event = SnapshotEvent(
-                url=snapshot["url"],
-                snapshot_id=snapshot["id"],
-                output_dir=str(output_dir),
-                depth=int(snapshot["depth"]),
-                event_timeout=snapshot_phase_timeout,
-                event_handler_slow_timeout=slow_warning_timeout(snapshot_phase_timeout),
-            )
-            emitted_snapshot_event = crawl_start_event.emit(snapshot_event)
-            await _run_event_now(emitted_snapshot_event, snapshot_phase_timeout)
-            completed_snapshot = await self.bus.find(
-                SnapshotCompletedEvent,
-                child_of=emitted_snapshot_event,
-                past=True,
-                future=snapshot_phase_timeout,
-            )
-            if completed_snapshot is None:
-                raise RuntimeError(f"Snapshot {snapshot_id} did not complete")
-            await completed_snapshot.wait(timeout=snapshot_phase_timeout)
-            await completed_snapshot.event_results_list()
-            await self.enqueue_discovered_snapshots_from_outputs(snapshot)
+            await sync_to_async(self.acquire_lease, thread_sensitive=True)("snapshot", snapshot_id)
+            try:
+                await self._run_snapshot(snapshot_id)
+            finally:
+                await sync_to_async(self.release_lease, thread_sensitive=True)("snapshot", snapshot_id)
+
+    async def _run_snapshot(self, snapshot_id: str) -> None:
+        crawl_start_event = get_current_event()
+        if not isinstance(crawl_start_event, CrawlStartEvent):
+            raise RuntimeError("Snapshot events must be emitted from a CrawlStartEvent handler")
+        snapshot = await sync_to_async(self.load_snapshot_payload, thread_sensitive=True)(snapshot_id)
+        if snapshot["status"] == "sealed":
+            return
+        if snapshot["depth"] > 0 and CrawlLimitState.from_config(snapshot["config"]).get_stop_reason() == "max_size":
+            await sync_to_async(self.seal_snapshot_due_to_limit, thread_sensitive=True)(snapshot_id)
+            return
+        config = _normalize_runtime_config(snapshot["config"])
+        derived_config = _normalize_runtime_config(self.derived_config)
+        output_dir = Path(snapshot["output_dir"])
+        plugins = self.runtime_plugins()
+        abx_snapshot = AbxSnapshot(
+            id=snapshot["id"],
+            url=snapshot["url"],
+            depth=int(snapshot["depth"]),
+            crawl_id=str(self.crawl.id),
+        )
+        snapshot_hooks = [(plugin, hook) for plugin in plugins.values() for hook in plugin.filter_hooks("Snapshot")]
+        snapshot_phase_timeout = compute_phase_timeout(snapshot_hooks, config)
+        await _emit_machine_config(self.bus, config=config, derived_config=derived_config, parent_event=crawl_start_event)
+        HookSnapshotService(
+            self.bus,
+            url=snapshot["url"],
+            snapshot=abx_snapshot,
+            output_dir=output_dir,
+            plugins=plugins,
+            snapshot_phase_timeout=snapshot_phase_timeout,
+            snapshot_cleanup_enabled=True,
+            snapshot_cleanup_phase_timeout=snapshot_phase_timeout,
+            abort_requested=self.crawl_is_cancelled,
+        )
+        snapshot_event = SnapshotEvent(
+            url=snapshot["url"],
+            snapshot_id=snapshot["id"],
+            output_dir=str(output_dir),
+            depth=int(snapshot["depth"]),
+            event_timeout=snapshot_phase_timeout,
+            event_handler_slow_timeout=slow_warning_timeout(snapshot_phase_timeout),
+        )
+        emitted_snapshot_event = crawl_start_event.emit(snapshot_event)
+        await _run_event_now(emitted_snapshot_event, snapshot_phase_timeout)
+        completed_snapshot = await self.bus.find(
+            SnapshotCompletedEvent,
+            child_of=emitted_snapshot_event,
+            past=True,
+            future=snapshot_phase_timeout,
+        )
+        if completed_snapshot is None:
+            raise RuntimeError(f"Snapshot {snapshot_id} did not complete")
+        await completed_snapshot.wait(timeout=snapshot_phase_timeout)
+        await completed_snapshot.event_results_list()
+        await self.enqueue_discovered_snapshots_from_outputs(snapshot)
 
     def seal_snapshot_due_to_limit(self, snapshot_id: str) -> None:
         from archivebox.core.models import Snapshot
@@ -968,51 +1014,30 @@ def run_install(*, plugin_names: list[str] | None = None) -> None:
 
 
 def recover_orphaned_crawls() -> int:
+    from django.db.models import Exists, OuterRef
+
     from archivebox.crawls.models import Crawl
     from archivebox.core.models import Snapshot
-    from archivebox.machine.models import Process
+    from archivebox.machine.models import ProcessLease
 
-    active_crawl_ids: set[str] = set()
-    orphaned_crawls = list(
+    now = timezone.now()
+    ProcessLease.objects.purge_expired(now)
+    orphaned_crawls = (
         Crawl.objects.filter(
             status=Crawl.StatusChoices.STARTED,
             retry_at__isnull=True,
-        ).prefetch_related("snapshot_set"),
+        )
+        .exclude(id__in=ProcessLease.objects.live(ProcessLease.ObjectTypeChoices.CRAWL, now).values("object_id"))
+        .annotate(
+            has_unsealed_snapshots=Exists(
+                Snapshot.objects.filter(crawl_id=OuterRef("pk")).exclude(status=Snapshot.StatusChoices.SEALED),
+            ),
+        )
     )
-    running_processes = Process.objects.filter(
-        status=Process.StatusChoices.RUNNING,
-        process_type__in=[
-            Process.TypeChoices.WORKER,
-            Process.TypeChoices.HOOK,
-            Process.TypeChoices.BINARY,
-        ],
-    ).only("pwd")
-
-    for proc in running_processes:
-        if not proc.pwd:
-            continue
-        proc_pwd = Path(proc.pwd)
-        for crawl in orphaned_crawls:
-            matched_snapshot = None
-            for snapshot in crawl.snapshot_set.all():
-                try:
-                    proc_pwd.relative_to(snapshot.output_dir)
-                    matched_snapshot = snapshot
-                    break
-                except ValueError:
-                    continue
-            if matched_snapshot is not None:
-                active_crawl_ids.add(str(crawl.id))
-                break
 
     recovered = 0
-    now = timezone.now()
     for crawl in orphaned_crawls:
-        if str(crawl.id) in active_crawl_ids:
-            continue
-
-        snapshots = list(crawl.snapshot_set.all())
-        if not snapshots or all(snapshot.status == Snapshot.StatusChoices.SEALED for snapshot in snapshots):
+        if not crawl.has_unsealed_snapshots:
             crawl.status = Crawl.StatusChoices.SEALED
             crawl.retry_at = None
             crawl.save(update_fields=["status", "retry_at", "modified_at"])
@@ -1027,50 +1052,32 @@ def recover_orphaned_crawls() -> int:
 
 
 def recover_orphaned_snapshots() -> int:
+    from django.db.models import Exists, OuterRef, Q
+
     from archivebox.crawls.models import Crawl
     from archivebox.core.models import ArchiveResult, Snapshot
-    from archivebox.machine.models import Process
-    from django.db.models import Q
+    from archivebox.machine.models import ProcessLease
 
-    active_snapshot_ids: set[str] = set()
-    orphaned_snapshots = list(
+    now = timezone.now()
+    ProcessLease.objects.purge_expired(now)
+    results = ArchiveResult.objects.filter(snapshot_id=OuterRef("pk"))
+    orphaned_snapshots = (
         Snapshot.objects.filter(
             Q(status=Snapshot.StatusChoices.STARTED, retry_at__isnull=True)
             | Q(status=Snapshot.StatusChoices.SEALED, archiveresult__status=ArchiveResult.StatusChoices.QUEUED),
         )
+        .exclude(id__in=ProcessLease.objects.live(ProcessLease.ObjectTypeChoices.SNAPSHOT, now).values("object_id"))
+        .annotate(
+            has_results=Exists(results),
+            has_unfinished_results=Exists(results.exclude(status__in=ArchiveResult.FINAL_STATES)),
+        )
         .select_related("crawl")
-        .prefetch_related("archiveresult_set")
-        .distinct(),
+        .distinct()
     )
-    running_processes = Process.objects.filter(
-        status=Process.StatusChoices.RUNNING,
-        process_type__in=[
-            Process.TypeChoices.WORKER,
-            Process.TypeChoices.HOOK,
-            Process.TypeChoices.BINARY,
-        ],
-    ).only("pwd")
-
-    for proc in running_processes:
-        if not proc.pwd:
-            continue
-        proc_pwd = Path(proc.pwd)
-        for snapshot in orphaned_snapshots:
-            try:
-                proc_pwd.relative_to(snapshot.output_dir)
-                active_snapshot_ids.add(str(snapshot.id))
-                break
-            except ValueError:
-                continue
 
     recovered = 0
-    now = timezone.now()
     for snapshot in orphaned_snapshots:
-        if str(snapshot.id) in active_snapshot_ids:
-            continue
-
-        results = list(snapshot.archiveresult_set.all())
-        if results and all(result.status in ArchiveResult.FINAL_STATES for result in results):
+        if snapshot.has_results and not snapshot.has_unfinished_results:
             snapshot.status = Snapshot.StatusChoices.SEALED
             snapshot.retry_at = None
             snapshot.downloaded_at = snapshot.downloaded_at or now
@@ -1104,11 +1111,9 @@ def run_pending_crawls(*, daemon: bool = False, crawl_id: str | None = None) ->
 
     while True:
         if daemon and crawl_id is None:
-            now = timezone.now()
-            for schedule in CrawlSchedule.objects.filter(is_enabled=True).select_related("template", "template__created_by"):
-                if schedule.is_due(now):
-                    schedule.enqueue(queued_at=now)
+            CrawlSchedule.enqueue_due(timezone.now())
 
+        claim_started = time.perf_counter()
         queued_crawls = Crawl.objects.filter(
             retry_at__lte=timezone.now(),
             status=Crawl.StatusChoices.QUEUED,
@@ -1121,6 +1126,7 @@ def run_pending_crawls(*, daemon: bool = False, crawl_id: str | None = None) ->
         if queued_crawl is not None:
             if not queued_crawl.claim_processing_lock(lock_seconds=60):
                 continue
+            CLAIM_SECONDS.observe(time.perf_counter() - claim_started, object_type="crawl")
             run_crawl(str(queued_crawl.id), process_discovered_snapshots_inline=True)
             continue
 
@@ -1136,6 +1142,7 @@ def run_pending_crawls(*, daemon: bool = False, crawl_id: str | None = None) ->
         if crawl is not None:
             if not crawl.claim_processing_lock(lock_seconds=60):
                 continue
+            CLAIM_SECONDS.observe(time.perf_counter() - claim_started, object_type="crawl")
             run_crawl(str(crawl.id), process_discovered_snapshots_inline=True)
             continue
 
@@ -1151,6 +1158,7 @@ def run_pending_crawls(*, daemon: bool = False, crawl_id: str | None = None) ->
             if snapshot is not None:
                 if not snapshot.claim_processing_lock(lock_seconds=60):
                     continue
+                CLAIM_SECONDS.observe(time.perf_counter() - claim_started, object_type="snapshot")
                 run_crawl(
                     str(snapshot.crawl_id),
                     snapshot_ids=[str(snapshot.id)],
@@ -1176,10 +1184,13 @@ def run_pending_crawls(*, daemon: bool = False, crawl_id: str | None = None) ->
                     continue
                 if not binary.claim_processing_lock(lock_seconds=60):
                     continue
+                CLAIM_SECONDS.observe(time.perf_counter() - claim_started, object_type="binary")
                 run_binary(str(binary.id))
                 continue
 
         if daemon:
-            time.sleep(2.0)
+            # wake up early if a scheduled crawl comes due before the next poll
+            seconds_until_next_run = CrawlSchedule.seconds_until_next_run() if crawl_id is None else None
+            time.sleep(2.0 if seconds_until_next_run is None else min(2.0, max(seconds_until_next_run, 0.05)))
             continue
         return 0
@@ -8,6 +8,8 @@ from abx_dl.events import SnapshotCompletedEvent, SnapshotEvent
 from abx_dl.limits import CrawlLimitState
 from abx_dl.services.base import BaseService
 
+from archivebox.misc.metrics import track_handler
+
 
 class SnapshotService(BaseService):
     LISTENS_TO = [SnapshotEvent, SnapshotCompletedEvent]
@@ -38,6 +40,7 @@ class SnapshotService(BaseService):
             return None
         return str(snapshot.id)
 
+    @track_handler
     async def on_SnapshotEvent(self, event: SnapshotEvent) -> None:
         from archivebox.core.models import Snapshot
         from archivebox.crawls.models import Crawl
@@ -79,6 +82,7 @@ class SnapshotService(BaseService):
         if snapshot_id and event.depth > 0:
             await self.schedule_snapshot(snapshot_id)
 
+    @track_handler
     async def on_SnapshotCompletedEvent(self, event: SnapshotCompletedEvent) -> None:
         from archivebox.crawls.models import Crawl
         from archivebox.core.models import Snapshot
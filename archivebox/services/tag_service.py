@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from asgiref.sync import sync_to_async
 from abx_dl.events import TagEvent
 from abx_dl.services.base import BaseService
 
+from archivebox.misc.metrics import track_handler
+
 
 class TagService(BaseService):
     LISTENS_TO = [TagEvent]
@@ -12,11 +15,11 @@ class TagService(BaseService):
         super().__init__(bus)
         self.bus.on(TagEvent, self.on_TagEvent__save_to_db)
 
+    @track_handler
     async def on_TagEvent__save_to_db(self, event: TagEvent) -> None:
-        from archivebox.core.models import Snapshot, SnapshotTag, Tag
+        from archivebox.core.models import Snapshot
+        from archivebox.core.tag_utils import add_tags_to_snapshots
 
-        snapshot = await Snapshot.objects.filter(id=event.snapshot_id).afirst()
-        if snapshot is None:
+        if not await Snapshot.objects.filter(id=event.snapshot_id).aexists():
             return
-        tag, _ = await Tag.objects.aget_or_create(name=event.name)
-        await SnapshotTag.objects.aget_or_create(snapshot=snapshot, tag=tag)
+        await sync_to_async(add_tags_to_snapshots, thread_sensitive=True)([event.snapshot_id], [event.name])
@@ -160,6 +160,10 @@ def isolate_test_runtime(tmp_path, monkeypatch):
 
     monkeypatch.setattr(os, "chdir", guarded_chdir)
     monkeypatch.setattr(subprocess, "Popen", guarded_popen)
+    # the cached Machine row may have been rolled back with the previous test's transaction
+    machine_models = sys.modules.get("archivebox.machine.models")
+    if machine_models is not None:
+        machine_models.invalidate_current_machine()
     try:
         _assert_safe_runtime_paths(cwd=Path.cwd(), env=os.environ)
         yield
@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_get(client):
+    from archivebox.api.models import APIToken
+    from archivebox.core.host_utils import get_api_host
+
+    user = get_user_model().objects.create_superuser("etagadmin", "etagadmin@test.com", "testpassword")
+    token = APIToken.objects.create(created_by=user, expires=timezone.now() + timedelta(days=1))
+
+    def get(path, **headers):
+        return client.get(path, HTTP_HOST=get_api_host(), HTTP_AUTHORIZATION=f"Bearer {token.token}", **headers)
+
+    return get
+
+
+@pytest.fixture
+def crawl():
+    from archivebox.base_models.models import get_or_create_system_user_pk
+    from archivebox.crawls.models import Crawl
+
+    return Crawl.objects.create(urls="https://example.com", created_by_id=get_or_create_system_user_pk())
+
+
+def test_list_endpoints_return_304_until_something_changes(api_get, crawl):
+    from archivebox.core.models import Snapshot
+
+    snapshot = Snapshot.objects.create(url="https://example.com/etag", crawl=crawl)
+
+    response = api_get("/api/v1/core/snapshots")
+    assert response.status_code == 200
+    etag = response["ETag"]
+    assert response["Last-Modified"]
+    assert response["Cache-Control"] == "private, no-cache"
+
+    response = api_get("/api/v1/core/snapshots", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+    assert response.content == b""
+
+    # different query params are a different representation
+    assert api_get("/api/v1/core/snapshots?limit=1", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    snapshot.title = "Changed"
+    snapshot.save()
+    response = api_get("/api/v1/core/snapshots", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+    for path in ("/api/v1/crawls/crawls", "/api/v1/core/tags", "/api/v1/core/archiveresults", "/api/v1/machine/machines"):
+        response = api_get(path)
+        assert response.status_code == 200, path
+        assert api_get(path, HTTP_IF_NONE_MATCH=response["ETag"]).status_code == 304, path
+
+
+def test_changed_since_returns_only_rows_modified_after_the_watermark(api_get, crawl):
+    from archivebox.core.models import Snapshot
+
+    old = Snapshot.objects.create(url="https://example.com/old", crawl=crawl)
+    response = api_get("/api/v1/core/snapshots")
+    watermark = response["X-ArchiveBox-Watermark"]
+
+    new = Snapshot.objects.create(url="https://example.com/new", crawl=crawl)
+    response = api_get("/api/v1/core/snapshots", data={"changed_since": watermark})
+    urls = [item["url"] for item in response.json()["items"]]
+    assert urls == [new.url]
+    assert old.url not in urls
+
+    response = api_get("/api/v1/crawls/crawls", data={"changed_since": timezone.now().isoformat()})
+    assert response.json() == []
+
+
+def test_api_cache_serves_repeat_polls_without_rerendering(api_get, crawl, monkeypatch):
+    from django.core.cache import cache
+
+    from archivebox.core.models import Snapshot
+
+    monkeypatch.setenv("API_CACHE_TIMEOUT", "60")
+    cache.clear()
+    Snapshot.objects.create(url="https://example.com/cached", crawl=crawl)
+
+    first = api_get("/api/v1/core/snapshots")
+    second = api_get("/api/v1/core/snapshots")
+    assert "X-ArchiveBox-Cache" not in first
+    assert second["X-ArchiveBox-Cache"] == "hit"
+    assert second.content == first.content
+    assert second["ETag"] == first["ETag"]
+
+    Snapshot.objects.create(url="https://example.com/cached-2", crawl=crawl)
+    third = api_get("/api/v1/core/snapshots")
+    assert "X-ArchiveBox-Cache" not in third
+    assert len(third.json()["items"]) == 2
@@ -0,0 +1,70 @@
+import os
+import shutil
+from types import SimpleNamespace
+
+from archivebox.misc.blobstore import BLOB_MANIFEST_FILENAME, BlobStore, get_blob_store
+
+
+def _make_snapshot(root, name, payload):
+    snapshot_dir = root / name
+    (snapshot_dir / "favicon").mkdir(parents=True)
+    (snapshot_dir / "favicon" / "favicon.ico").write_bytes(payload)
+    (snapshot_dir / "favicon" / "stdout.log").write_bytes(payload)
+    (snapshot_dir / "index.json").write_bytes(payload)
+    return snapshot_dir
+
+
+def test_dedupe_hardlinks_identical_outputs_and_records_manifest(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    payload = os.urandom(4096)
+    first = _make_snapshot(tmp_path / "archive", "1", payload)
+    second = _make_snapshot(tmp_path / "archive", "2", payload)
+
+    assert store.dedupe_snapshot_dir(first).deduped == 0
+    stats = store.dedupe_snapshot_dir(second)
+
+    assert (stats.files, stats.deduped, stats.bytes_saved) == (1, 1, 4096)
+    first_icon = (first / "favicon" / "favicon.ico").stat()
+    second_icon = (second / "favicon" / "favicon.ico").stat()
+    assert first_icon.st_ino == second_icon.st_ino
+    assert first_icon.st_nlink == 3
+    assert (second / "favicon" / "favicon.ico").read_bytes() == payload
+    # logs and indexes are left alone
+    assert (second / "favicon" / "stdout.log").stat().st_nlink == 1
+    assert (second / "index.json").stat().st_nlink == 1
+
+    assert store.read_manifest(second) == {store.blob_path(next(iter(store.read_manifest(first)))).name}
+    # running it again is a no-op and doesn't duplicate manifest lines
+    assert store.dedupe_snapshot_dir(second).deduped == 0
+    assert len((second / BLOB_MANIFEST_FILENAME).read_text().splitlines()) == 1
+
+
+def test_prune_only_removes_blobs_nothing_links_to(tmp_path):
+    store = BlobStore(tmp_path / "blobs")
+    shared = os.urandom(2048)
+    first = _make_snapshot(tmp_path / "archive", "1", shared)
+    second = _make_snapshot(tmp_path / "archive", "2", shared)
+    store.dedupe_snapshot_dir(first)
+    store.dedupe_snapshot_dir(second)
+    digests = store.read_manifest(first)
+    blob = store.blob_path(next(iter(digests)))
+
+    shutil.rmtree(first)
+    assert store.prune(digests) == 0
+    assert blob.exists()
+
+    shutil.rmtree(second)
+    assert store.prune() == 2048
+    assert not blob.exists()
+
+
+def test_small_files_are_skipped_and_store_is_disabled_by_default(tmp_path):
+    store = BlobStore(tmp_path / "blobs", min_size=1024)
+    snapshot_dir = _make_snapshot(tmp_path / "archive", "1", b"tiny")
+
+    assert store.dedupe_snapshot_dir(snapshot_dir).deduped == 0
+    assert not (snapshot_dir / BLOB_MANIFEST_FILENAME).exists()
+
+    assert get_blob_store(SimpleNamespace(DEDUPE_OUTPUTS=False)) is None
+    enabled = get_blob_store(SimpleNamespace(DEDUPE_OUTPUTS=True, BLOBS_DIR=tmp_path / "blobs", DEDUPE_MIN_SIZE=10))
+    assert enabled is not None and enabled.min_size == 10
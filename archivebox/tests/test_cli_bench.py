@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for archivebox bench command.
+Verify it generates a synthetic collection offline and emits comparable JSON timings.
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+
+
+BENCH_ARGS = ["--snapshots=12", "--results-per-snapshot=2", "--tags=3", "--files-per-result=2", "--file-size=64", "--iterations=1", "--sample-size=4"]
+
+
+def test_bench_generates_collection_and_writes_results(tmp_path, process):
+    os.chdir(tmp_path)
+    result = subprocess.run(["archivebox", "bench", *BENCH_ARGS, "--output=results.json"], capture_output=True, text=True, timeout=600)
+
+    assert result.returncode == 0, result.stderr
+    results = json.loads((tmp_path / "results.json").read_text())
+    assert results["params"]["snapshots"] == 12
+    assert results["collection"] == {"snapshots": 12, "archiveresults": 24, "tags": 3}
+    for name in ("get_config", "status", "snapshots.to_json", "api.snapshots", "public_index.search", "snapshot.save", "runner.claim_loop"):
+        assert results["results"][name]["median_s"] >= 0
+        assert results["results"][name]["ops"] >= 1
+
+    conn = sqlite3.connect("index.sqlite3")
+    assert conn.execute("SELECT COUNT(*) FROM core_snapshot WHERE status != 'sealed'").fetchone()[0] == 0
+    conn.close()
+    assert len(list((tmp_path / "archive" / "users" / "bench").rglob("file1.bin"))) == 24
+
+
+def test_bench_refuses_to_generate_into_a_non_empty_collection_but_can_compare(tmp_path, process):
+    os.chdir(tmp_path)
+    first = subprocess.run(["archivebox", "bench", *BENCH_ARGS, "--only=get_config", "-o", "old.json"], capture_output=True, text=True, timeout=600)
+    assert first.returncode == 0, first.stderr
+
+    refused = subprocess.run(["archivebox", "bench", *BENCH_ARGS], capture_output=True, text=True, timeout=600)
+    assert refused.returncode == 2
+    assert "empty collection" in refused.stderr
+
+    rerun = subprocess.run(
+        ["archivebox", "bench", *BENCH_ARGS, "--skip-generate", "--only=get_config", "--compare=old.json"],
+        capture_output=True,
+        text=True,
+        timeout=600,
+    )
+    assert rerun.returncode == 0, rerun.stderr
+    assert set(json.loads(rerun.stdout)["results"]) == {"get_config"}
+    assert "get_config" in rerun.stderr and "ms/op" in rerun.stderr
@@ -145,6 +145,28 @@ def test_read_args_or_stdin_handles_args_stdin_and_mixed_jsonl():
     assert tty_records == []
 
 
+def test_iter_batches_bounds_batches_and_flushes_slow_input_early(monkeypatch):
+    """Streamed stdin records should be grouped into bounded batches without waiting for the end of input."""
+    from archivebox.misc import jsonl
+
+    def records():
+        for i in range(7):
+            yield {"url": f"https://example.com/{i}"}
+
+    assert [len(batch) for batch in jsonl.iter_batches(records(), batch_size=3)] == [3, 3, 1]
+
+    # the generator is consumed lazily: the first batch is available before the rest of the input is read
+    consumed = []
+    batches = jsonl.iter_batches((consumed.append(i) or {"i": i} for i in range(1000)), batch_size=10)
+    assert len(next(batches)) == 10
+    assert len(consumed) == 10
+
+    # a partial batch is flushed once max_wait has passed, even if the input hasn't ended
+    clock = iter([0.0, 0.1, 5.0, 5.1, 5.2])
+    monkeypatch.setattr(jsonl.time, "monotonic", lambda: next(clock))
+    assert [len(batch) for batch in jsonl.iter_batches(records(), batch_size=100, max_wait=2.0)][:1] == [2]
+
+
 def test_collect_urls_from_plugins_reads_only_parser_outputs(tmp_path):
     """Parser extractor `urls.jsonl` outputs should be discoverable for recursive piping."""
     from archivebox.hooks import collect_urls_from_plugins
@@ -86,6 +86,48 @@ def test_remove_deletes_archive_directory(tmp_path, process, disable_extractors_
     assert not snapshot_dir.exists()
 
 
+def test_remove_delete_moves_directory_to_trash_and_reaper_empties_it(tmp_path, process, disable_extractors_dict):
+    """Test that remove --delete --keep-trash renames the folder into archive/.trash and reap_trash deletes it."""
+    os.chdir(tmp_path)
+
+    subprocess.run(
+        ["archivebox", "add", "--index-only", "--depth=0", "https://example.com"],
+        capture_output=True,
+        env=disable_extractors_dict,
+    )
+
+    conn = sqlite3.connect("index.sqlite3")
+    snapshot_id = str(conn.execute("SELECT id FROM core_snapshot").fetchone()[0])
+    conn.close()
+    snapshot_dir = _find_snapshot_dir(tmp_path, snapshot_id)
+    assert snapshot_dir is not None
+    (snapshot_dir / "marker.txt").write_text("still here")
+
+    result = subprocess.run(
+        ["archivebox", "remove", "https://example.com", "--yes", "--delete", "--keep-trash"],
+        capture_output=True,
+        env=disable_extractors_dict,
+        check=True,
+    )
+
+    assert "Moved 1 data folders to the trash" in result.stdout.decode("utf-8")
+    assert not snapshot_dir.exists()
+    trash_dir = tmp_path / "archive" / ".trash"
+    trashed = [path for path in trash_dir.iterdir() if path.name.endswith(snapshot_dir.name)]
+    assert len(trashed) == 1
+    assert (trashed[0] / "marker.txt").read_text() == "still here"
+
+    result = subprocess.run(
+        ["archivebox", "manage", "reap_trash", "--workers=2"],
+        capture_output=True,
+        env=disable_extractors_dict,
+        check=True,
+    )
+
+    assert "Reclaimed 1/1 trash entries" in result.stdout.decode("utf-8")
+    assert not trashed[0].exists()
+
+
 def test_remove_yes_flag_skips_confirmation(tmp_path, process, disable_extractors_dict):
     """Test that --yes flag skips confirmation prompt."""
     os.chdir(tmp_path)
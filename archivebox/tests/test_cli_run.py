@@ -329,14 +329,14 @@ class TestRecoverOrphanedCrawls:
         assert crawl.status == Crawl.StatusChoices.STARTED
         assert crawl.retry_at is not None
 
-    def test_recover_orphaned_crawl_skips_active_child_processes(self):
+    def test_recover_orphaned_crawl_skips_crawls_with_live_lease(self):
         import archivebox.machine.models as machine_models
         from django.utils import timezone
 
         from archivebox.base_models.models import get_or_create_system_user_pk
         from archivebox.crawls.models import Crawl
         from archivebox.core.models import Snapshot
-        from archivebox.machine.models import Machine, Process
+        from archivebox.machine.models import Machine, Process, ProcessLease
         from archivebox.services.runner import recover_orphaned_crawls
 
         crawl = Crawl.objects.create(
@@ -345,7 +345,7 @@ class TestRecoverOrphanedCrawls:
             status=Crawl.StatusChoices.STARTED,
             retry_at=None,
         )
-        snapshot = Snapshot.objects.create(
+        Snapshot.objects.create(
             url="https://example.com",
             crawl=crawl,
             status=Snapshot.StatusChoices.QUEUED,
@@ -353,15 +353,13 @@ class TestRecoverOrphanedCrawls:
         )
 
         machine_models._CURRENT_MACHINE = None
-        machine = Machine.current()
-        Process.objects.create(
-            machine=machine,
-            process_type=Process.TypeChoices.HOOK,
+        owner = Process.objects.create(
+            machine=Machine.current(),
+            process_type=Process.TypeChoices.WORKER,
             status=Process.StatusChoices.RUNNING,
-            pwd=str(snapshot.output_dir / "chrome"),
-            cmd=["/plugins/chrome/on_CrawlSetup__91_chrome_wait.js"],
             started_at=timezone.now(),
         )
+        ProcessLease.objects.acquire(ProcessLease.ObjectTypeChoices.CRAWL, crawl.id, owner=owner)
 
         recovered = recover_orphaned_crawls()
 
@@ -369,6 +367,47 @@ class TestRecoverOrphanedCrawls:
         assert recovered == 0
         assert crawl.retry_at is None
 
+    def test_recover_orphaned_crawl_requeues_crawl_with_expired_lease(self):
+        import archivebox.machine.models as machine_models
+        from datetime import timedelta
+        from django.utils import timezone
+
+        from archivebox.base_models.models import get_or_create_system_user_pk
+        from archivebox.crawls.models import Crawl
+        from archivebox.core.models import Snapshot
+        from archivebox.machine.models import Machine, Process, ProcessLease
+        from archivebox.services.runner import recover_orphaned_crawls
+
+        crawl = Crawl.objects.create(
+            urls="https://example.com",
+            created_by_id=get_or_create_system_user_pk(),
+            status=Crawl.StatusChoices.STARTED,
+            retry_at=None,
+        )
+        Snapshot.objects.create(
+            url="https://example.com",
+            crawl=crawl,
+            status=Snapshot.StatusChoices.QUEUED,
+            retry_at=None,
+        )
+
+        machine_models._CURRENT_MACHINE = None
+        owner = Process.objects.create(
+            machine=Machine.current(),
+            process_type=Process.TypeChoices.WORKER,
+            status=Process.StatusChoices.RUNNING,
+            started_at=timezone.now(),
+        )
+        ProcessLease.objects.acquire(ProcessLease.ObjectTypeChoices.CRAWL, crawl.id, owner=owner)
+        ProcessLease.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        recovered = recover_orphaned_crawls()
+
+        crawl.refresh_from_db()
+        assert recovered == 1
+        assert crawl.retry_at is not None
+        assert not ProcessLease.objects.exists()
+
     def test_recover_orphaned_crawl_seals_when_all_snapshots_are_already_sealed(self):
         from archivebox.base_models.models import get_or_create_system_user_pk
         from archivebox.crawls.models import Crawl
@@ -463,3 +502,41 @@ class TestRecoverOrphanedSnapshots:
         assert snapshot.retry_at is not None
         assert crawl.status == Crawl.StatusChoices.QUEUED
         assert crawl.retry_at is not None
+
+    def test_recover_orphaned_snapshot_skips_snapshots_with_live_lease(self):
+        import archivebox.machine.models as machine_models
+        from django.utils import timezone
+
+        from archivebox.base_models.models import get_or_create_system_user_pk
+        from archivebox.crawls.models import Crawl
+        from archivebox.core.models import Snapshot
+        from archivebox.machine.models import Machine, Process, ProcessLease
+        from archivebox.services.runner import recover_orphaned_snapshots
+
+        crawl = Crawl.objects.create(
+            urls="https://example.com",
+            created_by_id=get_or_create_system_user_pk(),
+            status=Crawl.StatusChoices.STARTED,
+            retry_at=None,
+        )
+        snapshot = Snapshot.objects.create(
+            url="https://example.com",
+            crawl=crawl,
+            status=Snapshot.StatusChoices.STARTED,
+            retry_at=None,
+        )
+
+        machine_models._CURRENT_MACHINE = None
+        owner = Process.objects.create(
+            machine=Machine.current(),
+            process_type=Process.TypeChoices.WORKER,
+            status=Process.StatusChoices.RUNNING,
+            started_at=timezone.now(),
+        )
+        ProcessLease.objects.acquire(ProcessLease.ObjectTypeChoices.SNAPSHOT, snapshot.id, owner=owner)
+
+        recovered = recover_orphaned_snapshots()
+
+        snapshot.refresh_from_db()
+        assert recovered == 0
+        assert snapshot.status == Snapshot.StatusChoices.STARTED
@@ -109,6 +109,7 @@ def test_start_server_workers_starts_plugin_owned_sonic_worker(monkeypatch):
         ("worker_daphne", False),
         ("worker_sonic", False),
         ("worker_runner", False),
+        ("worker_webhooks", False),
     ]
 
 
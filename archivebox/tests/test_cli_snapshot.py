@@ -299,3 +299,38 @@ class TestSnapshotDelete:
 
         assert code == 0
         assert "Would delete" in stderr
+
+
+class TestSnapshotVerify:
+    """Tests for `archivebox snapshot verify`."""
+
+    def test_verify_reports_and_repairs_output_paths(self, initialized_archive):
+        """Missing or stale persisted output paths are reported, and rewritten with --repair."""
+        import sqlite3
+
+        url = create_test_url()
+        stdout1, _, _ = run_archivebox_cmd(["snapshot", "create", url], data_dir=initialized_archive)
+        snapshot = parse_jsonl_output(stdout1)[0]
+
+        db_path = initialized_archive / "index.sqlite3"
+        with sqlite3.connect(db_path) as conn:
+            (output_path,) = conn.execute("SELECT output_path FROM core_snapshot WHERE id = ?", (snapshot["id"].replace("-", ""),)).fetchone()
+            assert output_path.startswith("archive/users/")
+            assert output_path.endswith(snapshot["id"])
+            (initialized_archive / output_path).mkdir(parents=True, exist_ok=True)
+            conn.execute("UPDATE core_snapshot SET output_path = 'archive/users/moved/elsewhere'")
+
+        stdout, stderr, code = run_archivebox_cmd(["snapshot", "verify"], data_dir=initialized_archive)
+        assert code == 1
+        assert "1 stale" in stderr
+        assert "--repair" in stderr
+
+        stdout, stderr, code = run_archivebox_cmd(["snapshot", "verify", "--repair"], data_dir=initialized_archive)
+        assert code == 0, stderr
+        assert "1 repaired" in stderr
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT output_path FROM core_snapshot").fetchone() == (output_path,)
+
+        stdout, stderr, code = run_archivebox_cmd(["snapshot", "verify"], data_dir=initialized_archive)
+        assert code == 0
+        assert "1 ok" in stderr
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for CLI cold start time.
+Guard against import creep: meta commands must not pay for Django, config construction, or heavy libraries.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+# modules that each add 0.2-1s+ to startup and must only be imported by the commands that need them
+HEAVY_MODULES = ("django.db", "daphne", "benedict", "pydantic_settings", "dateparser", "requests", "abx_dl")
+
+
+def _loaded_heavy_modules(code: str, cwd) -> list[str]:
+    script = f"import sys, json\n{code}\nprint(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, cwd=cwd, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_importing_cli_does_not_load_heavy_modules(tmp_path):
+    assert _loaded_heavy_modules("import archivebox.cli", tmp_path) == []
+
+
+def test_version_quiet_skips_django_and_config(tmp_path):
+    code = "from archivebox.cli import main\ntry:\n    main(args=['version', '--quiet'])\nexcept SystemExit:\n    pass"
+    assert _loaded_heavy_modules(code, tmp_path) == []
+
+
+def test_help_reads_command_docs_without_importing_commands(tmp_path):
+    from archivebox.cli import ArchiveBoxGroup
+
+    assert ArchiveBoxGroup.get_command_doc("add").startswith("Add a new URL")
+    assert ArchiveBoxGroup.get_command_doc("status").startswith("Print out some info")
+
+    code = "from archivebox.cli import main\ntry:\n    main(args=['help'])\nexcept SystemExit:\n    pass"
+    loaded = _loaded_heavy_modules(code, tmp_path)
+    assert "django.db" not in loaded
+    assert "abx_dl" not in loaded
+
+
+def test_shell_completion_lists_commands_without_importing_them(tmp_path):
+    env = {**os.environ, "_ARCHIVEBOX_COMPLETE": "bash_complete", "COMP_WORDS": "archivebox sta", "COMP_CWORD": "1"}
+    code = (
+        "from archivebox.cli import cli\ntry:\n    cli(prog_name='archivebox', complete_var='_ARCHIVEBOX_COMPLETE')\nexcept SystemExit:\n    pass"
+    )
+    script = f"import sys, json\n{code}\nprint(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, cwd=tmp_path, env=env, timeout=60)
+
+    assert result.returncode == 0, result.stderr
+    assert "plain,status" in result.stdout
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+def test_version_quiet_cold_start_is_fast(tmp_path):
+    start = time.monotonic()
+    result = subprocess.run([sys.executable, "-m", "archivebox", "version", "--quiet"], capture_output=True, text=True, cwd=tmp_path, timeout=60)
+    elapsed = time.monotonic() - start
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip()
+    # generous bound to stay stable on slow CI machines, it used to take 3s+ when django and all plugins were loaded
+    assert elapsed < 2.5, f"archivebox version --quiet took {elapsed:.2f}s"
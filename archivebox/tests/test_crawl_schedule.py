@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _create_schedule(schedule: str = "daily", **kwargs):
+    from archivebox.base_models.models import get_or_create_system_user_pk
+    from archivebox.crawls.models import Crawl, CrawlSchedule
+
+    created_by_id = get_or_create_system_user_pk()
+    template = Crawl.objects.create(
+        urls="https://example.com/feed.xml",
+        created_by_id=created_by_id,
+        status=Crawl.StatusChoices.SEALED,
+        retry_at=None,
+    )
+    return CrawlSchedule.objects.create(template=template, schedule=schedule, created_by_id=created_by_id, **kwargs)
+
+
+def test_next_run_at_is_persisted_on_create_and_schedule_change():
+    schedule = _create_schedule("daily")
+    assert schedule.next_run_at == schedule.compute_next_run_at()
+
+    schedule.refresh_from_db()
+    daily_next_run_at = schedule.next_run_at
+    assert daily_next_run_at is not None
+
+    schedule.schedule = "* * * * *"
+    schedule.save()
+    schedule.refresh_from_db()
+    assert schedule.next_run_at < daily_next_run_at
+
+
+def test_enqueue_advances_next_run_at():
+    from archivebox.crawls.models import Crawl
+
+    schedule = _create_schedule("hourly")
+    now = timezone.now()
+
+    crawl = schedule.enqueue(queued_at=now)
+
+    assert crawl.status == Crawl.StatusChoices.QUEUED
+    schedule.refresh_from_db()
+    assert now < schedule.next_run_at <= now + timedelta(hours=1)
+
+
+def test_enqueue_due_only_picks_due_enabled_schedules():
+    from archivebox.crawls.models import CrawlSchedule
+
+    now = timezone.now()
+    due = _create_schedule("hourly")
+    not_due = _create_schedule("hourly")
+    disabled = _create_schedule("hourly")
+    CrawlSchedule.objects.filter(pk__in=[due.pk, disabled.pk]).update(next_run_at=now - timedelta(minutes=1))
+    CrawlSchedule.objects.filter(pk=not_due.pk).update(next_run_at=now + timedelta(minutes=30))
+    CrawlSchedule.objects.filter(pk=disabled.pk).update(is_enabled=False)
+
+    crawls = CrawlSchedule.enqueue_due(now)
+
+    assert [crawl.schedule_id for crawl in crawls] == [due.pk]
+    assert CrawlSchedule.enqueue_due(now) == []
+    assert 0 < CrawlSchedule.seconds_until_next_run(now) <= 30 * 60
+
+
+@pytest.mark.parametrize(
+    ("catchup", "expected_runs"),
+    [
+        ("once", 1),
+        ("all", 3),
+        ("skip", 0),
+    ],
+)
+def test_catchup_policy_controls_missed_runs(catchup, expected_runs):
+    from archivebox.crawls.models import CrawlSchedule
+
+    now = timezone.now().replace(minute=30, second=0, microsecond=0)
+    schedule = _create_schedule("hourly")
+    # the runner was down for the last three hourly slots
+    CrawlSchedule.objects.filter(pk=schedule.pk).update(next_run_at=now - timedelta(hours=2, minutes=30))
+
+    runs = 0
+    for _ in range(10):
+        schedule.refresh_from_db()
+        if schedule.run_if_due(now, catchup=catchup) is None:
+            break
+        runs += 1
+
+    assert runs == expected_runs
+    schedule.refresh_from_db()
+    assert now < schedule.next_run_at <= now + timedelta(hours=1)
@@ -76,6 +76,18 @@ class TestMachineModel(TestCase):
         # Should have fetched/updated the machine (same GUID)
         self.assertEqual(machine1.guid, machine2.guid)
 
+    def test_machine_current_skips_db_check_within_recheck_interval(self):
+        """Machine.current() should not query the DB on every call once the cached row was verified."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        machine1 = Machine.current()
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(10):
+                self.assertEqual(Machine.current().id, machine1.id)
+
+        self.assertEqual(len(ctx.captured_queries), 0)
+
     def test_machine_current_recreates_stale_cached_row(self):
         """Machine.current() should recreate the cached machine if the row was deleted."""
         import archivebox.machine.models as models
@@ -245,7 +257,10 @@ class TestNetworkInterfaceModel(TestCase):
             "ip_local": "10.0.0.5",
         }
 
-        with patch.object(models, "get_host_network", side_effect=[first, second]):
+        with (
+            patch.object(models, "get_network_fingerprint", side_effect=["fingerprint-a", "fingerprint-b"]),
+            patch.object(models, "get_host_network", side_effect=[first, second]),
+        ):
             interface1 = NetworkInterface.current(refresh=True)
             interface2 = NetworkInterface.current(refresh=True)
 
@@ -253,6 +268,33 @@ class TestNetworkInterfaceModel(TestCase):
         self.assertEqual(interface1.machine_id, interface2.machine_id)
         self.assertEqual(NetworkInterface.objects.filter(machine=interface1.machine).count(), 2)
 
+    def test_networkinterface_current_refresh_skips_detection_when_fingerprint_unchanged(self):
+        """Refreshing should reuse the cached interface without re-detecting while the local network fingerprint is the same."""
+        import archivebox.machine.models as models
+
+        net_info = {
+            "mac_address": "aa:bb:cc:dd:ee:02",
+            "ip_public": "3.3.3.3",
+            "ip_local": "192.168.1.20",
+            "dns_server": "8.8.8.8",
+            "hostname": "host-b",
+            "iface": "en0",
+            "isp": "ISP B",
+            "city": "City",
+            "region": "Region",
+            "country": "Country",
+        }
+
+        with (
+            patch.object(models, "get_network_fingerprint", return_value="fingerprint-a"),
+            patch.object(models, "get_host_network", return_value=net_info) as get_host_network,
+        ):
+            interface1 = NetworkInterface.current(refresh=True)
+            for _ in range(5):
+                self.assertEqual(NetworkInterface.current(refresh=True).id, interface1.id)
+
+        self.assertEqual(get_host_network.call_count, 1)
+
 
 class TestBinaryModel(TestCase):
     """Test the Binary model."""
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the MCP server.
+Verify tool calls run concurrently, can be cancelled, stream progress, and read-only tools skip the CLI.
+"""
+
+import json
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from archivebox.mcp import server as mcp_server
+from archivebox.mcp.server import MCPServer, ToolCall, build_cli_args, run_cli_tool
+
+
+def test_build_cli_args_uses_real_option_flags():
+    from archivebox.cli.archivebox_list import main as list_command
+
+    args = build_cli_args(list_command, {"url__icontains": "example.com", "with_headers": True, "limit": 5, "query": ["foo", "bar"]})
+    assert args == ["--url__icontains", "example.com", "--with-headers", "--limit", "5", "foo", "bar"]
+
+
+def test_tool_calls_run_concurrently_and_cancelled_calls_get_no_response(monkeypatch):
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow_tool(params):
+        started.set()
+        release.wait(10)
+        return "slow done"
+
+    monkeypatch.setattr(mcp_server, "DIRECT_TOOLS", {"version": slow_tool, "status": lambda params: "status done"})
+    server = MCPServer(max_workers=2)
+    monkeypatch.setattr(server, "setup_django", lambda: None)
+    sent = []
+    monkeypatch.setattr(server, "send", sent.append)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        server._pool = pool
+        server.dispatch({"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": "version", "arguments": {}}})
+        assert started.wait(5)
+        server.dispatch({"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": "status", "arguments": {}}})
+
+        # the quick call finishes while the slow one is still running
+        deadline = time.monotonic() + 5
+        while not sent and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [msg["id"] for msg in sent] == [2]
+        assert sent[0]["result"]["content"][0]["text"] == "status done"
+
+        server.dispatch({"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": 1, "reason": "test"}})
+        release.set()
+
+    assert [msg.get("id") for msg in sent] == [2]
+    assert server._calls == {}
+
+
+def test_cancelling_a_cli_tool_kills_its_subprocess(tmp_path, monkeypatch):
+    import archivebox.config
+
+    monkeypatch.setattr(archivebox.config, "DATA_DIR", tmp_path)
+    call = ToolCall(1, None, lambda message: None)
+    call.cancel()
+
+    start = time.monotonic()
+    result = run_cli_tool("help", [], call)
+
+    assert result["isError"] is True
+    assert time.monotonic() - start < 10
+
+
+@pytest.mark.django_db
+def test_read_only_tools_call_query_functions_directly(monkeypatch):
+    from archivebox.base_models.models import get_or_create_system_user_pk
+    from archivebox.core.models import Snapshot
+    from archivebox.crawls.models import Crawl
+
+    crawl = Crawl.objects.create(urls="https://example.com", created_by_id=get_or_create_system_user_pk())
+    Snapshot.objects.create(url="https://example.com/mcp", crawl=crawl)
+    Snapshot.objects.create(url="https://other.com/", crawl=crawl)
+
+    server = MCPServer()
+    monkeypatch.setattr(server, "setup_django", lambda: None)
+    monkeypatch.setattr(mcp_server, "run_cli_tool", lambda *args: pytest.fail("read-only tools must not run the CLI"))
+
+    result = server.handle_tools_call({"name": "list", "arguments": {"url__icontains": "example.com/mcp"}})
+    assert result["isError"] is False
+    records = [json.loads(line) for line in result["content"][0]["text"].splitlines()]
+    assert [record["url"] for record in records] == ["https://example.com/mcp"]
+
+    result = server.handle_tools_call({"name": "status", "arguments": {}})
+    assert result["isError"] is False
+    assert json.loads(result["content"][0]["text"])["snapshots"]["indexed"] == 2
+
+    result = server.handle_tools_call({"name": "list", "arguments": {"with_headers": True}})
+    assert result["isError"] is True
+    assert "--with-headers requires --csv" in result["content"][0]["text"]
+
+
+def test_mcp_streams_progress_notifications_for_cli_tools(tmp_path, process):
+    os.chdir(tmp_path)
+    requests = [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": "version", "arguments": {}, "_meta": {"progressToken": "v"}}},
+        {"jsonrpc": "2.0", "id": 3, "method": "tools/call", "params": {"name": "status", "arguments": {}}},
+    ]
+    result = subprocess.run(
+        ["archivebox", "mcp"],
+        input="".join(json.dumps(request) + "\n" for request in requests),
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    assert result.returncode == 0, result.stderr
+
+    messages = [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
+    responses = {msg["id"]: msg for msg in messages if "id" in msg}
+    assert set(responses) == {1, 2, 3}
+    assert json.loads(responses[3]["result"]["content"][0]["text"])["snapshots"]["indexed"] == 0
+
+    progress = [msg for msg in messages if msg.get("method") == "notifications/progress"]
+    assert progress
+    assert all(msg["params"]["progressToken"] == "v" for msg in progress)
+    assert [msg["params"]["progress"] for msg in progress] == list(range(1, len(progress) + 1))
+    # notifications for a call always arrive before its final response
+    assert messages.index(progress[-1]) < messages.index(responses[2])
@@ -0,0 +1,96 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from archivebox.misc.metrics import Counter, Histogram, MetricsRegistry, render_metrics
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = MetricsRegistry()
+    registry._metrics_dir = tmp_path / "metrics"
+    return registry
+
+
+def test_histograms_and_counters_render_in_prometheus_text_format(registry):
+    hist = registry.register(Histogram("test_hook_seconds", "Hook runtime", ("plugin",), buckets=(1.0, 5.0)))
+    counter = registry.register(Counter("test_bytes_total", "Bytes written", ("plugin",)))
+    hist.observe(0.5, plugin="wget")
+    hist.observe(1.0, plugin="wget")
+    hist.observe(7.0, plugin="wget")
+    counter.inc(100, plugin='say "hi"')
+
+    with pytest.raises(ValueError):
+        counter.inc(1, extractor="wget")
+
+    text = render_metrics(registry, include_queue_depths=False)
+    assert "# TYPE test_hook_seconds histogram" in text
+    assert 'test_hook_seconds_bucket{plugin="wget",le="1.0"} 2' in text
+    assert 'test_hook_seconds_bucket{plugin="wget",le="5.0"} 2' in text
+    assert 'test_hook_seconds_bucket{plugin="wget",le="+Inf"} 3' in text
+    assert 'test_hook_seconds_sum{plugin="wget"} 8.5' in text
+    assert 'test_hook_seconds_count{plugin="wget"} 3' in text
+    assert 'test_bytes_total{plugin="say \\"hi\\""} 100' in text
+
+
+def test_collect_merges_snapshots_flushed_by_other_processes(registry):
+    counter = registry.register(Counter("test_claims_total", "Claims", ("object_type",)))
+    hist = registry.register(Histogram("test_claim_seconds", "Claim latency", (), buckets=(0.1,)))
+    counter.inc(2, object_type="crawl")
+    hist.observe(0.05)
+    registry.flush()
+    assert registry.snapshot_path.exists()
+
+    other_process = registry.metrics_dir / "99999-1.json"
+    other_process.write_text(
+        json.dumps(
+            {
+                "pid": 99999,
+                "samples": {
+                    "test_claims_total": [[["crawl"], 3], [["snapshot"], 1]],
+                    "test_claim_seconds": [[[], [[0, 4], 2.0, 4]]],
+                    "unknown_metric": [[[], 1]],
+                },
+            },
+        ),
+    )
+
+    merged = registry.collect()
+    assert merged["test_claims_total"] == {("crawl",): 5, ("snapshot",): 1}
+    assert merged["test_claim_seconds"][()] == [[1, 4], 2.05, 5]
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_requires_superuser_token(client):
+    from archivebox.api.models import APIToken
+    from archivebox.core.host_utils import get_web_host
+
+    response = client.get("/metrics", HTTP_HOST=get_web_host())
+    assert response.status_code == 401
+
+    user = get_user_model().objects.create_superuser("metricsadmin", "metricsadmin@test.com", "testpassword")
+    token = APIToken.objects.create(created_by=user, expires=timezone.now() + timedelta(days=1))
+    response = client.get("/metrics", HTTP_HOST=get_web_host(), HTTP_AUTHORIZATION=f"Bearer {token.token}")
+    body = response.content.decode()
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE archivebox_queue_depth gauge" in body
+    assert "# TYPE archivebox_hook_duration_seconds histogram" in body
+    assert "# TYPE archivebox_claim_seconds histogram" in body
+
+
+@pytest.mark.django_db
+def test_status_metrics_dumps_prometheus_text(capsys):
+    from archivebox.cli.archivebox_status import status
+    from archivebox.crawls.models import Crawl
+
+    Crawl.objects.create(urls="https://example.com")
+    status(metrics=True)
+
+    out = capsys.readouterr().out
+    assert 'archivebox_queue_depth{model="crawl",status="queued"} 1' in out
+    assert "archivebox_db_write_seconds" in out
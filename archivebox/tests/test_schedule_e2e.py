@@ -135,6 +135,18 @@ def make_latest_schedule_due(cwd: Path) -> None:
             )
             """,
         )
+        conn.execute(
+            """
+            UPDATE crawls_crawlschedule
+            SET next_run_at = datetime('now', '-1 day')
+            WHERE id = (
+                SELECT id
+                FROM crawls_crawlschedule
+                ORDER BY created_at DESC
+                LIMIT 1
+            )
+            """,
+        )
         conn.commit()
     finally:
         conn.close()
@@ -2,7 +2,8 @@ from django.test import TestCase
 
 
 class TestSignalWebhooksSettings(TestCase):
-    def test_task_handler_is_sync_in_tests(self):
+    def test_task_handler_queues_instead_of_sending_inline(self):
         from signal_webhooks.settings import webhook_settings
 
-        assert webhook_settings.TASK_HANDLER.__name__ == "sync_task_handler"
+        assert webhook_settings.TASK_HANDLER.__module__ == "archivebox.api.webhooks"
+        assert webhook_settings.TASK_HANDLER.__name__ == "queue_task_handler"
@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _create_snapshots(count: int):
+    from archivebox.base_models.models import get_or_create_system_user_pk
+    from archivebox.core.models import Snapshot
+    from archivebox.crawls.models import Crawl
+
+    crawl = Crawl.objects.create(urls="https://example.com", created_by_id=get_or_create_system_user_pk())
+    return Snapshot.objects.bulk_create(
+        [Snapshot(url=f"https://example.com/{i}", timestamp=f"1700000000.{i}", crawl=crawl) for i in range(count)],
+    )
+
+
+def test_get_or_create_tags_matches_case_insensitively_and_bulk_creates_missing():
+    from archivebox.core.models import Tag
+    from archivebox.core.tag_utils import get_or_create_tags
+
+    existing = Tag.objects.create(name="News")
+    unicode_tag = Tag.objects.create(name="Über")
+
+    tags = get_or_create_tags(["news", " fresh ", "FRESH", "", "Über", "other"])
+
+    assert [tag.name for tag in tags] == ["News", "fresh", "Über", "other"]
+    assert tags[0].pk == existing.pk
+    assert tags[2].pk == unicode_tag.pk
+    assert Tag.objects.count() == 4
+
+
+def test_bulk_add_remove_and_replace_tags():
+    from archivebox.core.models import Snapshot, SnapshotTag
+    from archivebox.core.tag_utils import add_tags_to_snapshots, remove_tags_from_snapshots, replace_snapshot_tags
+
+    snapshots = _create_snapshots(3)
+
+    assert add_tags_to_snapshots(snapshots[:2], ["a", "b"]) == 4
+    # already-present associations are skipped and not counted
+    assert add_tags_to_snapshots(Snapshot.objects.all(), ["a"]) == 1
+    assert SnapshotTag.objects.count() == 5
+
+    assert remove_tags_from_snapshots([str(snapshot.pk) for snapshot in snapshots], ["B", "missing"]) == 2
+    assert set(snapshots[0].tags.values_list("name", flat=True)) == {"a"}
+
+    assert replace_snapshot_tags(Snapshot.objects.filter(tags__name="a"), ["c"]) == (3, 3)
+    assert set(SnapshotTag.objects.values_list("tag__name", flat=True)) == {"c"}
+
+    assert replace_snapshot_tags(snapshots[:1], []) == (0, 1)
+    assert not snapshots[0].tags.exists()
+
+
+def test_bulk_tagging_query_count_does_not_grow_per_snapshot(monkeypatch):
+    from archivebox.core import tag_utils
+    from archivebox.core.models import SnapshotTag
+
+    monkeypatch.setattr(tag_utils, "TAG_BULK_CHUNK_SIZE", 100)
+    snapshots = _create_snapshots(300)
+
+    with CaptureQueriesContext(connection) as ctx:
+        added = tag_utils.add_tags_to_snapshots(snapshots, ["one", "two", "three"])
+
+    assert added == 900
+    assert SnapshotTag.objects.count() == 900
+    # tag lookup + bulk insert + re-read, then per 100-snapshot chunk: savepoint, existing lookup, insert(s), release
+    assert len(ctx.captured_queries) < 30
+
+
+def test_save_tags_replaces_snapshot_tags():
+    snapshot = _create_snapshots(1)[0]
+    snapshot.save_tags(["x", "y"])
+    snapshot.save_tags(["y", "z", " "])
+
+    assert sorted(snapshot.tags.values_list("name", flat=True)) == ["y", "z"]
@@ -0,0 +1,191 @@
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import pytest
+
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+class _WebhookStub:
+    def __init__(self, status: int = 200):
+        self.status = status
+        self.requests: list[object] = []
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                stub.requests.append(json.loads(body))
+                self.send_response(stub.status)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, format, *args):
+                return
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/hook"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join(timeout=5)
+
+
+@pytest.fixture
+def webhook_queue(tmp_path, monkeypatch):
+    from archivebox.api import webhooks
+
+    queue = webhooks.WebhookQueue(tmp_path / "queue.sqlite3")
+    monkeypatch.setattr(webhooks, "_WEBHOOK_QUEUE", queue)
+    webhooks.invalidate_webhook_subscriptions()
+    yield queue
+    queue.close()
+    webhooks.invalidate_webhook_subscriptions()
+
+
+def _create_tag_webhook(endpoint: str, name: str = "tag-hook", signal: str = "CREATE_OR_UPDATE"):
+    from archivebox.api.models import OutboundWebhook
+
+    return OutboundWebhook.objects.create(
+        name=name,
+        signal=signal,
+        ref="archivebox.core.models.Tag",
+        endpoint=endpoint,
+    )
+
+
+def test_model_saves_queue_events_without_sending_http(webhook_queue):
+    from archivebox.core.models import Tag
+
+    with _WebhookStub() as stub:
+        _create_tag_webhook(stub.url)
+        tag = Tag.objects.create(name="first")
+        tag.name = "second"
+        tag.save()
+
+        assert stub.requests == []
+        assert webhook_queue.pending_counts() == {"events": 2, "deliveries": 0}
+
+
+def test_worker_coalesces_repeated_updates_into_one_delivery(webhook_queue):
+    from archivebox.api.webhooks import WebhookDeliveryWorker
+    from archivebox.core.models import Tag
+
+    with _WebhookStub() as stub:
+        hook = _create_tag_webhook(stub.url)
+        tag = Tag.objects.create(name="first")
+        for name in ("second", "third"):
+            tag.name = name
+            tag.save()
+
+        WebhookDeliveryWorker(webhook_queue, batch_size=1).run(exit_when_idle=True)
+
+    assert len(stub.requests) == 1
+    assert len(stub.requests[0]) == 1
+    assert "third" in json.dumps(stub.requests[0])
+    assert webhook_queue.pending_counts() == {"events": 0, "deliveries": 0}
+    hook.refresh_from_db()
+    assert hook.last_success is not None
+
+
+def test_worker_batches_deliveries_per_endpoint(webhook_queue):
+    from archivebox.api.webhooks import WebhookDeliveryWorker
+    from archivebox.core.models import Tag
+
+    with _WebhookStub() as stub:
+        _create_tag_webhook(stub.url)
+        for name in ("one", "two", "three"):
+            Tag.objects.create(name=name)
+
+        WebhookDeliveryWorker(webhook_queue, batch_size=10).drain_once()
+
+    assert len(stub.requests) == 1
+    assert isinstance(stub.requests[0], list)
+    assert len(stub.requests[0]) == 3
+
+
+def test_webhooks_sharing_an_endpoint_share_requests(webhook_queue):
+    from archivebox.api.webhooks import WebhookDeliveryWorker
+    from archivebox.core.models import Tag
+
+    with _WebhookStub() as stub:
+        _create_tag_webhook(stub.url, name="tag-created", signal="CREATE")
+        _create_tag_webhook(stub.url, name="tag-updated", signal="UPDATE")
+        Tag.objects.create(name="created")
+        tag = Tag.objects.create(name="updated")
+        tag.name = "updated-again"
+        tag.save()
+
+        WebhookDeliveryWorker(webhook_queue, batch_size=10).drain_once()
+
+    assert len(stub.requests) == 1
+    assert len(stub.requests[0]) == 2
+
+
+def test_rolled_back_saves_are_not_queued(webhook_queue):
+    from django.db import transaction
+
+    from archivebox.core.models import Tag
+
+    with _WebhookStub() as stub:
+        _create_tag_webhook(stub.url)
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                Tag.objects.create(name="rolled-back")
+                raise RuntimeError("abort")
+
+    assert webhook_queue.pending_counts() == {"events": 0, "deliveries": 0}
+
+
+def test_failed_deliveries_back_off_then_drop(webhook_queue):
+    from archivebox.api.webhooks import WebhookDeliveryWorker
+    from archivebox.core.models import Tag
+
+    with _WebhookStub(status=500) as stub:
+        hook = _create_tag_webhook(stub.url)
+        Tag.objects.create(name="flaky")
+        worker = WebhookDeliveryWorker(webhook_queue, max_attempts=2, retry_backoff=60)
+
+        worker.drain_once()
+        assert len(stub.requests) == 1
+        [delivery] = webhook_queue.conn.execute("SELECT attempts, next_attempt_at FROM webhook_delivery").fetchall()
+        assert delivery[0] == 1
+
+        # not due yet: backoff keeps the worker from hammering the endpoint
+        worker.drain_once()
+        assert len(stub.requests) == 1
+
+        webhook_queue.conn.execute("UPDATE webhook_delivery SET next_attempt_at = 0")
+        worker.drain_once()
+        assert len(stub.requests) == 2
+
+    assert webhook_queue.pending_counts() == {"events": 0, "deliveries": 0}
+    hook.refresh_from_db()
+    assert hook.last_failure is not None
+
+
+def test_saves_without_webhooks_are_not_queued(webhook_queue):
+    from archivebox.core.models import Tag
+
+    Tag.objects.create(name="unwatched")
+
+    assert webhook_queue.pending_counts() == {"events": 0, "deliveries": 0}
+
+
+def test_webhook_worker_uses_current_interpreter():
+    from archivebox.workers.supervisord_util import WEBHOOK_WORKER
+
+    assert WEBHOOK_WORKER["command"] == f"{sys.executable} -m archivebox manage webhook_worker"
@@ -0,0 +1,106 @@
+import io
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from archivebox.misc import zip_stream
+from archivebox.misc.zip_stream import ZIP_DEFLATED, ZIP_STORED, ZipStream, is_incompressible
+
+
+def _files(root: Path) -> list[Path]:
+    return sorted(path for path in root.rglob("*") if path.is_file())
+
+
+@pytest.fixture
+def media_dir(tmp_path):
+    root = tmp_path / "snapshot"
+    (root / "media").mkdir(parents=True)
+    (root / "screenshot.png").write_bytes(os.urandom(300_000))
+    (root / "media" / "video.mp4").write_bytes(os.urandom(50_000))
+    (root / "warc.warc.gz").write_bytes(os.urandom(1_000))
+    (root / "empty.gz").write_bytes(b"")
+    return root
+
+
+def test_is_incompressible_picks_media_and_compressed_formats():
+    assert is_incompressible("archive.warc.gz")
+    assert is_incompressible("screenshot.png")
+    assert is_incompressible("media/video.mp4")
+    assert is_incompressible("output.wacz")
+    assert not is_incompressible("index.html")
+    assert not is_incompressible("favicon.svg")
+    assert not is_incompressible("README")
+
+
+def test_all_stored_archive_has_exact_size_and_serves_ranges(media_dir):
+    stream = ZipStream.from_directory(media_dir, "snapshot", _files(media_dir))
+    data = b"".join(stream)
+
+    assert stream.all_stored
+    assert len(data) == stream.size
+    with zipfile.ZipFile(io.BytesIO(data)) as zip_file:
+        assert zip_file.testzip() is None
+        assert {info.compress_type for info in zip_file.infolist()} == {ZIP_STORED}
+        assert zip_file.read("snapshot/screenshot.png") == (media_dir / "screenshot.png").read_bytes()
+
+    ranged = ZipStream.from_directory(media_dir, "snapshot", _files(media_dir))
+    for start, stop in [(0, 10), (100, 250_000), (250_000, None), (len(data) - 40, None)]:
+        assert b"".join(ranged.iter_bytes(start, stop)) == data[start:stop]
+
+
+def test_mixed_archive_deflates_text_and_stores_media(media_dir):
+    (media_dir / "index.html").write_bytes(b"<p>hello world</p>\n" * 200_000)
+    stream = ZipStream.from_directory(media_dir, "snapshot", _files(media_dir))
+
+    assert stream.size is None
+    with pytest.raises(ValueError):
+        stream.iter_bytes(10, 20)
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(stream))) as zip_file:
+        assert zip_file.testzip() is None
+        infos = {info.filename: info for info in zip_file.infolist()}
+        assert infos["snapshot/index.html"].compress_type == ZIP_DEFLATED
+        assert infos["snapshot/index.html"].compress_size < infos["snapshot/index.html"].file_size // 10
+        assert infos["snapshot/screenshot.png"].compress_type == ZIP_STORED
+        assert zip_file.read("snapshot/index.html") == (media_dir / "index.html").read_bytes()
+
+
+def test_zip64_structures_are_readable(media_dir, monkeypatch):
+    # pretend every size and offset overflows 32 bits so the zip64 records get written
+    monkeypatch.setattr(zip_stream, "ZIP64_LIMIT", 10)
+    (media_dir / "notes.txt").write_text("some notes " * 1000)
+
+    for paths in (_files(media_dir), [path for path in _files(media_dir) if path.suffix != ".txt"]):
+        stream = ZipStream.from_directory(media_dir, "snapshot", paths)
+        data = b"".join(stream)
+        if stream.size is not None:
+            assert len(data) == stream.size
+        with zipfile.ZipFile(io.BytesIO(data)) as zip_file:
+            assert zip_file.testzip() is None
+            assert zip_file.read("snapshot/media/video.mp4") == (media_dir / "media" / "video.mp4").read_bytes()
+
+
+@pytest.mark.django_db
+def test_directory_zip_response_supports_range_requests(media_dir):
+    from django.test import RequestFactory
+
+    from archivebox.misc.serve_static import _build_directory_zip_response
+
+    full = _build_directory_zip_response(RequestFactory().get("/"), media_dir, "", is_archive_replay=False, use_async_stream=False)
+    body = b"".join(full.streaming_content)
+    assert full.status_code == 200
+    assert full["Accept-Ranges"] == "bytes"
+    assert int(full["Content-Length"]) == len(body)
+
+    partial = _build_directory_zip_response(
+        RequestFactory().get("/", HTTP_RANGE="bytes=1000-"),
+        media_dir,
+        "",
+        is_archive_replay=False,
+        use_async_stream=False,
+    )
+    assert partial.status_code == 206
+    assert partial["Content-Range"] == f"bytes 1000-{len(body) - 1}/{len(body)}"
+    assert b"".join(partial.streaming_content) == body[1000:]
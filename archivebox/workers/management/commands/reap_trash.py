@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Permanently delete snapshot folders moved into the trash by archivebox remove --delete."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of trash entries to delete in parallel",
+        )
+
+    def handle(self, *args, **kwargs):
+        from archivebox.misc.trash import TrashReaper
+
+        def progress(done, total, entry):
+            self.stdout.write(f"[{done}/{total}] deleted {entry}")
+
+        stats = TrashReaper(workers=int(kwargs.get("workers") or 4)).reap(progress=progress)
+        if stats["locked"]:
+            self.stdout.write("Another reaper is already emptying the trash, skipping it.")
+        self.stdout.write(
+            f"Reclaimed {stats['reaped']}/{stats['total']} trash entries "
+            f"({stats['failed']} failed, {stats['blob_bytes_freed']} blob bytes freed).",
+        )
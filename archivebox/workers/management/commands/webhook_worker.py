@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Deliver queued REST API outbound webhooks from DATA_DIR/queue.sqlite3 in the background."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Polling interval in seconds when the queue is empty",
+        )
+        parser.add_argument(
+            "--exit-when-idle",
+            action="store_true",
+            help="Exit once the queue has no due deliveries instead of polling forever",
+        )
+
+    def handle(self, *args, **kwargs):
+        from archivebox.api.webhooks import WebhookDeliveryWorker
+
+        WebhookDeliveryWorker().run(
+            poll_interval=max(0.2, float(kwargs.get("interval", 1.0))),
+            exit_when_idle=bool(kwargs.get("exit_when_idle")),
+        )
@@ -54,6 +54,15 @@ RUNNER_WATCH_WORKER = lambda pidfile: {
     "redirect_stderr": "true",
 }
 
+WEBHOOK_WORKER = {
+    "name": "worker_webhooks",
+    "command": _shell_join([sys.executable, "-m", "archivebox", "manage", "webhook_worker"]),
+    "autostart": "false",
+    "autorestart": "true",
+    "stdout_logfile": "logs/worker_webhooks.log",
+    "redirect_stderr": "true",
+}
+
 SERVER_WORKER = lambda host, port: {
     "name": "worker_daphne",
     "command": _shell_join(
@@ -600,12 +609,13 @@ def start_server_workers(host="0.0.0.0", port="8000", daemonize=False, debug=Fal
         bg_workers: list[tuple[dict[str, str], bool]] = (
             [(RUNNER_WORKER, True), (RUNNER_WATCH_WORKER(pidfile), False)] if reload else [(RUNNER_WORKER, False)]
         )
+        bg_workers.append((WEBHOOK_WORKER, False))
         log_files = ["logs/worker_runserver.log", "logs/worker_runner.log"]
         if reload:
             log_files.insert(1, "logs/worker_runner_watch.log")
     else:
         server_worker = SERVER_WORKER(host=host, port=port)
-        bg_workers = [(RUNNER_WORKER, False)]
+        bg_workers = [(RUNNER_WORKER, False), (WEBHOOK_WORKER, False)]
         log_files = ["logs/worker_daphne.log", "logs/worker_runner.log"]
 
     sonic_worker = get_sonic_supervisord_worker_from_plugin(config)
@@ -652,6 +662,7 @@ def start_cli_workers(watch=False):
         start_worker(supervisor, sonic_worker)
 
     start_worker(supervisor, RUNNER_WORKER)
+    start_worker(supervisor, WEBHOOK_WORKER)
 
     if watch:
         try:
@@ -671,7 +682,7 @@ def start_cli_workers(watch=False):
             # Ensure supervisord and all children are stopped
             stop_existing_supervisord_process()
             time.sleep(1.0)  # Give processes time to fully terminate
-    return [RUNNER_WORKER]
+    return [RUNNER_WORKER, WEBHOOK_WORKER]
 
 
 # def main(daemons):